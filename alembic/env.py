@@ -39,6 +39,9 @@ app_models = [
     'app.api.usuario.usuario_model',
     'app.api.area.area_model',
     'app.api.reserva.reserva_model',
+    'app.api.recorrencia.recorrencia_model',
+    'app.api.preco.preco_model',
+    'app.database.catalog_version',
 ]
 
 for model in app_models:
@@ -0,0 +1,34 @@
+"""usuario_token_version
+
+Revision ID: 5e9b2c7d4f18
+Revises: d4a7b3c9e2f1
+Create Date: 2026-10-18 14:37:51.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9b2c7d4f18'
+down_revision: Union[str, None] = 'd4a7b3c9e2f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'usuario',
+        sa.Column(
+            'token_version',
+            sa.Integer(),
+            server_default='0',
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('usuario', 'token_version')
@@ -0,0 +1,34 @@
+"""reservations_conflict_index
+
+Revision ID: 8c1d5e2f7a90
+Revises: 373f1e22aeb4
+Create Date: 2026-10-18 09:12:04.318562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d5e2f7a90'
+down_revision: Union[str, None] = '373f1e22aeb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_reservations_area_id_hora_inicio_hora_fim',
+        'reservations',
+        ['area_id', 'hora_inicio', 'hora_fim'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_reservations_area_id_hora_inicio_hora_fim',
+        table_name='reservations',
+    )
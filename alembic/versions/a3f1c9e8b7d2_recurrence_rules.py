@@ -0,0 +1,57 @@
+"""recurrence_rules
+
+Revision ID: a3f1c9e8b7d2
+Revises: 5e9b2c7d4f18
+Create Date: 2026-10-18 16:02:13.518274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9e8b7d2'
+down_revision: Union[str, None] = '5e9b2c7d4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recurrence_rules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('area_id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('frequencia', sa.String(length=10), nullable=False),
+        sa.Column('intervalo', sa.Integer(), nullable=False),
+        sa.Column('dias_semana', sa.JSON(), nullable=True),
+        sa.Column('inicio', sa.DateTime(), nullable=False),
+        sa.Column('duracao_minutos', sa.Integer(), nullable=False),
+        sa.Column('ate', sa.DateTime(), nullable=True),
+        sa.Column('contagem', sa.Integer(), nullable=True),
+        sa.Column('excecoes', sa.JSON(), nullable=False),
+        sa.Column('justificacao', sa.String(), nullable=False),
+        sa.Column('reserva_tipo', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['area_id'], ['areas.id']),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_recurrence_rules_id'), 'recurrence_rules', ['id'], unique=False
+    )
+    op.create_index(
+        op.f('ix_recurrence_rules_area_id'),
+        'recurrence_rules',
+        ['area_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f('ix_recurrence_rules_area_id'), table_name='recurrence_rules'
+    )
+    op.drop_index(op.f('ix_recurrence_rules_id'), table_name='recurrence_rules')
+    op.drop_table('recurrence_rules')
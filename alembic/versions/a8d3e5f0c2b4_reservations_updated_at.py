@@ -0,0 +1,46 @@
+"""reservations_updated_at
+
+Revision ID: a8d3e5f0c2b4
+Revises: f2b7c4e9a1d6
+Create Date: 2026-10-18 19:27:45.108362
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3e5f0c2b4'
+down_revision: Union[str, None] = 'f2b7c4e9a1d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # O SQLite não aceita um default não constante (como CURRENT_TIMESTAMP)
+    # em ADD COLUMN; as linhas existentes ficam com o horário da migração.
+    agora = datetime.utcnow().isoformat(sep=' ', timespec='seconds')
+    op.add_column(
+        'reservations',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text(f"'{agora}'"),
+        ),
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('reservations', 'updated_at', server_default=None)
+
+    catalog_versions = sa.table(
+        'catalog_versions', sa.column('nome'), sa.column('versao')
+    )
+    op.bulk_insert(catalog_versions, [{'nome': 'tipos_usuario', 'versao': 0}])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM catalog_versions WHERE nome = 'tipos_usuario'")
+    op.drop_column('reservations', 'updated_at')
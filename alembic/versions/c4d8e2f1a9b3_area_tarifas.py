@@ -0,0 +1,68 @@
+"""area_tarifas
+
+Revision ID: c4d8e2f1a9b3
+Revises: a3f1c9e8b7d2
+Create Date: 2026-10-18 18:41:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f1a9b3'
+down_revision: Union[str, None] = 'a3f1c9e8b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'area_tarifas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('area_id', sa.Integer(), nullable=False),
+        sa.Column('valor_hora', sa.Integer(), nullable=False),
+        sa.Column('valor_diaria', sa.Integer(), nullable=True),
+        sa.Column('valor_minimo', sa.Integer(), nullable=False),
+        sa.Column('fim_de_semana_percentual', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['area_id'], ['areas.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('area_id'),
+    )
+    op.create_index(
+        op.f('ix_area_tarifas_id'), 'area_tarifas', ['id'], unique=False
+    )
+    op.create_table(
+        'tarifa_faixas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tarifa_id', sa.Integer(), nullable=False),
+        sa.Column('dia_semana', sa.Integer(), nullable=True),
+        sa.Column('hora_inicio', sa.Time(), nullable=False),
+        sa.Column('hora_fim', sa.Time(), nullable=False),
+        sa.Column('valor_hora', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['tarifa_id'], ['area_tarifas.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_tarifa_faixas_id'), 'tarifa_faixas', ['id'], unique=False
+    )
+    op.create_index(
+        op.f('ix_tarifa_faixas_tarifa_id'),
+        'tarifa_faixas',
+        ['tarifa_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f('ix_tarifa_faixas_tarifa_id'), table_name='tarifa_faixas'
+    )
+    op.drop_index(op.f('ix_tarifa_faixas_id'), table_name='tarifa_faixas')
+    op.drop_table('tarifa_faixas')
+    op.drop_index(op.f('ix_area_tarifas_id'), table_name='area_tarifas')
+    op.drop_table('area_tarifas')
@@ -0,0 +1,52 @@
+"""reservations_exclusion_constraint
+
+Revision ID: d4a7b3c9e2f1
+Revises: 8c1d5e2f7a90
+Create Date: 2026-10-18 10:41:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7b3c9e2f1'
+down_revision: Union[str, None] = '8c1d5e2f7a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Só o PostgreSQL tem exclusion constraints; nos demais bancos a aplicação
+# serializa a checagem de conflito por área (ver crud_reserva).
+# As colunas de horário são `timestamp without time zone`, por isso o
+# intervalo é um tsrange. Reservas já sobrepostas precisam ser resolvidas
+# antes desta migração, senão a criação da constraint falha.
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    # greatest() evita erro de intervalo invertido (hora_fim < hora_inicio),
+    # que vira um intervalo vazio e nunca conflita.
+    op.execute(
+        'ALTER TABLE reservations ADD COLUMN periodo tsrange '
+        'GENERATED ALWAYS AS '
+        "(tsrange(hora_inicio, greatest(hora_inicio, hora_fim), '[)')) "
+        'STORED'
+    )
+    op.execute(
+        'ALTER TABLE reservations ADD CONSTRAINT reservations_sem_sobreposicao '
+        'EXCLUDE USING gist '
+        '(area_id WITH =, reserva_data WITH =, periodo WITH &&)'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        'ALTER TABLE reservations '
+        'DROP CONSTRAINT IF EXISTS reservations_sem_sobreposicao'
+    )
+    op.execute('ALTER TABLE reservations DROP COLUMN IF EXISTS periodo')
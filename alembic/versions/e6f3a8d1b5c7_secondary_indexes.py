@@ -0,0 +1,71 @@
+"""secondary_indexes
+
+Revision ID: e6f3a8d1b5c7
+Revises: c4d8e2f1a9b3
+Create Date: 2026-10-18 16:05:51.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f3a8d1b5c7'
+down_revision: Union[str, None] = 'c4d8e2f1a9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f('ix_reservations_usuario_id'),
+        'reservations',
+        ['usuario_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_reservations_area_id_reserva_data',
+        'reservations',
+        ['area_id', 'reserva_data'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_reservations_reserva_data',
+        'reservations',
+        ['reserva_data'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_usuario_tipo_id'), 'usuario', ['tipo_id'], unique=False
+    )
+    op.create_index(
+        'ix_tipouser_lower_tipo',
+        'tipouser',
+        [sa.text('lower(tipo)')],
+        unique=False,
+    )
+    # A busca por trecho (lower(tipo) ILIKE '%x%') só usa índice com
+    # trigramas, que existem apenas no PostgreSQL.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(
+        'CREATE INDEX ix_tipouser_lower_tipo_trgm ON tipouser '
+        'USING gin (lower(tipo) gin_trgm_ops)'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_tipouser_lower_tipo_trgm')
+    op.drop_index('ix_tipouser_lower_tipo', table_name='tipouser')
+    op.drop_index(op.f('ix_usuario_tipo_id'), table_name='usuario')
+    op.drop_index('ix_reservations_reserva_data', table_name='reservations')
+    op.drop_index(
+        'ix_reservations_area_id_reserva_data', table_name='reservations'
+    )
+    op.drop_index(
+        op.f('ix_reservations_usuario_id'), table_name='reservations'
+    )
@@ -0,0 +1,32 @@
+"""catalog_versions
+
+Revision ID: f2b7c4e9a1d6
+Revises: e6f3a8d1b5c7
+Create Date: 2026-10-18 17:12:08.436915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c4e9a1d6'
+down_revision: Union[str, None] = 'e6f3a8d1b5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    catalog_versions = op.create_table(
+        'catalog_versions',
+        sa.Column('nome', sa.String(length=50), nullable=False),
+        sa.Column('versao', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('nome'),
+    )
+    op.bulk_insert(catalog_versions, [{'nome': 'areas', 'versao': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('catalog_versions')
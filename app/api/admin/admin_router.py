@@ -0,0 +1,58 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.api.admin.admin_schema import IdentityCacheStats, PoolReport
+from app.api.auth.crud_auth import get_current_user, verify_permission
+from app.api.auth.identity_cache import identity_cache
+from app.api.usuario.usuario_model import Usuario
+from app.config.config import get_settings
+from app.database.get_db import engine
+from app.database.pool import get_pool_stats
+from app.utils.Exceptions.exceptions import sem_permissao_exception
+
+router_admin = APIRouter()
+
+Current_User = Annotated[Usuario, Depends(get_current_user)]
+
+
+@router_admin.get('/admin/pool', response_model=PoolReport)
+def read_pool_stats(current_user: Current_User):
+    """
+    Retorna as estatísticas dos pools de conexão deste processo.
+
+    Args:
+        current_user (Usuario): Usuário autenticado; precisa ser administrador.
+
+    Returns:
+        dict: Estatísticas do pool do engine.
+
+    Raises:
+        sem_permissao_exception: Se o usuário não for administrador.
+    """
+    if not verify_permission(
+        current_user['permissions'], get_settings().ADMINISTRADOR
+    ):
+        raise sem_permissao_exception()
+    return {'sync_engine': get_pool_stats(engine)}
+
+
+@router_admin.get('/admin/identity_cache', response_model=IdentityCacheStats)
+def read_identity_cache_stats(current_user: Current_User):
+    """
+    Retorna os contadores do cache de usuários/permissões deste processo.
+
+    Args:
+        current_user (Usuario): Usuário autenticado; precisa ser administrador.
+
+    Returns:
+        dict: Acertos, falhas e ocupação do cache.
+
+    Raises:
+        sem_permissao_exception: Se o usuário não for administrador.
+    """
+    if not verify_permission(
+        current_user['permissions'], get_settings().ADMINISTRADOR
+    ):
+        raise sem_permissao_exception()
+    return identity_cache.stats()
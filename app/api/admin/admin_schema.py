@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+
+class PoolWaitHistogram(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum_ms: float
+    max_ms: float
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    status: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    max_overflow: int | None = None
+    timeout: float | None = None
+    wait_ms: PoolWaitHistogram | None = None
+
+
+class PoolReport(BaseModel):
+    sync_engine: PoolStats
+
+
+class IdentityCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    ttl: float
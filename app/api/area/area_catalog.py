@@ -0,0 +1,184 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.area.area_model import Area
+from app.api.area.area_schema import AreaBase, AreaList
+from app.cache.backend import CacheBackend
+from app.config.config import get_settings
+from app.database.catalog_version import catalog_changed, get_catalog_version
+
+AREAS = 'areas'
+# Tempo que cada versão do catálogo fica no backend compartilhado
+TTL_COMPARTILHADO = 3600
+
+
+@dataclass(frozen=True, slots=True)
+class Catalogo:
+    """
+    Todas as áreas, em ordem de ID, já validadas e com o JSON de cada uma.
+    """
+
+    versao: int
+    ids: tuple[int, ...]
+    areas: tuple[AreaBase, ...]
+    json: dict[int, bytes]
+
+    @classmethod
+    def carregar(cls, db: Session, versao: int) -> 'Catalogo':
+        return cls.de_areas(
+            versao,
+            (
+                AreaBase.model_validate(area)
+                for area in db.scalars(select(Area).order_by(Area.id))
+            ),
+        )
+
+    @classmethod
+    def de_json(cls, versao: int, conteudo: bytes) -> 'Catalogo':
+        """
+        Reconstrói o catálogo a partir do JSON completo (`AreaList`).
+        """
+        return cls.de_areas(
+            versao, AreaList.model_validate_json(conteudo).areas
+        )
+
+    @classmethod
+    def de_areas(cls, versao: int, areas) -> 'Catalogo':
+        areas = tuple(areas)
+        return cls(
+            versao=versao,
+            ids=tuple(area.id for area in areas),
+            areas=areas,
+            json={area.id: area.model_dump_json().encode() for area in areas},
+        )
+
+    def area(self, area_id: int) -> AreaBase | None:
+        posicao = bisect_right(self.ids, area_id) - 1
+        if posicao >= 0 and self.ids[posicao] == area_id:
+            return self.areas[posicao]
+        return None
+
+    def pagina(
+        self, skip: int = 0, limit: int = 100, after: int | None = None
+    ) -> list[AreaBase]:
+        """
+        Retorna uma página com a mesma ordem e semântica de `paginate`.
+        """
+        inicio = skip if after is None else bisect_right(self.ids, after)
+        return list(self.areas[inicio : inicio + limit])
+
+    def lista_json(self, areas: list[AreaBase]) -> bytes:
+        """
+        Monta o corpo de `AreaList` a partir do JSON já pronto de cada área.
+        """
+        return (
+            b'{"areas":[' + b','.join(self.json[a.id] for a in areas) + b']}'
+        )
+
+
+class AreaCatalogCache:
+    """
+    Cache (por processo) do catálogo de áreas.
+
+    Cada escrita em áreas incrementa a versão do catálogo no banco, na mesma
+    transação (`bump_catalog_version`). Antes de servir o cache, a versão do
+    banco é conferida (uma consulta por chave primária) no máximo a cada
+    `versao_ttl` segundos; se mudou, por uma escrita neste ou em outro
+    processo, o catálogo é recarregado inteiro numa única consulta. As
+    escritas locais também chamam `invalidar` depois do commit. `geracao`
+    segue o mesmo papel que no cache de ocorrências.
+
+    Conectado a um backend compartilhado (`conectar`), cada versão carregada
+    fica guardada nele para os outros workers, e `invalidar` avisa esses
+    workers, que descartam a cópia mesmo antes da próxima conferência.
+    """
+
+    def __init__(self, versao_ttl: float):
+        self._lock = Lock()
+        self._catalogo: Catalogo | None = None
+        self._conferido = 0.0
+        self._backend: CacheBackend | None = None
+        self.versao_ttl = versao_ttl
+        self.geracao = 0
+
+    def conectar(self, backend: CacheBackend | None):
+        """
+        Passa a usar o backend compartilhado; com None, só este processo.
+        """
+        if backend is self._backend:
+            return
+        self._backend = backend
+        if backend is not None:
+            backend.subscribe(AREAS, lambda _mensagem: self.limpar())
+
+    def catalogo(self, db: Session) -> Catalogo:
+        """
+        Retorna o catálogo atual, recarregando-o se a versão mudou.
+        """
+        backend = self._backend
+        if backend is not None:
+            backend.poll()
+        with self._lock:
+            catalogo, conferido, geracao = (
+                self._catalogo,
+                self._conferido,
+                self.geracao,
+            )
+        agora = monotonic()
+        if catalogo is not None and agora - conferido < self.versao_ttl:
+            return catalogo
+
+        if catalog_changed(db, AREAS):
+            # Escrita ainda não confirmada nesta sessão: lê sem guardar
+            return Catalogo.carregar(db, -1)
+
+        versao = get_catalog_version(db, AREAS)
+        if catalogo is None or catalogo.versao != versao:
+            catalogo = self._carregar(db, versao, backend)
+        with self._lock:
+            if geracao == self.geracao:
+                self._catalogo = catalogo
+                self._conferido = agora
+        return catalogo
+
+    def limpar(self):
+        """
+        Esvazia o cache.
+        """
+        with self._lock:
+            self.geracao += 1
+            self._catalogo = None
+
+    def invalidar(self):
+        """
+        Esvazia o cache aqui e nos outros workers.
+        """
+        self.limpar()
+        if self._backend is not None:
+            self._backend.publish(AREAS, b'')
+
+    @staticmethod
+    def _carregar(
+        db: Session, versao: int, backend: CacheBackend | None
+    ) -> Catalogo:
+        if backend is None or not backend.compartilhado:
+            return Catalogo.carregar(db, versao)
+        chave = f'catalogo:{AREAS}:{versao}'
+        conteudo = backend.get(chave)
+        if conteudo is not None:
+            return Catalogo.de_json(versao, conteudo)
+        catalogo = Catalogo.carregar(db, versao)
+        backend.set(
+            chave, catalogo.lista_json(catalogo.areas), TTL_COMPARTILHADO
+        )
+        return catalogo
+
+
+area_catalog = AreaCatalogCache(
+    versao_ttl=get_settings().AREA_CATALOGO_VERSAO_TTL
+)
@@ -1,31 +1,51 @@
+from datetime import date, datetime, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 import app.api.area.crud_area as crud_area
-from app.api.area.area_model import Area
-from app.api.area.area_schema import AreaCreate, AreaList, AreaPublic
-from app.api.auth.crud_auth import get_current_user, verify_permission
-from app.api.usuario.usuario_model import Usuario
+import app.api.area.crud_disponibilidade as crud_disponibilidade
+from app.api.area.area_catalog import AREAS
+from app.api.area.area_schema import (
+    AreaCreate,
+    AreaDisponibilidade,
+    AreaList,
+    AreaPublic,
+    GradeOcupacao,
+)
+from app.api.auth.crud_auth import verify_permission
+from app.api.auth.principal import CurrentPrincipal
 from app.config.config import get_settings
-from app.database.get_db import get_db
+from app.database.unit_of_work import UnitOfWorkRoute, get_uow
+from app.utils.conditional import make_etag, not_modified, validators
 from app.utils.Exceptions.exceptions import (
     ObjectAlreadyExistException,
     ObjectNotFoundException,
     sem_permissao_exception,
 )
+from app.utils.pagination import Pagination, set_next_cursor
+from app.utils.schemas.base_schemas import DataHoraQuery
+from app.utils.slots import SLOT_MINUTOS
+
+router_area = APIRouter(route_class=UnitOfWorkRoute)
+
+Session = Annotated[Session, Depends(get_uow)]
 
-router_area = APIRouter()
 
-Session = Annotated[Session, Depends(get_db)]
-Current_User = Annotated[Usuario, Depends(get_current_user)]
+def _verifica_janela(inicio: datetime, fim: datetime):
+    maximo = get_settings().DISPONIBILIDADE_JANELA_MAX_DIAS
+    if fim <= inicio or fim - inicio > timedelta(days=maximo):
+        raise HTTPException(
+            status_code=400,
+            detail=f'A janela deve ter entre 0 e {maximo} dias',
+        )
 
 
 @router_area.post('/areas', response_model=AreaPublic)
 def create_area(
     area: AreaCreate,
-    Current_User: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
 ):
     """
@@ -39,7 +59,7 @@ def create_area(
         Area: A área criada.
     """
     if not verify_permission(
-        Current_User['permissions'], get_settings().ADMINISTRADOR
+        current_user.permissions, get_settings().ADMINISTRADOR
     ):
         raise sem_permissao_exception()
     try:
@@ -49,20 +69,39 @@ def create_area(
 
 
 @router_area.get('/areas', response_model=AreaList)
-def read_areas(db: Session, skip: int = 0, limit: int = 100):
+def read_areas(
+    db: Session,
+    request: Request,
+    page: Annotated[Pagination, Depends()],
+):
     """
     Retorna uma lista de areas com paginação.
 
+    O cursor da próxima página, quando houver, vem no header `X-Next-Cursor`.
+    A página é montada a partir do catálogo de áreas em cache, com o JSON de
+    cada área já serializado. O ETag vem da versão do catálogo; com um
+    `If-None-Match` ainda atual, responde 304 sem montar a página.
+
     Parâmetros:
     db (Session): Sessão do banco de dados.
-    skip (int): Quantidade de registros a serem ignorados.
-    limit (int): Quantidade máxima de registros a serem retornados.
+    page (Pagination): `skip`/`limit` ou `cursor`/`limit` (paginação por cursor).
 
     Retorna:
-    dict: Dicionário contendo a lista de areas.
+    Response: O JSON com a lista de areas.
     """
-    areas: list[Area] = crud_area.get_areas(db, skip, limit)
-    return {'areas': areas}
+    catalogo = crud_area.get_area_catalog(db)
+    etag = make_etag(AREAS, catalogo.versao)
+    resposta = not_modified(request, etag)
+    if resposta is not None:
+        return resposta
+    areas = catalogo.pagina(page.skip, page.limit, page.after)
+    response = Response(
+        content=catalogo.lista_json(areas),
+        media_type='application/json',
+        headers=validators(etag),
+    )
+    set_next_cursor(response, areas, page.limit)
+    return response
 
 
 @router_area.get('/areas/nome/{nome}')
@@ -84,38 +123,131 @@ def get_area_by_name(nome: str, db: Session):
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
 
 
+@router_area.get('/areas/disponiveis', response_model=AreaList)
+def read_areas_disponiveis(
+    inicio: DataHoraQuery, fim: DataHoraQuery, db: Session
+):
+    """
+    Lista as áreas livres durante toda a janela informada.
+
+    Args:
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela, até `DISPONIBILIDADE_JANELA_MAX_DIAS` depois do início.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        dict: Dicionário contendo a lista de areas livres.
+    """
+    _verifica_janela(inicio, fim)
+    return {'areas': crud_disponibilidade.get_free_areas(db, inicio, fim)}
+
+
+@router_area.get('/areas/ocupacao', response_model=GradeOcupacao)
+def read_areas_ocupacao(
+    dia: date,
+    db: Session,
+    area_id: Annotated[list[int] | None, Query()] = None,
+):
+    """
+    Retorna a grade de ocupação das áreas em um dia, em slots de 15 minutos.
+
+    Cada área traz uma string de 96 caracteres ('1' = slot ocupado por uma
+    reserva ou ocorrência recorrente), começando em 00:00.
+
+    Args:
+        dia (date): O dia consultado.
+        area_id (list[int], optional): As áreas consultadas (repetir o parâmetro para várias); todas, se omitido.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        dict: O dia, o tamanho do slot e a ocupação de cada área.
+    """
+    return {
+        'dia': dia,
+        'slot_minutos': SLOT_MINUTOS,
+        'areas': crud_disponibilidade.get_areas_occupancy(db, dia, area_id),
+    }
+
+
+@router_area.get(
+    '/areas/{area_id}/disponibilidade', response_model=AreaDisponibilidade
+)
+def get_area_disponibilidade(
+    area_id: int,
+    inicio: DataHoraQuery,
+    fim: DataHoraQuery,
+    db: Session,
+    duracao: Annotated[int, Query(gt=0)] = 60,
+):
+    """
+    Lista os horários livres de uma área, considerando as reservas e as
+    ocorrências das regras recorrentes.
+
+    Args:
+        area_id (int): O ID da área.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela, até `DISPONIBILIDADE_JANELA_MAX_DIAS` depois do início.
+        duracao (int): Duração mínima, em minutos, de um horário livre.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        dict: O ID da área e a lista de horários livres.
+    """
+    _verifica_janela(inicio, fim)
+    try:
+        livres = crud_disponibilidade.get_area_availability(
+            db, area_id, inicio, fim, timedelta(minutes=duracao)
+        )
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    return {'area_id': area_id, 'livres': livres}
+
+
 @router_area.get('/areas/{area_id}')
 def get_area(
     area_id: int,
-    Current_User: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
+    request: Request,
 ):
     """
     Obter uma área pelo seu ID.
 
+    O JSON da área vem do catálogo em cache, com um ETag do próprio
+    conteúdo; com um `If-None-Match` ainda atual, responde 304.
+
     Args:
         area_id (int): O ID da área a ser obtida.
-        current_user (Current_User): O usuário atual.
+        current_user (Principal): O usuário atual.
         db (Session, optional): Uma sessão do banco de dados obtida via Depends(get_db).
 
     Returns:
         Area: Os detalhes da área encontrada.
     """
     if not verify_permission(
-        Current_User['permissions'], get_settings().ADMINISTRADOR
+        current_user.permissions, get_settings().ADMINISTRADOR
     ):
         raise sem_permissao_exception()
     try:
-        return crud_area.get_area_by_id(area_id, db)
+        conteudo = crud_area.get_area_json(area_id, db)
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    etag = make_etag(conteudo)
+    resposta = not_modified(request, etag)
+    if resposta is not None:
+        return resposta
+    return Response(
+        content=conteudo,
+        media_type='application/json',
+        headers=validators(etag),
+    )
 
 
 @router_area.put('/areas/{area_id}')
 def update_area(
     area_id: int,
     area: AreaCreate,
-    Current_User: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
 ):
     """
@@ -130,7 +262,7 @@ def update_area(
         Area: Os detalhes atualizados da área.
     """
     if not verify_permission(
-        Current_User['permissions'], get_settings().ADMINISTRADOR
+        current_user.permissions, get_settings().ADMINISTRADOR
     ):
         raise sem_permissao_exception()
     try:
@@ -142,7 +274,7 @@ def update_area(
 @router_area.delete('/areas/{area_id}')
 def delete_area(
     area_id: int,
-    Current_User: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
 ):
     """
@@ -156,7 +288,7 @@ def delete_area(
         dict: Uma mensagem indicando se a área foi deletada com sucesso.
     """
     if not verify_permission(
-        Current_User['permissions'], get_settings().ADMINISTRADOR
+        current_user.permissions, get_settings().ADMINISTRADOR
     ):
         raise sem_permissao_exception()
 
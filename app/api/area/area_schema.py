@@ -1,3 +1,5 @@
+from datetime import date, datetime
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -21,3 +23,24 @@ class AreaBase(AreaCreate):
 
 class AreaList(BaseModel):
     areas: list[AreaBase]
+
+
+class HorarioLivre(BaseModel):
+    inicio: datetime
+    fim: datetime
+
+
+class AreaDisponibilidade(BaseModel):
+    area_id: int
+    livres: list[HorarioLivre]
+
+
+class AreaOcupacao(BaseModel):
+    area_id: int
+    ocupacao: str
+
+
+class GradeOcupacao(BaseModel):
+    dia: date
+    slot_minutos: int
+    areas: list[AreaOcupacao]
@@ -3,18 +3,24 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from app.api.area.area_catalog import AREAS, Catalogo, area_catalog
 from app.api.area.area_model import Area
-from app.api.area.area_schema import AreaCreate
+from app.api.area.area_schema import AreaBase, AreaCreate
+from app.database.catalog_version import bump_catalog_version
 from app.database.get_db import get_db
+from app.database.unit_of_work import commit_or_defer, update_by_id
 from app.utils.Exceptions.exceptions import (
     ObjectAlreadyExistException,
     ObjectNotFoundException,
 )
+from app.utils.pagination import paginate
 
 Session = Annotated[Session, Depends(get_db)]
 
 
-def get_areas(db: Session, skip: int = 0, limit: int = 100) -> list[Area]:
+def get_areas(
+    db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[Area]:
     """
     Retorna uma lista de areas a partir do banco de dados.
 
@@ -22,11 +28,65 @@ def get_areas(db: Session, skip: int = 0, limit: int = 100) -> list[Area]:
     db (Session): Sessão do banco de dados.
     skip (int): Quantidade de areas a serem ignorados.
     limit (int): Quantidade máxima de areas a serem retornados.
+    after (int, optional): Último ID da página anterior (paginação por cursor).
 
     Retorna:
     list[areas]: Lista de areas.
     """
-    return db.query(Area).offset(skip).limit(limit).all()
+    return paginate(db.query(Area), Area.id, skip, limit, after).all()
+
+
+def get_area_catalog(db: Session) -> Catalogo:
+    """
+    Obtém o catálogo de áreas em cache, conferindo antes a versão no banco.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        Catalogo: As áreas validadas, com o JSON de cada uma já serializado.
+    """
+    return area_catalog.catalogo(db)
+
+
+def get_cached_area(area_id: int, db: Session) -> AreaBase:
+    """
+    Obtém uma área pelo seu ID a partir do catálogo em cache.
+
+    Args:
+        area_id (int): ID da área.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        AreaBase: A área correspondente ao ID especificado.
+
+    Raises:
+        ObjectNotFoundException: Se a área não for encontrada.
+    """
+    area = get_area_catalog(db).area(area_id)
+    if area is None:
+        raise ObjectNotFoundException('Area', area_id)
+    return area
+
+
+def get_area_json(area_id: int, db: Session) -> bytes:
+    """
+    Obtém o JSON, já serializado, de uma área do catálogo em cache.
+
+    Args:
+        area_id (int): ID da área.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        bytes: O JSON da área (`AreaBase`).
+
+    Raises:
+        ObjectNotFoundException: Se a área não for encontrada.
+    """
+    conteudo = get_area_catalog(db).json.get(area_id)
+    if conteudo is None:
+        raise ObjectNotFoundException('Area', area_id)
+    return conteudo
 
 
 # TODO: TALVEZ ESSA SEJA UMA DAS QUE NÃO PRECISE DE UMA EXCEPTION
@@ -70,8 +130,8 @@ def create_area(db: Session, area: AreaCreate):
     except ObjectNotFoundException:
         db_area = Area(**area.model_dump())
         db.add(db_area)
-        db.commit()
-        db.refresh(db_area)
+        bump_catalog_version(db, AREAS)
+        commit_or_defer(db, area_catalog.invalidar)
 
     return db_area
 
@@ -107,17 +167,16 @@ def update_area(area_id: int, area: AreaCreate, db: Session):
 
     Returns:
         Area: a área atualizada.
+
+    Raises:
+        ObjectNotFoundException: Se a área não for encontrada.
     """
-    try:
-        db_area = get_area_by_id(area_id, db)
-    except ObjectNotFoundException:
-        raise
-    else:
-        for dado, valor in area.model_dump().items():
-            setattr(db_area, dado, valor)
-        db.commit()
-        db.refresh(db_area)
-        return db_area
+    db_area = update_by_id(db, Area, area_id, area.model_dump())
+    if not db_area:
+        raise ObjectNotFoundException('Area', area_id)
+    bump_catalog_version(db, AREAS)
+    commit_or_defer(db, area_catalog.invalidar)
+    return db_area
 
 
 def delete_area(area_id: int, db: Session):
@@ -138,4 +197,5 @@ def delete_area(area_id: int, db: Session):
         raise
     else:
         db.delete(db_area)
-        db.commit()
+        bump_catalog_version(db, AREAS)
+        commit_or_defer(db, area_catalog.invalidar)
@@ -0,0 +1,188 @@
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from heapq import merge
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.api.area.area_model import Area
+from app.api.area.crud_area import get_area_by_id
+from app.api.recorrencia.occurrence_cache import occurrence_cache
+from app.api.recorrencia.recorrencia_model import RecurrenceRule
+from app.api.reserva.occupancy import mascara_intervalo, occupancy_bitmap
+from app.api.reserva.reserva_model import Reservation
+from app.database.get_db import get_db
+from app.utils.slots import DIA, SLOTS_POR_DIA
+
+Session = Annotated[Session, Depends(get_db)]
+
+
+def get_area_availability(
+    db: Session,
+    area_id: int,
+    inicio: datetime,
+    fim: datetime,
+    duracao: timedelta,
+) -> list[dict]:
+    """
+    Calcula os horários livres de uma área dentro de uma janela.
+
+    As reservas que cruzam a janela vêm de uma única consulta ordenada por
+    `hora_inicio` (apoiada pelo índice (area_id, hora_inicio, hora_fim)) e são
+    intercaladas com as ocorrências das regras recorrentes; uma varredura
+    linear sobre os intervalos ocupados devolve os vãos.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        area_id (int): O ID da área.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela.
+        duracao (timedelta): Duração mínima de um horário livre.
+
+    Returns:
+        list[dict]: Os horários livres (`inicio`, `fim`), em ordem.
+
+    Raises:
+        ObjectNotFoundException: Se a área não existir.
+    """
+    get_area_by_id(area_id, db)
+    reservas = (
+        (reserva_inicio, reserva_fim)
+        for reserva_inicio, reserva_fim in db.execute(
+            select(Reservation.hora_inicio, Reservation.hora_fim)
+            .where(
+                Reservation.area_id == area_id,
+                Reservation.hora_inicio < fim,
+                Reservation.hora_fim > inicio,
+            )
+            .order_by(Reservation.hora_inicio)
+        )
+    )
+    regras = (
+        (ocorrencia, termino)
+        for ocorrencia, termino, _ in occurrence_cache.ocorrencias(
+            db, area_id, inicio, fim
+        )
+    )
+    return [
+        {'inicio': livre_inicio, 'fim': livre_fim}
+        for livre_inicio, livre_fim in free_slots(
+            merge(reservas, regras), inicio, fim, duracao
+        )
+    ]
+
+
+def get_free_areas(db: Session, inicio: datetime, fim: datetime) -> list[Area]:
+    """
+    Lista as áreas sem nenhuma reserva ou ocorrência recorrente na janela.
+
+    As reservas são filtradas numa única consulta (NOT EXISTS por área), sem
+    percorrer as áreas uma a uma; só as áreas que têm regras recorrentes
+    passam depois pelo cache de ocorrências.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela.
+
+    Returns:
+        list[Area]: As áreas livres durante toda a janela, ordenadas por ID.
+    """
+    ocupada = exists().where(
+        Reservation.area_id == Area.id,
+        Reservation.hora_inicio < fim,
+        Reservation.hora_fim > inicio,
+    )
+    areas = db.scalars(select(Area).where(~ocupada).order_by(Area.id)).all()
+    com_regras = _areas_com_regras(db, [area.id for area in areas])
+    return [
+        area
+        for area in areas
+        if area.id not in com_regras
+        or occurrence_cache.buscar_conflito(db, area.id, inicio, fim) is None
+    ]
+
+
+def get_areas_occupancy(
+    db: Session, dia: date, area_ids: list[int] | None = None
+) -> list[dict]:
+    """
+    Monta a grade de ocupação das áreas em um dia, em slots de 15 minutos.
+
+    Os mapas vêm do `occupancy_bitmap` (os dias que faltam são carregados
+    numa única consulta para todas as áreas) e recebem, por cima, as
+    ocorrências das regras recorrentes. Um slot tocado por uma reserva,
+    mesmo que parcialmente, aparece como ocupado.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        dia (date): O dia.
+        area_ids (list[int], optional): As áreas consultadas; todas, se omitido.
+
+    Returns:
+        list[dict]: `area_id` e `ocupacao` (96 caracteres '0'/'1', o primeiro
+            para 00:00 às 00:15) de cada área existente, ordenadas por ID.
+    """
+    stmt = select(Area.id).order_by(Area.id)
+    if area_ids is not None:
+        stmt = stmt.where(Area.id.in_(area_ids))
+    ids = list(db.scalars(stmt))
+    mapas = occupancy_bitmap.mapas(db, ids, dia)
+
+    inicio = datetime.combine(dia, time.min)
+    for area_id in _areas_com_regras(db, ids):
+        for ocorrencia, termino, _ in occurrence_cache.ocorrencias(
+            db, area_id, inicio, inicio + DIA
+        ):
+            mapas[area_id] |= mascara_intervalo(dia, ocorrencia, termino)
+    return [
+        {
+            'area_id': area_id,
+            'ocupacao': format(mapas[area_id], f'0{SLOTS_POR_DIA}b')[::-1],
+        }
+        for area_id in ids
+    ]
+
+
+def _areas_com_regras(db: Session, area_ids: list[int]) -> set[int]:
+    return set(
+        db.scalars(
+            select(RecurrenceRule.area_id)
+            .where(RecurrenceRule.area_id.in_(area_ids))
+            .distinct()
+        )
+    )
+
+
+def free_slots(
+    ocupados: Iterable[tuple[datetime, datetime]],
+    inicio: datetime,
+    fim: datetime,
+    duracao: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Varre intervalos ocupados, ordenados pelo início, e devolve os vãos de
+    `[inicio, fim)` com pelo menos `duracao`.
+
+    Args:
+        ocupados (Iterable[tuple[datetime, datetime]]): Intervalos (início, fim) ordenados pelo início; podem se sobrepor.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela.
+        duracao (timedelta): Duração mínima de um vão.
+
+    Returns:
+        list[tuple[datetime, datetime]]: Os vãos, em ordem.
+    """
+    livres = []
+    cursor = inicio
+    for ocupado_inicio, ocupado_fim in ocupados:
+        if ocupado_inicio >= fim:
+            break
+        if ocupado_inicio - cursor >= duracao:
+            livres.append((cursor, ocupado_inicio))
+        cursor = max(cursor, ocupado_fim)
+    if fim - cursor >= duracao:
+        livres.append((cursor, fim))
+    return livres
@@ -1,14 +1,18 @@
 from datetime import timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends  # , HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends  # , HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.api.auth.auth_schema import Token
 from app.api.auth.crud_auth import get_current_user
 from app.api.usuario.usuario_model import Usuario
-from app.config.auth import authenticate, create_access_token
+from app.config.auth import (
+    authenticate,
+    build_token_claims,
+    create_access_token,
+)
 from app.config.config import get_settings
 from app.database.get_db import get_db
 
@@ -25,6 +29,7 @@ form_data = Annotated[OAuth2PasswordRequestForm, Depends()]
 async def login_for_access_token(
     form_data: form_data,
     db: Session,
+    background_tasks: BackgroundTasks,
 ):
     """
     Gera um token de acesso para autenticação de usuário.
@@ -32,25 +37,29 @@ async def login_for_access_token(
     Args:
         form_data (OAuth2PasswordRequestForm): Os dados de formulário contendo email e senha.
         db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        background_tasks (BackgroundTasks): Usado para atualizar o hash da senha após o login.
 
     Returns:
         Token: O token de acesso gerado.
 
     Raises:
         HTTPException(401): Se o nome de usuário ou a senha forem incorretos.
+        HTTPException(503): Se a fila de hashing de senhas estiver cheia.
     """
 
-    auth_result = authenticate(
-        db=db, email=form_data.username, password=form_data.password
+    auth_result = await authenticate(
+        db=db,
+        email=form_data.username,
+        password=form_data.password,
+        background_tasks=background_tasks,
     )
     access_token_expires = timedelta(
         minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES
     )
     access_token = create_access_token(
-        data={
-            'sub': auth_result['user'].email,
-            'permissions': auth_result['permissions'],
-        },
+        data=build_token_claims(
+            auth_result['user'], auth_result['permissions']
+        ),
         expires_delta=access_token_expires,
     )
     return {'access_token': access_token, 'token_type': 'bearer'}
@@ -61,7 +70,9 @@ def refresh_access_token(
     current_user: dict = Depends(get_current_user),
 ):
     new_access_token = create_access_token(
-        data={'sub': current_user['user'].email}
+        data=build_token_claims(
+            current_user['user'], current_user['permissions']
+        )
     )
 
     return {'access_token': new_access_token, 'token_type': 'bearer'}
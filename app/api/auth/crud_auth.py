@@ -1,14 +1,13 @@
-from functools import lru_cache
 from typing import Annotated
 
-from cachetools import TTLCache
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from app.api.auth.identity_cache import UserSnapshot, identity_cache
 from app.api.usuario.usuario_model import Usuario
-from app.config.config import get_settings
+from app.config.token_codec import TokenDecodeError, decode_token
 from app.database.get_db import get_db
 from app.utils.Exceptions.exceptions import (
     CredentialsException,
@@ -20,8 +19,6 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/token')
 Session = Annotated[Session, Depends(get_db)]
 oauth2 = Annotated[str, Depends(oauth2_scheme)]
 
-user_cache = TTLCache(maxsize=100, ttl=300)
-
 
 def verify_permission(user_permissions: list[str], required_permission: str):
     """
@@ -54,7 +51,6 @@ def get_user_by_email(email_user: str, db: Session):
     return db.query(Usuario).filter(Usuario.email == email_user).first()
 
 
-@lru_cache(maxsize=100)
 def get_user_permissions(user_id: int, db: Session):
     """
     Obtém as permissões de um usuário.
@@ -69,14 +65,55 @@ def get_user_permissions(user_id: int, db: Session):
     user = db.query(Usuario).filter(Usuario.id == user_id).first()
     if user is None:
         raise UserNotFoundException()
+    return permissions_from_user(user)
+
+
+def permissions_from_user(user: Usuario) -> list[str]:
+    """
+    Monta a lista de permissões de um usuário já carregado.
+
+    Args:
+        user (Usuario): O usuário.
+
+    Returns:
+        List[str]: Uma lista de permissões do usuário.
+    """
     # Retorna o tipo de usuário como uma permissão
     return [user.tipo.tipo]
 
 
+def replace_password_hash(
+    db: Session, user_id: int, old_hash: str, new_hash: str
+) -> bool:
+    """
+    Substitui o hash da senha de um usuário, apenas se o hash armazenado ainda
+    for `old_hash` (evita sobrescrever uma troca de senha concorrente).
+
+    Args:
+        db (Session): A sessão do banco de dados.
+        user_id (int): O ID do usuário.
+        old_hash (str): O hash esperado no banco.
+        new_hash (str): O novo hash.
+
+    Returns:
+        bool: True se o hash foi atualizado.
+    """
+    result = db.execute(
+        update(Usuario)
+        .where(Usuario.id == user_id, Usuario.senha == old_hash)
+        .values(senha=new_hash)
+    )
+    db.commit()
+    identity_cache.invalidate_user(user_id)
+    return result.rowcount == 1
+
+
 def decode_jwt(token: str):
     """
     Decodifica um token JWT e retorna o payload.
 
+    Tokens já verificados são servidos pelo `token_cache` até o seu `exp`.
+
     Args:
         token (str): O token JWT a ser decodificado.
 
@@ -84,58 +121,68 @@ def decode_jwt(token: str):
         dict: O payload decodificado.
     """
     try:
-        # Decodifica o token JWT
-        # print(f'Token: {token}')  # Imprime o token
-        payload = jwt.decode(
-            token,
-            get_settings().SECRET_KEY,
-            algorithms=get_settings().ALGORITHM,
-        )
-        return payload
-    except JWTError:
+        return decode_token(token)
+    except TokenDecodeError:
+        raise CredentialsException()
+
+
+def check_token_version(payload: dict, user: UserSnapshot):
+    """
+    Recusa tokens emitidos antes da última troca de senha do usuário.
+
+    Tokens sem a claim `ver` (emitidos antes dela existir) são aceitos.
+
+    Raises:
+        CredentialsException: Se a versão do token não for a atual.
+    """
+    version = payload.get('ver')
+    if version is not None and version != user.token_version:
         raise CredentialsException()
 
 
 def get_user_and_permissions(
     email: str, payload: dict, db: Session
-) -> tuple[Usuario, list[str]]:
+) -> tuple[UserSnapshot, list[str]]:
     """
     Obtém o usuário e as permissões com base no email fornecido.
 
+    Usa o `identity_cache`: se o usuário estiver em cache nenhuma consulta é
+    feita ao banco; senão, o usuário e o seu tipo são carregados e guardados
+    como snapshot.
+
     Args:
         email (str): O email do usuário.
-        payload (dict): O payload contendo as permissões do usuário.
+        payload (dict): O payload do token (as permissões vêm do banco, não dele).
         db (Session): A sessão do banco de dados.
 
     Returns:
-        tuple: Uma tupla contendo o usuário e as permissões.
+        tuple: Uma tupla contendo o snapshot do usuário e as permissões.
     """
-    if email not in user_cache:
+    identity = identity_cache.get(email)
+    if identity is None:
+        geracao = identity_cache.geracao
         user = get_user_by_email(db=db, email_user=email)
         if user is None:
             raise CredentialsException()
-        user_cache[email] = user
-        # print('Usuário adicionado ao cache:', user)
-        permissions = user_cache[email] = payload.get('permissions', [])
-        # print('Permissões do user adicionadas ao cache:', permissions)
-    else:
-        user = user_cache[email]
-        # print('Usuário obtido do cache:', user)
-        permissions = user_cache[email]
-        # print('Permissões do user obtidas do cache:', permissions)
-        user = get_user_by_email(db=db, email_user=email)
-    return user, permissions
+        identity = identity_cache.put(
+            user, permissions_from_user(user), geracao
+        )
+    return identity.user, list(identity.permissions)
 
 
-async def get_current_user(token: oauth2, db: Session):
+def get_current_user(token: oauth2, db: Session):
     """
     Retorna o usuário atual com base no token fornecido.
 
+    A dependência é síncrona para que o FastAPI a execute no threadpool; as
+    consultas ao banco não bloqueiam o event loop.
+
     Args:
         token (oauth2): O token de autenticação.
         db (Session): A sessão do banco de dados.
     Returns:
-        dict: um dicionario contendo o usuario e as permissoes
+        dict: um dicionario contendo o usuario (um `UserSnapshot`, sem sessão)
+        e as permissoes
     """
     payload = decode_jwt(token)
     # Obtem o email do usuário a partir do payload do token
@@ -145,4 +192,5 @@ async def get_current_user(token: oauth2, db: Session):
         raise CredentialsException()
 
     user, permissions = get_user_and_permissions(email, payload, db)
+    check_token_version(payload, user)
     return {'user': user, 'permissions': permissions}
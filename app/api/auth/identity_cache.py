@@ -0,0 +1,221 @@
+import json
+from dataclasses import dataclass
+from threading import Lock
+
+from cachetools import TTLCache
+
+from app.api.usuario.usuario_model import Usuario
+from app.cache.backend import CacheBackend
+from app.config.config import get_settings
+
+# Canal, no backend compartilhado, das invalidações de usuários e tipos
+CANAL = 'identity'
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """
+    Cópia imutável e desacoplada da sessão dos dados de um `Usuario`.
+
+    Não guarda o hash da senha: rotas que precisam dele (ou do objeto ORM)
+    devem carregar o usuário pelo `id`.
+    """
+
+    id: int
+    email: str
+    nome: str
+    tipo_id: int
+    token_version: int
+
+    @classmethod
+    def from_usuario(cls, user: Usuario) -> 'UserSnapshot':
+        return cls(
+            id=user.id,
+            email=user.email,
+            nome=user.nome,
+            tipo_id=user.tipo_id,
+            token_version=user.token_version,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CachedIdentity:
+    user: UserSnapshot
+    permissions: tuple[str, ...]
+
+
+class IdentityCache:
+    """
+    Cache (por processo) de usuário + permissões usado pela autenticação.
+
+    As entradas são indexadas pelo email (que vem no `sub` do token), com um
+    índice auxiliar por `id` para invalidação. A expiração é por TTL e, ao
+    atingir o tamanho máximo, os menos usados são descartados (LRU).
+
+    Invalidação explícita é feita pelas operações de escrita em usuários e
+    tipos de usuário. Conectado a um backend compartilhado (`conectar`),
+    cada invalidação também é publicada e aplicada pelos outros workers na
+    próxima leitura; sem isso, o TTL limita a defasagem entre processos.
+    Cada invalidação incrementa `geracao`, e `put` descarta entradas
+    carregadas antes da última invalidação, para que uma leitura concorrente
+    não recoloque dados antigos no cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._lock = Lock()
+        self._por_email: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._email_por_id: dict[int, str] = {}
+        self._backend: CacheBackend | None = None
+        self.geracao = 0
+        self.hits = 0
+        self.misses = 0
+
+    def conectar(self, backend: CacheBackend | None):
+        """
+        Passa a publicar as invalidações no backend e a aplicar as publicadas
+        pelos outros workers; com None, volta a invalidar só neste processo.
+        """
+        if backend is self._backend:
+            return
+        self._backend = backend
+        if backend is not None:
+            backend.subscribe(CANAL, self._receber)
+
+    def get(self, email: str) -> CachedIdentity | None:
+        """
+        Retorna a identidade em cache para o email, contabilizando hit/miss.
+        """
+        if self._backend is not None:
+            self._backend.poll()
+        with self._lock:
+            identity = self._por_email.get(email)
+            if identity is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return identity
+
+    def put(
+        self,
+        user: Usuario,
+        permissions: list[str],
+        geracao: int | None = None,
+    ) -> CachedIdentity:
+        """
+        Cria o snapshot do usuário e o guarda no cache.
+
+        Args:
+            user (Usuario): O usuário carregado do banco.
+            permissions (list[str]): As permissões do usuário.
+            geracao (int, optional): O valor de `geracao` lido antes de
+                consultar o banco; se houve invalidação desde então, a entrada
+                não é armazenada.
+
+        Returns:
+            CachedIdentity: A identidade criada.
+        """
+        identity = CachedIdentity(
+            UserSnapshot.from_usuario(user), tuple(permissions)
+        )
+        with self._lock:
+            if geracao is None or geracao == self.geracao:
+                self._limpar_indice()
+                self._por_email[identity.user.email] = identity
+                self._email_por_id[identity.user.id] = identity.user.email
+        return identity
+
+    def invalidate_user(
+        self, user_id: int | None = None, email: str | None = None
+    ):
+        """
+        Remove do cache o usuário informado (por id e/ou email), aqui e nos
+        outros workers.
+        """
+        self._invalidar_usuario(user_id, email)
+        self._publicar({'user_id': user_id, 'email': email})
+
+    def invalidate_tipo(self, tipo_id: int):
+        """
+        Remove do cache todos os usuários de um tipo (suas permissões mudaram),
+        aqui e nos outros workers.
+        """
+        self._invalidar_tipo(tipo_id)
+        self._publicar({'tipo_id': tipo_id})
+
+    def _invalidar_usuario(self, user_id: int | None, email: str | None):
+        with self._lock:
+            self.geracao += 1
+            if user_id is not None:
+                email_antigo = self._email_por_id.pop(user_id, None)
+                if email_antigo is not None:
+                    self._por_email.pop(email_antigo, None)
+            if email is not None:
+                identity = self._por_email.pop(email, None)
+                if identity is not None:
+                    self._email_por_id.pop(identity.user.id, None)
+
+    def _invalidar_tipo(self, tipo_id: int):
+        with self._lock:
+            self.geracao += 1
+            for email, identity in list(self._por_email.items()):
+                if identity.user.tipo_id == tipo_id:
+                    del self._por_email[email]
+                    self._email_por_id.pop(identity.user.id, None)
+
+    def _publicar(self, evento: dict):
+        if self._backend is not None:
+            self._backend.publish(CANAL, json.dumps(evento).encode())
+
+    def _receber(self, mensagem: bytes | None):
+        if mensagem is None:
+            with self._lock:
+                self.geracao += 1
+                self._por_email.clear()
+                self._email_por_id.clear()
+            return
+        evento = json.loads(mensagem)
+        if 'tipo_id' in evento:
+            self._invalidar_tipo(evento['tipo_id'])
+        else:
+            self._invalidar_usuario(evento['user_id'], evento['email'])
+
+    def clear(self):
+        """
+        Esvazia o cache e zera os contadores.
+        """
+        with self._lock:
+            self.geracao += 1
+            self._por_email.clear()
+            self._email_por_id.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores de uso do cache.
+        """
+        with self._lock:
+            self._por_email.expire()
+            self._limpar_indice()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._por_email),
+                'maxsize': self._por_email.maxsize,
+                'ttl': self._por_email.ttl,
+            }
+
+    def _limpar_indice(self):
+        # Remove do índice por id os emails que já expiraram/foram descartados
+        if len(self._email_por_id) > len(self._por_email):
+            self._email_por_id = {
+                user_id: email
+                for user_id, email in self._email_por_id.items()
+                if email in self._por_email
+            }
+
+
+identity_cache = IdentityCache(
+    maxsize=get_settings().IDENTITY_CACHE_SIZE,
+    ttl=get_settings().IDENTITY_CACHE_TTL,
+)
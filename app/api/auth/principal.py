@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.api.auth.crud_auth import decode_jwt, oauth2
+from app.utils.Exceptions.exceptions import CredentialsException
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Identidade do usuário autenticado montada apenas a partir das claims
+    assinadas do token.
+    """
+
+    id: int
+    email: str
+    permissions: tuple[str, ...]
+    token_version: int
+
+
+async def get_current_principal(token: oauth2) -> Principal:
+    """
+    Retorna o usuário autenticado sem acessar o banco de dados.
+
+    Confia nas claims do token (`sub`, `uid`, `permissions`, `ver`), que são
+    assinadas por nós. Por isso alterações de permissão, trocas de senha ou a
+    remoção do usuário só valem para esta dependência quando o token expira
+    (ACCESS_TOKEN_EXPIRE_MINUTES); rotas que precisam do estado atual do
+    usuário, ou do objeto ORM, devem usar `get_current_user`.
+
+    Args:
+        token (oauth2): O token de autenticação.
+
+    Returns:
+        Principal: O id, email, permissões e versão do token do usuário.
+
+    Raises:
+        CredentialsException: Se o token for inválido ou não tiver as claims.
+    """
+    payload = decode_jwt(token)
+    email = payload.get('sub')
+    user_id = payload.get('uid')
+    permissions = payload.get('permissions')
+    if email is None or not isinstance(user_id, int) or permissions is None:
+        raise CredentialsException()
+    return Principal(
+        id=user_id,
+        email=email,
+        permissions=tuple(permissions),
+        token_version=payload.get('ver', 0),
+    )
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
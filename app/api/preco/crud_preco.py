@@ -0,0 +1,136 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.area.area_model import Area
+from app.api.area.crud_area import get_area_by_id
+from app.api.preco.preco_model import AreaTarifa, TarifaFaixa
+from app.api.preco.preco_schema import CotacaoItem, TarifaCreate
+from app.api.preco.pricing_batch import calcular_lote
+from app.api.preco.pricing_cache import pricing_cache
+from app.api.reserva.reserva_schema import ReservationCreate
+from app.database.get_db import get_db
+from app.utils.Exceptions.exceptions import ObjectNotFoundException
+
+Session = Annotated[Session, Depends(get_db)]
+
+
+def get_tarifa(area_id: int, db: Session) -> AreaTarifa:
+    """
+    Obtém a tarifa de uma área.
+
+    Args:
+        area_id (int): O ID da área.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        AreaTarifa: A tarifa da área.
+
+    Raises:
+        ObjectNotFoundException: Se a área não tiver tarifa cadastrada.
+    """
+    tarifa = db.scalar(select(AreaTarifa).where(AreaTarifa.area_id == area_id))
+    if not tarifa:
+        raise ObjectNotFoundException('Tarifa da area', area_id)
+    return tarifa
+
+
+def set_tarifa(db: Session, area_id: int, tarifa: TarifaCreate) -> AreaTarifa:
+    """
+    Cria ou substitui a tarifa de uma área (inclusive as faixas).
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        area_id (int): O ID da área.
+        tarifa (TarifaCreate): A nova tarifa.
+
+    Returns:
+        AreaTarifa: A tarifa gravada.
+
+    Raises:
+        ObjectNotFoundException: Se a área não existir.
+    """
+    get_area_by_id(area_id, db)
+    dados = tarifa.model_dump(exclude={'faixas'})
+    try:
+        db_tarifa = get_tarifa(area_id, db)
+    except ObjectNotFoundException:
+        db_tarifa = AreaTarifa(area_id=area_id)
+        db.add(db_tarifa)
+    for dado, valor in dados.items():
+        setattr(db_tarifa, dado, valor)
+    db_tarifa.faixas = [
+        TarifaFaixa(**faixa.model_dump()) for faixa in tarifa.faixas
+    ]
+    db.commit()
+    pricing_cache.invalidar_area(area_id)
+    return db_tarifa
+
+
+def delete_tarifa(area_id: int, db: Session):
+    """
+    Remove a tarifa de uma área, que volta a usar a tabela padrão.
+
+    Args:
+        area_id (int): O ID da área.
+        db (Session): Sessão do banco de dados.
+
+    Raises:
+        ObjectNotFoundException: Se a área não tiver tarifa cadastrada.
+    """
+    db.delete(get_tarifa(area_id, db))
+    db.commit()
+    pricing_cache.invalidar_area(area_id)
+
+
+def preco_reserva(db: Session, reservation: ReservationCreate) -> int:
+    """
+    Calcula o valor de uma reserva pela tabela de preços da área.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        reservation (ReservationCreate): Os dados da reserva.
+
+    Returns:
+        int: O valor da reserva.
+    """
+    return pricing_cache.tabela(db, reservation.area_id).calcular(
+        reservation.hora_inicio, reservation.hora_fim
+    )
+
+
+def quote_reservations(db: Session, itens: list[CotacaoItem]) -> list[int]:
+    """
+    Calcula o valor de vários horários candidatos de uma vez.
+
+    As áreas são validadas com uma consulta e as tabelas compiladas vêm do
+    cache; o cálculo é feito em lote, com NumPy (ver `calcular_lote`).
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        itens (list[CotacaoItem]): Os horários (area_id, hora_inicio, hora_fim).
+
+    Returns:
+        list[int]: O valor de cada horário, na ordem recebida.
+
+    Raises:
+        ObjectNotFoundException: Se alguma das áreas não existir.
+    """
+    if not itens:
+        return []
+    area_ids = sorted({item.area_id for item in itens})
+    existentes = set(db.scalars(select(Area.id).where(Area.id.in_(area_ids))))
+    for area_id in area_ids:
+        if area_id not in existentes:
+            raise ObjectNotFoundException('Area', area_id)
+
+    tabelas = pricing_cache.tabelas(db, area_ids)
+    posicao = {area_id: pos for pos, area_id in enumerate(area_ids)}
+    return calcular_lote(
+        [tabelas[area_id] for area_id in area_ids],
+        [posicao[item.area_id] for item in itens],
+        [item.hora_inicio for item in itens],
+        [item.hora_fim for item in itens],
+    ).tolist()
@@ -0,0 +1,58 @@
+from datetime import time
+
+from sqlalchemy import ForeignKey, Integer, Time
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database.base import Base
+
+
+class AreaTarifa(Base):
+    """
+    Tabela de preços de uma área.
+
+    Os valores são em reais por hora, cobrados por minuto. As faixas
+    substituem `valor_hora` nos horários de pico (ou fora dele); o percentual
+    de fim de semana vale para sábados e domingos e `valor_diaria` limita o
+    total cobrado em cada dia do calendário.
+    """
+
+    __tablename__ = 'area_tarifas'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    area_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('areas.id'), unique=True
+    )
+    valor_hora: Mapped[int] = mapped_column(Integer)
+    valor_diaria: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    valor_minimo: Mapped[int] = mapped_column(Integer, default=0)
+    fim_de_semana_percentual: Mapped[int] = mapped_column(Integer, default=100)
+
+    faixas: Mapped[list['TarifaFaixa']] = relationship(
+        back_populates='tarifa',
+        cascade='all, delete-orphan',
+        order_by='TarifaFaixa.id',
+        lazy='selectin',
+    )
+
+
+class TarifaFaixa(Base):
+    """
+    Faixa de horário com valor próprio (ex.: pico das 18h às 22h).
+
+    Sem `dia_semana` (0 = segunda), a faixa vale para todos os dias; quando
+    faixas se sobrepõem, a cadastrada por último prevalece.
+    """
+
+    __tablename__ = 'tarifa_faixas'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    tarifa_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('area_tarifas.id', ondelete='CASCADE'), index=True
+    )
+    dia_semana: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    hora_inicio: Mapped[time] = mapped_column(Time)
+    # 00:00 indica o fim do dia
+    hora_fim: Mapped[time] = mapped_column(Time)
+    valor_hora: Mapped[int] = mapped_column(Integer)
+
+    tarifa: Mapped[AreaTarifa] = relationship(back_populates='faixas')
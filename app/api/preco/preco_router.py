@@ -0,0 +1,94 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+import app.api.preco.crud_preco as crud_preco
+from app.api.auth.crud_auth import verify_permission
+from app.api.auth.principal import CurrentPrincipal
+from app.api.preco.preco_schema import TarifaCreate, TarifaPublic
+from app.config.config import get_settings
+from app.database.get_db import get_db
+from app.utils.Exceptions.exceptions import (
+    ObjectNotFoundException,
+    sem_permissao_exception,
+)
+
+router_preco = APIRouter()
+
+Session = Annotated[Session, Depends(get_db)]
+
+
+@router_preco.get('/areas/{area_id}/tarifa', response_model=TarifaPublic)
+def get_tarifa(area_id: int, db: Session):
+    """
+    Obtém a tabela de preços de uma área.
+
+    Args:
+        area_id (int): O ID da área.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        AreaTarifa: A tarifa da área.
+    """
+    try:
+        return crud_preco.get_tarifa(area_id, db)
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+
+
+@router_preco.put('/areas/{area_id}/tarifa', response_model=TarifaPublic)
+def set_tarifa(
+    area_id: int,
+    tarifa: TarifaCreate,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Cria ou substitui a tabela de preços de uma área (somente administradores).
+
+    Args:
+        area_id (int): O ID da área.
+        tarifa (TarifaCreate): Valor da hora, diária, mínimo, percentual de fim de semana e faixas de horário.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        AreaTarifa: A tarifa gravada.
+    """
+    if not verify_permission(
+        current_user.permissions, get_settings().ADMINISTRADOR
+    ):
+        raise sem_permissao_exception()
+    try:
+        return crud_preco.set_tarifa(db, area_id, tarifa)
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+
+
+@router_preco.delete('/areas/{area_id}/tarifa')
+def delete_tarifa(
+    area_id: int,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Remove a tabela de preços de uma área, que volta ao preço padrão.
+
+    Args:
+        area_id (int): O ID da área.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        dict: Uma mensagem indicando que a tarifa foi removida.
+    """
+    if not verify_permission(
+        current_user.permissions, get_settings().ADMINISTRADOR
+    ):
+        raise sem_permissao_exception()
+    try:
+        crud_preco.delete_tarifa(area_id, db)
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    return {'detail': 'Tarifa deletada com sucesso'}
@@ -0,0 +1,58 @@
+from datetime import time
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.utils.schemas.base_schemas import DataHora, valida_horario
+
+
+def _minutos(hora: time) -> int:
+    return hora.hour * 60 + hora.minute
+
+
+class TarifaFaixaCreate(BaseModel):
+    dia_semana: int | None = Field(None, ge=0, le=6)
+    hora_inicio: time
+    hora_fim: time
+    valor_hora: int = Field(ge=0)
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode='after')
+    def valida_faixa(self) -> 'TarifaFaixaCreate':
+        # As tabelas compiladas têm um valor por slot de 15 minutos
+        for hora in (self.hora_inicio, self.hora_fim):
+            if hora.second or hora.microsecond or hora.minute % 15:
+                raise ValueError(
+                    'os horários devem ser múltiplos de 15 minutos'
+                )
+        fim = _minutos(self.hora_fim) or 24 * 60
+        if fim <= _minutos(self.hora_inicio):
+            raise ValueError('hora_fim deve ser posterior a hora_inicio')
+        return self
+
+
+class TarifaCreate(BaseModel):
+    valor_hora: int = Field(ge=0)
+    valor_diaria: int | None = Field(None, ge=0)
+    valor_minimo: int = Field(0, ge=0)
+    fim_de_semana_percentual: int = Field(100, ge=0)
+    faixas: list[TarifaFaixaCreate] = []
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TarifaPublic(TarifaCreate):
+    area_id: int
+
+
+class CotacaoItem(BaseModel):
+    area_id: int
+    hora_inicio: DataHora
+    hora_fim: DataHora
+
+    @model_validator(mode='after')
+    def valida_horario(self) -> 'CotacaoItem':
+        valida_horario(self.hora_inicio, self.hora_fim)
+        return self
+
+
+class CotacaoResult(BaseModel):
+    valores: list[int]
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from app.utils.slots import DIA, SLOT_MINUTOS, SLOTS_POR_DIA
+
+SLOT_SEGUNDOS = SLOT_MINUTOS * 60
+# As taxas compiladas ficam em centésimos de real por hora, o que deixa o
+# percentual de fim de semana exato em inteiros.
+ESCALA = 100
+FIM_DE_SEMANA = (5, 6)
+
+
+@dataclass(frozen=True, slots=True)
+class TabelaPreco:
+    """
+    Tabela de preços compilada de uma área.
+
+    Para cada dia da semana guarda a taxa de cada slot de 15 minutos e a soma
+    acumulada (taxa x segundos) até o início de cada slot, então o valor de
+    qualquer trecho de um dia sai de duas consultas à tabela, sem percorrer
+    os slots.
+    """
+
+    taxas: tuple[tuple[int, ...], ...]
+    acumulados: tuple[tuple[int, ...], ...]
+    valor_diaria: int | None = None
+    valor_minimo: int = 0
+
+    @classmethod
+    def compilar(
+        cls,
+        valor_hora: int,
+        faixas=(),
+        fim_de_semana_percentual: int = 100,
+        valor_diaria: int | None = None,
+        valor_minimo: int = 0,
+    ) -> 'TabelaPreco':
+        """
+        Monta a tabela a partir da tarifa da área e das suas faixas.
+
+        Args:
+            valor_hora (int): Valor padrão da hora.
+            faixas (Iterable): Faixas com `dia_semana`, `hora_inicio`, `hora_fim` e `valor_hora`, em ordem de prioridade crescente.
+            fim_de_semana_percentual (int): Percentual aplicado aos sábados e domingos.
+            valor_diaria (int, optional): Limite do valor cobrado em um dia.
+            valor_minimo (int): Valor mínimo de uma reserva.
+
+        Returns:
+            TabelaPreco: A tabela compilada.
+        """
+        semana = [[valor_hora] * SLOTS_POR_DIA for _ in range(7)]
+        for faixa in faixas:
+            primeiro = _slot(faixa.hora_inicio)
+            ultimo = _slot(faixa.hora_fim) or SLOTS_POR_DIA
+            dias = (
+                range(7) if faixa.dia_semana is None else (faixa.dia_semana,)
+            )
+            for dia in dias:
+                semana[dia][primeiro:ultimo] = [faixa.valor_hora] * (
+                    ultimo - primeiro
+                )
+        percentuais = [
+            fim_de_semana_percentual if dia in FIM_DE_SEMANA else ESCALA
+            for dia in range(7)
+        ]
+        taxas = tuple(
+            tuple(valor * percentuais[dia] for valor in semana[dia])
+            for dia in range(7)
+        )
+        acumulados = tuple(
+            tuple(
+                accumulate(
+                    (taxa * SLOT_SEGUNDOS for taxa in taxas_dia), initial=0
+                )
+            )
+            for taxas_dia in taxas
+        )
+        return cls(taxas, acumulados, valor_diaria, valor_minimo)
+
+    @classmethod
+    def from_model(cls, tarifa) -> 'TabelaPreco':
+        return cls.compilar(
+            tarifa.valor_hora,
+            tarifa.faixas,
+            tarifa.fim_de_semana_percentual,
+            tarifa.valor_diaria,
+            tarifa.valor_minimo,
+        )
+
+    def calcular(self, inicio: datetime, fim: datetime) -> int:
+        """
+        Calcula o valor de uma reserva de `inicio` a `fim`.
+
+        Cada dia do calendário é cobrado por minuto (com arredondamento para
+        baixo) e limitado por `valor_diaria`; o total não fica abaixo de
+        `valor_minimo`.
+
+        Args:
+            inicio (datetime): Início da reserva.
+            fim (datetime): Fim da reserva.
+
+        Returns:
+            int: O valor da reserva.
+        """
+        total = 0
+        comeco = datetime.combine(inicio.date(), time.min)
+        while comeco < fim:
+            de = max(inicio, comeco) - comeco
+            ate = min(fim, comeco + DIA) - comeco
+            dia = comeco.weekday()
+            valor = (self._acumulado(dia, ate) - self._acumulado(dia, de)) // (
+                3600 * ESCALA
+            )
+            if self.valor_diaria is not None:
+                valor = min(valor, self.valor_diaria)
+            total += valor
+            comeco += DIA
+        return max(total, self.valor_minimo)
+
+    def _acumulado(self, dia: int, ate: timedelta) -> int:
+        slot, resto = divmod(int(ate.total_seconds()), SLOT_SEGUNDOS)
+        valor = self.acumulados[dia][slot]
+        if resto:
+            valor += self.taxas[dia][slot] * resto
+        return valor
+
+
+def _slot(hora: time) -> int:
+    return (hora.hour * 60 + hora.minute) // SLOT_MINUTOS
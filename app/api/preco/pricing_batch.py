@@ -0,0 +1,99 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+import numpy as np
+
+from app.api.preco.pricing import ESCALA, SLOT_SEGUNDOS, TabelaPreco
+
+DIA_SEGUNDOS = 24 * 60 * 60
+# Os horários viram segundos desde 0001-01-01 (dia 1 do calendário
+# ordinal), uma segunda-feira
+WEEKDAY_ORDINAL = 6
+SEM_LIMITE = np.iinfo(np.int64).max
+
+
+def calcular_lote(
+    tabelas: Sequence[TabelaPreco],
+    tabela_idx: Sequence[int],
+    inicios: Sequence[datetime],
+    fins: Sequence[datetime],
+) -> np.ndarray:
+    """
+    Calcula o valor de vários horários de uma vez, com o mesmo resultado de
+    `TabelaPreco.calcular` para cada um.
+
+    Cada horário é dividido nos dias do calendário que ele cruza; os trechos
+    são avaliados juntos com operações de vetor sobre as tabelas compiladas
+    (taxas e somas acumuladas empilhadas por tabela e dia da semana) e
+    somados de volta por horário, sem laço em Python por item.
+
+    Args:
+        tabelas (Sequence[TabelaPreco]): As tabelas usadas no lote.
+        tabela_idx (Sequence[int]): A posição em `tabelas` da tabela de cada horário.
+        inicios (Sequence[datetime]): Início de cada horário.
+        fins (Sequence[datetime]): Fim de cada horário.
+
+    Returns:
+        np.ndarray: O valor (int64) de cada horário, na ordem recebida.
+    """
+    taxas = np.array([t.taxas for t in tabelas], dtype=np.int64)
+    acumulados = np.array([t.acumulados for t in tabelas], dtype=np.int64)
+    diarias = np.array(
+        [
+            SEM_LIMITE if t.valor_diaria is None else t.valor_diaria
+            for t in tabelas
+        ],
+        dtype=np.int64,
+    )
+    minimos = np.array([t.valor_minimo for t in tabelas], dtype=np.int64)
+
+    idx = np.asarray(tabela_idx, dtype=np.int64)
+    inicio = _segundos(inicios)
+    fim = _segundos(fins)
+
+    # Trechos: um por dia do calendário cruzado por cada horário
+    primeiro_dia = inicio // DIA_SEGUNDOS
+    ultimo_dia = (fim - 1) // DIA_SEGUNDOS
+    n_dias = np.where(fim > inicio, ultimo_dia - primeiro_dia + 1, 0)
+    item = np.repeat(np.arange(len(inicio)), n_dias)
+    deslocamento = np.arange(len(item)) - np.repeat(
+        np.cumsum(n_dias) - n_dias, n_dias
+    )
+    dia = primeiro_dia[item] + deslocamento
+    comeco = dia * DIA_SEGUNDOS
+    de = np.maximum(inicio[item], comeco) - comeco
+    ate = np.minimum(fim[item], comeco + DIA_SEGUNDOS) - comeco
+
+    tabela = idx[item]
+    weekday = (dia + WEEKDAY_ORDINAL) % 7
+    valor = (
+        _acumulado(taxas, acumulados, tabela, weekday, ate)
+        - _acumulado(taxas, acumulados, tabela, weekday, de)
+    ) // (3600 * ESCALA)
+    valor = np.minimum(valor, diarias[tabela])
+
+    total = np.zeros(len(inicio), dtype=np.int64)
+    np.add.at(total, item, valor)
+    return np.maximum(total, minimos[idx])
+
+
+def _segundos(horarios: Sequence[datetime]) -> np.ndarray:
+    # Bem mais rápido que converter a lista para datetime64
+    return np.fromiter(
+        (
+            h.toordinal() * DIA_SEGUNDOS
+            + h.hour * 3600
+            + h.minute * 60
+            + h.second
+            for h in horarios
+        ),
+        dtype=np.int64,
+        count=len(horarios),
+    )
+
+
+def _acumulado(taxas, acumulados, tabela, weekday, segundos):
+    slot, resto = np.divmod(segundos, SLOT_SEGUNDOS)
+    # slot == 96 só acontece no fim do dia, com resto zero
+    parcial = taxas[tabela, weekday, np.minimum(slot, taxas.shape[2] - 1)]
+    return acumulados[tabela, weekday, slot] + parcial * resto
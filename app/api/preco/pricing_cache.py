@@ -0,0 +1,123 @@
+from collections.abc import Iterable
+from threading import Lock
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.preco.preco_model import AreaTarifa
+from app.api.preco.pricing import TabelaPreco
+from app.cache.backend import CacheBackend
+from app.config.config import get_settings
+
+# Canal, no backend compartilhado, das invalidações por área
+CANAL = 'precos'
+
+
+def tabela_padrao() -> TabelaPreco:
+    """
+    Tabela usada pelas áreas sem tarifa cadastrada.
+    """
+    settings = get_settings()
+    return TabelaPreco.compilar(
+        settings.PRECO_HORA_PADRAO, valor_minimo=settings.PRECO_MINIMO_PADRAO
+    )
+
+
+class PricingCache:
+    """
+    Cache (por processo) das tabelas de preço compiladas, por área.
+
+    A tarifa é lida e compilada uma vez; depois disso calcular o valor de
+    uma reserva (ou de um lote inteiro) não consulta o banco. Áreas sem
+    tarifa ficam em cache com a tabela padrão. As escritas em tarifas chamam
+    `invalidar_area`; `geracao` segue o mesmo papel que no cache de
+    ocorrências. Conectado a um backend compartilhado (`conectar`), a
+    invalidação também chega aos outros workers na próxima leitura; sem
+    isso, só o TTL limita a defasagem entre processos.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._lock = Lock()
+        self._tabelas: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._backend: CacheBackend | None = None
+        self.geracao = 0
+
+    def conectar(self, backend: CacheBackend | None):
+        """
+        Passa a publicar as invalidações no backend e a aplicar as publicadas
+        pelos outros workers; com None, volta a invalidar só neste processo.
+        """
+        if backend is self._backend:
+            return
+        self._backend = backend
+        if backend is not None:
+            backend.subscribe(CANAL, self._receber)
+
+    def tabela(self, db: Session, area_id: int) -> TabelaPreco:
+        """
+        Retorna a tabela compilada da área.
+        """
+        return self.tabelas(db, (area_id,))[area_id]
+
+    def tabelas(
+        self, db: Session, area_ids: Iterable[int]
+    ) -> dict[int, TabelaPreco]:
+        """
+        Retorna as tabelas compiladas das áreas, carregando as que faltam
+        numa única consulta.
+        """
+        if self._backend is not None:
+            self._backend.poll()
+        resultado = {}
+        with self._lock:
+            for area_id in area_ids:
+                resultado[area_id] = self._tabelas.get(area_id)
+            geracao = self.geracao
+        faltando = [a for a, tabela in resultado.items() if tabela is None]
+        if not faltando:
+            return resultado
+
+        carregadas = dict.fromkeys(faltando, tabela_padrao())
+        for tarifa in db.scalars(
+            select(AreaTarifa).where(AreaTarifa.area_id.in_(faltando))
+        ):
+            carregadas[tarifa.area_id] = TabelaPreco.from_model(tarifa)
+        with self._lock:
+            if geracao == self.geracao:
+                self._tabelas.update(carregadas)
+        resultado.update(carregadas)
+        return resultado
+
+    def invalidar_area(self, area_id: int):
+        """
+        Descarta a tabela em cache da área, aqui e nos outros workers.
+        """
+        self._invalidar_area(area_id)
+        if self._backend is not None:
+            self._backend.publish(CANAL, str(area_id).encode())
+
+    def _invalidar_area(self, area_id: int):
+        with self._lock:
+            self.geracao += 1
+            self._tabelas.pop(area_id, None)
+
+    def _receber(self, mensagem: bytes | None):
+        if mensagem is None:
+            self.limpar()
+        else:
+            self._invalidar_area(int(mensagem))
+
+    def limpar(self):
+        """
+        Esvazia o cache.
+        """
+        with self._lock:
+            self.geracao += 1
+            self._tabelas.clear()
+
+
+pricing_cache = PricingCache(
+    maxsize=get_settings().PRECO_CACHE_SIZE,
+    ttl=get_settings().PRECO_CACHE_TTL,
+)
@@ -0,0 +1,215 @@
+from datetime import date, datetime, timedelta
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.area.crud_area import get_area_by_id
+from app.api.recorrencia.occurrence_cache import occurrence_cache
+from app.api.recorrencia.recorrencia_model import RecurrenceRule
+from app.api.recorrencia.recorrencia_schema import RecurrenceRuleCreate
+from app.api.recorrencia.recurrence import Regra, fim_da_serie, ocorrencias
+from app.api.reserva.crud_reserva import area_lock
+from app.api.reserva.reserva_model import Reservation
+from app.api.usuario.crud_usuario import get_user_by_id
+from app.config.config import get_settings
+from app.database.get_db import get_db
+from app.utils.Exceptions.exceptions import (
+    ObjectConflitException,
+    ObjectNotFoundException,
+)
+
+Session = Annotated[Session, Depends(get_db)]
+
+
+def get_rule_by_id(rule_id: int, db: Session) -> RecurrenceRule:
+    """
+    Obtém uma regra de recorrência pelo seu ID.
+
+    Args:
+        rule_id (int): O ID da regra.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        RecurrenceRule: A regra encontrada.
+
+    Raises:
+        ObjectNotFoundException: Se a regra não for encontrada.
+    """
+    rule = db.get(RecurrenceRule, rule_id)
+    if not rule:
+        raise ObjectNotFoundException('Recurrence rule', rule_id)
+    return rule
+
+
+def create_rule(db: Session, rule: RecurrenceRuleCreate) -> RecurrenceRule:
+    """
+    Cria uma regra de recorrência, verificando antes se alguma ocorrência
+    conflita com reservas ou com outras regras da área.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        rule (RecurrenceRuleCreate): Os dados da regra.
+
+    Returns:
+        RecurrenceRule: A regra criada.
+
+    Raises:
+        ObjectNotFoundException: Se o usuário ou a área não existirem.
+        ObjectConflitException: Se alguma ocorrência conflitar com uma reserva ou outra regra.
+    """
+    get_user_by_id(rule.usuario_id, db)
+    get_area_by_id(rule.area_id, db)
+
+    dados = rule.model_dump()
+    dados['excecoes'] = sorted({dia.isoformat() for dia in rule.excecoes})
+    db_rule = RecurrenceRule(**dados)
+    # O mesmo lock das reservas da área: checagem e gravação não podem se
+    # intercalar com a criação de uma reserva no mesmo horário.
+    with area_lock(db, rule.area_id):
+        conflito = find_rule_conflict(db, Regra.from_model(db_rule))
+        if conflito is not None:
+            raise ObjectConflitException(*conflito)
+        db.add(db_rule)
+        db.commit()
+        occurrence_cache.invalidar_area(rule.area_id)
+    return db_rule
+
+
+def add_rule_exception(
+    db: Session, rule: RecurrenceRule, dia: date
+) -> RecurrenceRule:
+    """
+    Cancela a ocorrência de uma regra em um dia (EXDATE).
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        rule (RecurrenceRule): A regra.
+        dia (date): O dia da ocorrência cancelada.
+
+    Returns:
+        RecurrenceRule: A regra atualizada.
+    """
+    # Nova lista para o SQLAlchemy detectar a alteração na coluna JSON
+    rule.excecoes = sorted({*(rule.excecoes or ()), dia.isoformat()})
+    db.commit()
+    occurrence_cache.invalidar_area(rule.area_id)
+    return rule
+
+
+def delete_rule(db: Session, rule: RecurrenceRule):
+    """
+    Deleta uma regra de recorrência (e, com ela, todas as ocorrências).
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        rule (RecurrenceRule): A regra a ser deletada.
+    """
+    area_id = rule.area_id
+    db.delete(rule)
+    db.commit()
+    occurrence_cache.invalidar_area(area_id)
+
+
+def find_rule_conflict(db: Session, regra: Regra) -> tuple[str, int] | None:
+    """
+    Procura uma reserva ou regra da área que conflite com alguma ocorrência.
+
+    As reservas são comparadas uma a uma, mas cada comparação só expande a
+    regra na janela da reserva. Contra outra regra, as duas séries são
+    percorridas juntas, em ordem, até o fim da mais curta, ou por
+    `RECORRENCIA_HORIZONTE_DIAS` quando nenhuma das duas tem fim.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        regra (Regra): A regra a ser verificada.
+
+    Returns:
+        tuple[str, int] | None: O tipo e o ID do objeto em conflito, ou None.
+    """
+    fim_serie = fim_da_serie(regra)
+    stmt = select(
+        Reservation.id, Reservation.hora_inicio, Reservation.hora_fim
+    ).where(
+        Reservation.area_id == regra.area_id,
+        Reservation.hora_fim > regra.inicio,
+    )
+    if fim_serie is not None:
+        stmt = stmt.where(Reservation.hora_inicio < fim_serie)
+    for reserva_id, inicio, fim in db.execute(stmt):
+        if next(ocorrencias(regra, inicio, fim), None) is not None:
+            return 'Reserva', reserva_id
+
+    horizonte = timedelta(days=get_settings().RECORRENCIA_HORIZONTE_DIAS)
+    for outra in occurrence_cache.regras(db, regra.area_id):
+        if outra.id == regra.id:
+            continue
+        inicio = max(regra.inicio, outra.inicio)
+        fins = [fim_serie, fim_da_serie(outra), inicio + horizonte]
+        fim = min(f for f in fins if f is not None)
+        if _series_conflict(
+            ocorrencias(regra, inicio, fim), ocorrencias(outra, inicio, fim)
+        ):
+            return 'Regra de recorrência', outra.id
+    return None
+
+
+def get_area_occurrences(
+    db: Session, area_id: int, inicio: datetime, fim: datetime
+) -> list[dict]:
+    """
+    Lista as ocorrências das regras de uma área dentro de uma janela.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        area_id (int): O ID da área.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela.
+
+    Returns:
+        list[dict]: As ocorrências, ordenadas pelo início.
+    """
+    return [
+        {'regra_id': regra_id, 'inicio': ocorrencia, 'fim': termino}
+        for ocorrencia, termino, regra_id in occurrence_cache.ocorrencias(
+            db, area_id, inicio, fim
+        )
+    ]
+
+
+def get_rule_occurrences(
+    rule: RecurrenceRule, inicio: datetime, fim: datetime
+) -> list[dict]:
+    """
+    Lista as ocorrências de uma regra dentro de uma janela.
+
+    Args:
+        rule (RecurrenceRule): A regra.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela.
+
+    Returns:
+        list[dict]: As ocorrências, ordenadas pelo início.
+    """
+    return [
+        {'regra_id': rule.id, 'inicio': ocorrencia, 'fim': termino}
+        for ocorrencia, termino in ocorrencias(
+            Regra.from_model(rule), inicio, fim
+        )
+    ]
+
+
+def _series_conflict(serie_a, serie_b) -> bool:
+    # Varredura das duas séries ordenadas (as ocorrências de uma mesma regra
+    # não se sobrepõem): avança sempre a que termina primeiro.
+    a = next(serie_a, None)
+    b = next(serie_b, None)
+    while a is not None and b is not None:
+        if a[0] < b[1] and b[0] < a[1]:
+            return True
+        if a[1] <= b[1]:
+            a = next(serie_a, None)
+        else:
+            b = next(serie_b, None)
+    return False
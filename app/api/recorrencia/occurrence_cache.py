@@ -0,0 +1,193 @@
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.recorrencia.recorrencia_model import RecurrenceRule
+from app.api.recorrencia.recurrence import Regra, ocorrencias
+from app.cache.backend import CacheBackend
+from app.config.config import get_settings
+
+# Canal, no backend compartilhado, das invalidações por área
+CANAL = 'recorrencias'
+# (início, fim, id da regra)
+OcorrenciaDia = tuple[datetime, datetime, int]
+
+
+class OccurrenceCache:
+    """
+    Cache (por processo) das ocorrências de regras recorrentes, por área.
+
+    Guarda as regras de cada área e as ocorrências já expandidas de cada
+    (área, dia), ambas com TTL, que limita a defasagem entre processos.
+    Como uma ocorrência dura no máximo um dia, as que cruzam um intervalo
+    estão entre as que começam no dia do intervalo ou no anterior.
+
+    As operações de escrita em regras chamam `invalidar_area`; assim como no
+    cache de identidade, `geracao` impede que uma leitura concorrente
+    recoloque no cache regras carregadas antes da invalidação. Conectado a
+    um backend compartilhado (`conectar`), a invalidação também é publicada
+    e aplicada pelos outros workers na próxima leitura, inclusive na checagem
+    de conflito das reservas; sem isso, só o TTL limita a defasagem.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._lock = Lock()
+        self._regras: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._dias: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._backend: CacheBackend | None = None
+        self.geracao = 0
+
+    def conectar(self, backend: CacheBackend | None):
+        """
+        Passa a publicar as invalidações no backend e a aplicar as publicadas
+        pelos outros workers; com None, volta a invalidar só neste processo.
+        """
+        if backend is self._backend:
+            return
+        self._backend = backend
+        if backend is not None:
+            backend.subscribe(CANAL, self._receber)
+
+    def regras(self, db: Session, area_id: int) -> tuple[Regra, ...]:
+        """
+        Retorna as regras da área, consultando o banco apenas se necessário.
+        """
+        self._poll()
+        with self._lock:
+            regras = self._regras.get(area_id)
+            geracao = self.geracao
+        if regras is not None:
+            return regras
+        regras = self._carregar(db, area_id)
+        with self._lock:
+            if geracao == self.geracao:
+                self._regras[area_id] = regras
+        return regras
+
+    def recarregar_area(self, db: Session, area_id: int):
+        """
+        Relê do banco as regras da área, descartando as ocorrências em cache
+        se as regras mudaram.
+
+        Chamado com a trava da área tomada no banco: as regras gravadas por
+        outro worker antes dela ficam visíveis mesmo que a invalidação
+        publicada por ele ainda não tenha chegado.
+        """
+        regras = self._carregar(db, area_id)
+        with self._lock:
+            if self._regras.get(area_id) != regras:
+                self._descartar_area(area_id)
+                self._regras[area_id] = regras
+
+    @staticmethod
+    def _carregar(db: Session, area_id: int) -> tuple[Regra, ...]:
+        return tuple(
+            Regra.from_model(rule)
+            for rule in db.scalars(
+                select(RecurrenceRule).where(RecurrenceRule.area_id == area_id)
+            )
+        )
+
+    def ocorrencias_dia(
+        self, db: Session, area_id: int, dia: date
+    ) -> tuple[OcorrenciaDia, ...]:
+        """
+        Retorna as ocorrências da área que começam no dia informado.
+        """
+        self._poll()
+        with self._lock:
+            cached = self._dias.get((area_id, dia))
+            geracao = self.geracao
+        if cached is not None:
+            return cached
+        inicio = datetime.combine(dia, time.min)
+        fim = inicio + timedelta(days=1)
+        resultado = tuple(
+            sorted(
+                (ocorrencia, termino, regra.id)
+                for regra in self.regras(db, area_id)
+                for ocorrencia, termino in ocorrencias(regra, inicio, fim)
+                if ocorrencia >= inicio
+            )
+        )
+        with self._lock:
+            if geracao == self.geracao:
+                self._dias[(area_id, dia)] = resultado
+        return resultado
+
+    def ocorrencias(
+        self, db: Session, area_id: int, inicio: datetime, fim: datetime
+    ) -> list[OcorrenciaDia]:
+        """
+        Retorna as ocorrências da área que cruzam `[inicio, fim)`.
+        """
+        if not self.regras(db, area_id):
+            return []
+        resultado = []
+        dia = inicio.date() - timedelta(days=1)
+        while dia <= fim.date():
+            resultado.extend(
+                item
+                for item in self.ocorrencias_dia(db, area_id, dia)
+                if item[0] < fim and item[1] > inicio
+            )
+            dia += timedelta(days=1)
+        return resultado
+
+    def buscar_conflito(
+        self, db: Session, area_id: int, inicio: datetime, fim: datetime
+    ) -> int | None:
+        """
+        Retorna o ID de uma regra com ocorrência cruzando `[inicio, fim)`.
+        """
+        for _, _, regra_id in self.ocorrencias(db, area_id, inicio, fim):
+            return regra_id
+        return None
+
+    def invalidar_area(self, area_id: int):
+        """
+        Descarta as regras e as ocorrências em cache da área, aqui e nos
+        outros workers.
+        """
+        self._invalidar_area(area_id)
+        if self._backend is not None:
+            self._backend.publish(CANAL, str(area_id).encode())
+
+    def _invalidar_area(self, area_id: int):
+        with self._lock:
+            self._descartar_area(area_id)
+
+    def _descartar_area(self, area_id: int):
+        # Chamado com self._lock
+        self.geracao += 1
+        self._regras.pop(area_id, None)
+        for chave in [k for k in self._dias if k[0] == area_id]:
+            del self._dias[chave]
+
+    def _poll(self):
+        if self._backend is not None:
+            self._backend.poll()
+
+    def _receber(self, mensagem: bytes | None):
+        if mensagem is None:
+            self.limpar()
+        else:
+            self._invalidar_area(int(mensagem))
+
+    def limpar(self):
+        """
+        Esvazia o cache.
+        """
+        with self._lock:
+            self.geracao += 1
+            self._regras.clear()
+            self._dias.clear()
+
+
+occurrence_cache = OccurrenceCache(
+    maxsize=get_settings().RECORRENCIA_CACHE_SIZE,
+    ttl=get_settings().RECORRENCIA_CACHE_TTL,
+)
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+class RecurrenceRule(Base):
+    """
+    Regra de reservas recorrentes de uma área (no estilo RRULE).
+
+    Apenas a regra é gravada; as ocorrências são calculadas sob demanda para
+    a janela consultada (ver `recurrence.ocorrencias`).
+    """
+
+    __tablename__ = 'recurrence_rules'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    area_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('areas.id'), index=True
+    )
+    usuario_id: Mapped[int] = mapped_column(Integer, ForeignKey('usuario.id'))
+    # 'DAILY', 'WEEKLY' ou 'MONTHLY'
+    frequencia: Mapped[str] = mapped_column(String(10))
+    intervalo: Mapped[int] = mapped_column(Integer, default=1)
+    # Dias da semana (0 = segunda) das regras semanais
+    dias_semana: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)
+    # Início da primeira ocorrência (DTSTART)
+    inicio: Mapped[datetime] = mapped_column(DateTime)
+    duracao_minutos: Mapped[int] = mapped_column(Integer)
+    ate: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    contagem: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Dias (ISO 8601) em que a ocorrência foi cancelada
+    excecoes: Mapped[list[str]] = mapped_column(JSON, default=list)
+    justificacao: Mapped[str] = mapped_column(String)
+    reserva_tipo: Mapped[str] = mapped_column(String)
@@ -0,0 +1,214 @@
+from datetime import date, datetime, timedelta
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+import app.api.recorrencia.crud_recorrencia as crud_recorrencia
+from app.api.auth.crud_auth import verify_permission
+from app.api.auth.principal import CurrentPrincipal, Principal
+from app.api.recorrencia.recorrencia_model import RecurrenceRule
+from app.api.recorrencia.recorrencia_schema import (
+    OcorrenciaList,
+    RecurrenceRuleCreate,
+    RecurrenceRulePublic,
+)
+from app.config.config import get_settings
+from app.database.get_db import get_db
+from app.utils.Exceptions.exceptions import (
+    ObjectConflitException,
+    ObjectNotFoundException,
+    sem_permissao_exception,
+)
+from app.utils.schemas.base_schemas import DataHoraQuery
+
+router_recorrencia = APIRouter()
+
+Session = Annotated[Session, Depends(get_db)]
+
+
+def _verifica_dono(current_user: Principal, usuario_id: int):
+    if current_user.id != usuario_id and not verify_permission(
+        current_user.permissions, get_settings().ADMINISTRADOR
+    ):
+        raise sem_permissao_exception()
+
+
+def _verifica_janela(inicio: datetime, fim: datetime):
+    maximo = get_settings().RECORRENCIA_JANELA_MAX_DIAS
+    if fim <= inicio or fim - inicio > timedelta(days=maximo):
+        raise HTTPException(
+            status_code=400,
+            detail=f'A janela deve ter entre 0 e {maximo} dias',
+        )
+
+
+def _get_rule(regra_id: int, db: Session) -> RecurrenceRule:
+    try:
+        return crud_recorrencia.get_rule_by_id(regra_id, db)
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+
+
+@router_recorrencia.post('/recorrencias', response_model=RecurrenceRulePublic)
+def create_recorrencia(
+    regra: RecurrenceRuleCreate,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Cria uma regra de reservas recorrentes (ex.: toda terça, 19h às 21h).
+
+    Args:
+        regra (RecurrenceRuleCreate): Os dados da regra.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        RecurrenceRule: A regra criada.
+
+    Raises:
+        HTTPException(404): Se o usuário ou a área não existirem.
+        HTTPException(400): Se alguma ocorrência conflitar com uma reserva ou outra regra.
+        HTTPException(422): Se a série passar do maior horário suportado.
+    """
+    _verifica_dono(current_user, regra.usuario_id)
+    try:
+        return crud_recorrencia.create_rule(db, regra)
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    except ObjectConflitException as ex:
+        raise HTTPException(status_code=400, detail=ex.args[0]) from ex
+    except OverflowError as ex:
+        raise HTTPException(
+            status_code=422,
+            detail='A série passa do maior horário suportado',
+        ) from ex
+
+
+@router_recorrencia.get(
+    '/recorrencias/{regra_id}', response_model=RecurrenceRulePublic
+)
+def get_recorrencia(
+    regra_id: int,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Obtém uma regra de recorrência pelo ID.
+
+    Args:
+        regra_id (int): O ID da regra.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        RecurrenceRule: A regra.
+    """
+    return _get_rule(regra_id, db)
+
+
+@router_recorrencia.get(
+    '/recorrencias/{regra_id}/ocorrencias', response_model=OcorrenciaList
+)
+def get_recorrencia_ocorrencias(
+    regra_id: int,
+    inicio: DataHoraQuery,
+    fim: DataHoraQuery,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Lista as ocorrências de uma regra dentro de uma janela.
+
+    Args:
+        regra_id (int): O ID da regra.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela, até `RECORRENCIA_JANELA_MAX_DIAS` depois do início.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        dict: Dicionário contendo a lista de ocorrências.
+    """
+    _verifica_janela(inicio, fim)
+    rule = _get_rule(regra_id, db)
+    return {
+        'ocorrencias': crud_recorrencia.get_rule_occurrences(rule, inicio, fim)
+    }
+
+
+@router_recorrencia.post(
+    '/recorrencias/{regra_id}/excecoes', response_model=RecurrenceRulePublic
+)
+def add_recorrencia_excecao(
+    regra_id: int,
+    data: date,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Cancela a ocorrência de uma regra em um dia.
+
+    Args:
+        regra_id (int): O ID da regra.
+        data (date): O dia da ocorrência cancelada.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        RecurrenceRule: A regra atualizada.
+    """
+    rule = _get_rule(regra_id, db)
+    _verifica_dono(current_user, rule.usuario_id)
+    return crud_recorrencia.add_rule_exception(db, rule, data)
+
+
+@router_recorrencia.delete('/recorrencias/{regra_id}')
+def delete_recorrencia(
+    regra_id: int,
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Deleta uma regra de recorrência e todas as suas ocorrências.
+
+    Args:
+        regra_id (int): O ID da regra.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        dict: Um dicionário indicando que a regra foi deletada com sucesso.
+    """
+    rule = _get_rule(regra_id, db)
+    _verifica_dono(current_user, rule.usuario_id)
+    crud_recorrencia.delete_rule(db, rule)
+    return {'detail': 'Regra de recorrência deletada com sucesso'}
+
+
+@router_recorrencia.get(
+    '/areas/{area_id}/ocorrencias', response_model=OcorrenciaList
+)
+def get_area_ocorrencias(
+    area_id: int,
+    inicio: DataHoraQuery,
+    fim: DataHoraQuery,
+    db: Session,
+):
+    """
+    Lista as ocorrências de todas as regras recorrentes de uma área.
+
+    Args:
+        area_id (int): O ID da área.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela, até `RECORRENCIA_JANELA_MAX_DIAS` depois do início.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+
+    Returns:
+        dict: Dicionário contendo a lista de ocorrências.
+    """
+    _verifica_janela(inicio, fim)
+    return {
+        'ocorrencias': crud_recorrencia.get_area_occurrences(
+            db, area_id, inicio, fim
+        )
+    }
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.config.config import get_settings
+from app.utils.schemas.base_schemas import DataHora
+
+
+class RecurrenceRuleCreate(BaseModel):
+    area_id: int
+    usuario_id: int
+    frequencia: Literal['DAILY', 'WEEKLY', 'MONTHLY']
+    intervalo: int = Field(1, ge=1)
+    dias_semana: list[int] | None = None
+    inicio: DataHora
+    # As ocorrências não passam de um dia, o que permite indexá-las por dia
+    duracao_minutos: int = Field(gt=0, le=24 * 60)
+    ate: DataHora | None = None
+    # Uma ocorrência por dia no máximo: a série com COUNT não passa do número
+    # de dias do horizonte usado entre séries sem fim
+    contagem: int | None = Field(
+        None, ge=1, le=get_settings().RECORRENCIA_HORIZONTE_DIAS
+    )
+    excecoes: list[date] = []
+    justificacao: str
+    reserva_tipo: str
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode='after')
+    def valida_regra(self) -> 'RecurrenceRuleCreate':
+        if self.dias_semana is not None:
+            if self.frequencia != 'WEEKLY':
+                raise ValueError('dias_semana só se aplica a WEEKLY')
+            if not self.dias_semana or any(
+                dia not in range(7) for dia in self.dias_semana
+            ):
+                raise ValueError('dias_semana deve conter valores de 0 a 6')
+            self.dias_semana = sorted(set(self.dias_semana))
+        if self.ate is not None and self.ate < self.inicio:
+            raise ValueError('ate deve ser posterior ao inicio')
+        return self
+
+
+class RecurrenceRulePublic(RecurrenceRuleCreate):
+    id: int
+
+
+class Ocorrencia(BaseModel):
+    regra_id: int
+    inicio: datetime
+    fim: datetime
+
+
+class OcorrenciaList(BaseModel):
+    ocorrencias: list[Ocorrencia]
@@ -0,0 +1,186 @@
+from calendar import monthrange
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import MAXYEAR, date, datetime, timedelta
+from itertools import count
+
+DAILY = 'DAILY'
+WEEKLY = 'WEEKLY'
+MONTHLY = 'MONTHLY'
+
+
+@dataclass(frozen=True, slots=True)
+class Regra:
+    """
+    Cópia imutável de uma regra de recorrência, usada na expansão das
+    ocorrências (no estilo RRULE: FREQ, INTERVAL, BYDAY, UNTIL, COUNT e
+    EXDATE por dia).
+    """
+
+    id: int
+    area_id: int
+    frequencia: str
+    intervalo: int
+    dias_semana: tuple[int, ...]
+    inicio: datetime
+    duracao: timedelta
+    ate: datetime | None = None
+    contagem: int | None = None
+    excecoes: frozenset[date] = frozenset()
+
+    @classmethod
+    def from_model(cls, rule) -> 'Regra':
+        return cls(
+            id=rule.id,
+            area_id=rule.area_id,
+            frequencia=rule.frequencia,
+            intervalo=rule.intervalo,
+            dias_semana=tuple(sorted(rule.dias_semana or ())),
+            inicio=rule.inicio,
+            duracao=timedelta(minutes=rule.duracao_minutos),
+            ate=rule.ate,
+            contagem=rule.contagem,
+            excecoes=frozenset(
+                date.fromisoformat(dia) if isinstance(dia, str) else dia
+                for dia in rule.excecoes or ()
+            ),
+        )
+
+
+def ocorrencias(
+    regra: Regra, inicio: datetime, fim: datetime
+) -> Iterator[tuple[datetime, datetime]]:
+    """
+    Gera, em ordem, as ocorrências da regra que cruzam `[inicio, fim)`.
+
+    A expansão é preguiçosa: sem COUNT, ela começa direto no período que
+    contém `inicio` (sem percorrer a série desde o começo) e para no
+    primeiro início depois de `fim`. Com COUNT a contagem precisa partir da
+    primeira ocorrência, mas a série é finita.
+
+    Args:
+        regra (Regra): A regra de recorrência.
+        inicio (datetime): Início da janela.
+        fim (datetime): Fim (exclusivo) da janela.
+
+    Returns:
+        Iterator[tuple[datetime, datetime]]: Pares (início, fim) das ocorrências.
+    """
+    if regra.contagem is None:
+        primeiro = _primeiro_periodo(regra, inicio - regra.duracao)
+    else:
+        primeiro = 0
+    geradas = 0
+    for ocorrencia in _inicios(regra, primeiro):
+        if regra.ate is not None and ocorrencia > regra.ate:
+            return
+        if regra.contagem is not None:
+            geradas += 1
+            if geradas > regra.contagem:
+                return
+        if ocorrencia >= fim:
+            return
+        termino = ocorrencia + regra.duracao
+        # EXDATE é aplicado depois do COUNT, como na RFC 5545
+        if termino > inicio and ocorrencia.date() not in regra.excecoes:
+            yield ocorrencia, termino
+
+
+def fim_da_serie(regra: Regra) -> datetime | None:
+    """
+    Retorna o fim da última ocorrência, ou None se a série for ilimitada.
+
+    Raises:
+        OverflowError: Se a série passar do maior horário representável.
+    """
+    if regra.contagem is not None:
+        ultima = _ultimo_inicio(regra)
+        if regra.ate is not None:
+            ultima = min(ultima, regra.ate)
+        return ultima + regra.duracao
+    if regra.ate is not None:
+        return regra.ate + regra.duracao
+    return None
+
+
+def _ultimo_inicio(regra: Regra) -> datetime:
+    # Início da ocorrência de número COUNT (antes de EXDATE), calculado
+    # direto pelo período em que ela cai, sem percorrer a série; se esse
+    # período é posterior ao UNTIL, a série termina no UNTIL.
+    seguintes = regra.contagem - 1
+    posicao = 0
+    if regra.frequencia == WEEKLY:
+        dias = regra.dias_semana or (regra.inicio.weekday(),)
+        primeira_semana = [d for d in dias if d >= regra.inicio.weekday()]
+        if seguintes < len(primeira_semana):
+            periodo = 0
+            posicao = dias.index(primeira_semana[seguintes])
+        else:
+            semanas, posicao = divmod(
+                seguintes - len(primeira_semana), len(dias)
+            )
+            periodo = semanas + 1
+    elif regra.frequencia == DAILY or regra.inicio.day <= 28:
+        periodo = seguintes
+    else:
+        return _ultimo_inicio_mensal(regra)
+    if regra.ate is not None and periodo > (
+        _primeiro_periodo(regra, regra.ate) + 2
+    ):
+        return regra.ate
+    return _periodo(regra, periodo)[posicao]
+
+
+def _ultimo_inicio_mensal(regra: Regra) -> datetime:
+    # Dias 29 a 31 não existem em todo mês: percorre os meses, parando no
+    # primeiro depois do UNTIL
+    for numero, ultima in enumerate(_inicios(regra, 0), 1):
+        if numero == regra.contagem or (
+            regra.ate is not None and ultima > regra.ate
+        ):
+            return ultima
+
+
+def _inicios(regra: Regra, primeiro: int) -> Iterator[datetime]:
+    # Inícios candidatos a partir do período `primeiro`, sem aplicar
+    # UNTIL/COUNT/EXDATE; nunca anteriores ao início da regra.
+    for periodo in count(primeiro):
+        for ocorrencia in _periodo(regra, periodo):
+            if ocorrencia >= regra.inicio:
+                yield ocorrencia
+
+
+def _periodo(regra: Regra, periodo: int) -> list[datetime]:
+    passo = periodo * regra.intervalo
+    if regra.frequencia == DAILY:
+        return [regra.inicio + timedelta(days=passo)]
+    if regra.frequencia == WEEKLY:
+        segunda = regra.inicio - timedelta(days=regra.inicio.weekday())
+        semana = segunda + timedelta(weeks=passo)
+        dias = regra.dias_semana or (regra.inicio.weekday(),)
+        return [semana + timedelta(days=dia) for dia in dias]
+    # MONTHLY: meses sem o dia (ex.: 31) são pulados, como na RFC 5545
+    ano, mes = divmod(regra.inicio.month - 1 + passo, 12)
+    ano += regra.inicio.year
+    if ano > MAXYEAR:
+        raise OverflowError('date value out of range')
+    if regra.inicio.day > monthrange(ano, mes + 1)[1]:
+        return []
+    return [regra.inicio.replace(year=ano, month=mes + 1)]
+
+
+def _primeiro_periodo(regra: Regra, desde: datetime) -> int:
+    # Índice de um período que começa antes de `desde` (com um período de
+    # folga), para pular direto para perto da janela consultada.
+    if desde <= regra.inicio:
+        return 0
+    if regra.frequencia == DAILY:
+        periodos = (desde - regra.inicio).days // regra.intervalo
+    elif regra.frequencia == WEEKLY:
+        periodos = (desde - regra.inicio).days // (7 * regra.intervalo)
+    else:
+        meses = (desde.year - regra.inicio.year) * 12 + (
+            desde.month - regra.inicio.month
+        )
+        periodos = meses // regra.intervalo
+    return max(periodos - 1, 0)
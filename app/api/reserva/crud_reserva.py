@@ -1,20 +1,46 @@
+from collections.abc import Iterator, Sequence
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, time, timedelta
+from threading import Lock
 from typing import Annotated
 
 from fastapi import Depends, HTTPException
+from sqlalchemy import Row, Select, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.area.crud_area import get_area_by_id
+from app.api.area.area_model import Area
+from app.api.area.crud_area import get_cached_area
+from app.api.preco.crud_preco import preco_reserva
+from app.api.preco.pricing_cache import pricing_cache
+from app.api.recorrencia.occurrence_cache import occurrence_cache
+from app.api.reserva.interval_index import IntervalosArea, reservation_index
+from app.api.reserva.occupancy import occupancy_bitmap
+from app.api.reserva.reserva_export import EXPORT_COLUMNS
 from app.api.reserva.reserva_model import Reservation
 from app.api.reserva.reserva_schema import ReservationCreate
 from app.api.usuario.crud_usuario import get_user_by_id
+from app.api.usuario.usuario_model import Usuario
+from app.config.config import get_settings
 from app.database.get_db import get_db
 from app.utils.Exceptions.exceptions import (
     ObjectConflitException,
     ObjectNotFoundException,
 )
+from app.utils.pagination import paginate
 
 Session = Annotated[Session, Depends(get_db)]
 
+# SQLSTATE de violação de exclusion constraint no PostgreSQL
+EXCLUSION_VIOLATION = '23P01'
+
+# Locks por área, neste processo; entre processos, ver `area_lock`
+area_locks: dict[int, Lock] = {}
+area_locks_guard = Lock()
+# Primeira chave dos advisory locks de área no PostgreSQL (a segunda é o ID
+# da área), para não colidir com outros usos de advisory locks no banco
+AREA_ADVISORY_LOCK = 0x41524541
+
 
 def get_reservation_by_id(reservation_id: int, db: Session):
     """
@@ -37,6 +63,33 @@ def get_reservation_by_id(reservation_id: int, db: Session):
     return reservas
 
 
+def get_reservation_version(reservation_id: int, db: Session) -> Row:
+    """
+    Obtém só o dono e a última alteração de uma reserva, o suficiente para
+    responder a uma leitura condicional sem carregar a linha inteira.
+
+    Args:
+        reservation_id (int): O ID da reserva.
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        Row: `usuario_id` e `updated_at` da reserva.
+
+    Raises:
+        ObjectNotFoundException: Se a reserva não for encontrada.
+    """
+    versao = db.execute(
+        select(Reservation.usuario_id, Reservation.updated_at).where(
+            Reservation.id == reservation_id
+        )
+    ).first()
+    if versao is None:
+        raise ObjectNotFoundException(
+            'Reservation not found for', reservation_id
+        )
+    return versao
+
+
 def get_reservations_by_user_id(user_id: int, db: Session):
     """
     Obtém todas as reservas associadas a um usuário pelo seu ID.
@@ -59,7 +112,7 @@ def get_reservations_by_user_id(user_id: int, db: Session):
 
 
 def get_reservas(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session, skip: int = 0, limit: int = 100, after: int | None = None
 ) -> list[Reservation]:
     """
     Retorna uma lista de reservas a partir do banco de dados.
@@ -68,11 +121,59 @@ def get_reservas(
     db (Session): Sessão do banco de dados.
     skip (int): Quantidade de reservas a serem ignorados.
     limit (int): Quantidade máxima de reservas a serem retornados.
+    after (int, optional): Último ID da página anterior (paginação por cursor).
 
     Retorna:
     list[reservas]: Lista de areas.
     """
-    return db.query(Reservation).offset(skip).limit(limit).all()
+    return paginate(
+        db.query(Reservation), Reservation.id, skip, limit, after
+    ).all()
+
+
+def stream_reservations(
+    db: Session,
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+    batch_size: int = 1000,
+) -> Iterator[list[Row]]:
+    """
+    Lê as reservas de um período em lotes, com cursor no servidor.
+
+    As linhas são tuplas com as colunas de `EXPORT_COLUMNS` (sem passar pelo
+    ORM, então o identity map da sessão não cresce durante a leitura) e são
+    entregues uma partição de `batch_size` por vez, mantendo a memória
+    constante independente do total exportado.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        data_inicio (date, optional): Primeiro dia (inclusive) de `reserva_data`.
+        data_fim (date, optional): Último dia (inclusive) de `reserva_data`.
+        batch_size (int): Quantidade de linhas buscadas por vez.
+
+    Returns:
+        Iterator[list[Row]]: Os lotes de linhas, ordenados pelo ID.
+    """
+    colunas = Reservation.__table__.c
+    stmt = select(*(colunas[nome] for nome in EXPORT_COLUMNS)).order_by(
+        colunas.id
+    )
+    if data_inicio is not None:
+        stmt = stmt.where(
+            colunas.reserva_data >= datetime.combine(data_inicio, time.min)
+        )
+    if data_fim is not None:
+        stmt = stmt.where(
+            colunas.reserva_data
+            < datetime.combine(data_fim + timedelta(days=1), time.min)
+        )
+    # yield_per liga o stream_results (cursor no servidor) e faz o
+    # partitions() entregar lotes desse tamanho.
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
 
 
 def create_reservation(db: Session, reservation: ReservationCreate):
@@ -95,58 +196,443 @@ def create_reservation(db: Session, reservation: ReservationCreate):
 
     # Verifica se a área existe
     try:
-        get_area_by_id(reservation.area_id, db)
+        get_cached_area(reservation.area_id, db)
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
 
-    # Verificar se há conflito de horários
-    try:
-        check_reservation_conflict(db, reservation)
-    except ObjectConflitException as ex:
-        raise HTTPException(status_code=400, detail=ex.args[0]) from ex
-
     db_reservation = Reservation(**reservation.model_dump())
-    valor = define_preco_por_hora(reservation)
+    valor = preco_reserva(db, reservation)
     # TODO: STATUS SEMPRE FICA EM ANALISE POIS NO FUTURO ELE SERÁ ENVIADO PARA O PAGAMENTO SEI LA
     status = 'Em análise'
     db_reservation.valor = valor
     db_reservation.status = status
 
-    db.add(db_reservation)
-    db.commit()
-    db.refresh(db_reservation)
+    try:
+        with area_lock(db, reservation.area_id):
+            if uses_exclusion_constraint(db):
+                # A exclusion constraint rejeita a sobreposição no próprio
+                # INSERT, então a consulta prévia de conflito é dispensada; as
+                # regras recorrentes não estão na tabela e são verificadas
+                # aqui, sob o mesmo lock usado na criação das regras.
+                check_recurrence_conflict(db, reservation)
+            else:
+                check_reservation_conflict(db, reservation)
+            db.add(db_reservation)
+            commit_reservation(db, reservation)
+            # Ainda sob o lock: outra requisição da mesma área só checa
+            # conflitos depois que o índice e o bitmap já conhecem esta reserva
+            if get_settings().RESERVA_INTERVAL_INDEX:
+                reservation_index.adicionar(db_reservation)
+            occupancy_bitmap.adicionar(
+                db_reservation.area_id,
+                db_reservation.hora_inicio,
+                db_reservation.hora_fim,
+            )
+    except ObjectConflitException as ex:
+        raise HTTPException(status_code=400, detail=ex.args[0]) from ex
 
     return db_reservation
 
 
-def check_reservation_conflict(db: Session, reservation: ReservationCreate):
+def create_reservations_bulk(
+    db: Session,
+    reservations: list[ReservationCreate],
+    indices: Sequence[int] | None = None,
+) -> list[dict]:
     """
-    Verifica se há conflito de horários entre as reservas.
+    Cria várias reservas de uma vez, informando o resultado de cada uma.
+
+    Usuários e áreas são validados com uma consulta cada; os conflitos são
+    verificados numa única passada, contra as reservas já gravadas (lidas com
+    uma consulta), contra as ocorrências das regras recorrentes da área e
+    contra as reservas anteriores do próprio lote; as
+    reservas aceitas são inseridas com um único executemany e um commit.
 
     Args:
         db (Session): Sessão do banco de dados.
-        reservation (ReservationCreate): Os dados da reserva a ser criada.
+        reservations (list[ReservationCreate]): As reservas a serem criadas.
+        indices (Sequence[int], optional): A posição de cada reserva no lote enviado, usada em `indice`, `conflito_indice` e `detail` (padrão: a posição na lista).
+
+    Returns:
+        list[dict]: Um resultado por reserva, na mesma ordem da entrada, com
+        `indice`, `status` ('criada', 'nao_encontrado' ou 'conflito') e `id`
+        ou `detail`, `conflito_id`, `conflito_regra_id` e `conflito_indice`.
 
     Raises:
-        ObjectConflitException: Exceção lançada se houver um conflito de reserva.
+        ObjectConflitException: Se outra transação gravar uma reserva
+            conflitante entre a checagem e o commit (somente PostgreSQL).
+    """
+    if indices is None:
+        indices = range(len(reservations))
+    resultados: list[dict | None] = [None] * len(reservations)
+    usuarios = _existing_ids(
+        db, Usuario.id, {r.usuario_id for r in reservations}
+    )
+    areas = _existing_ids(db, Area.id, {r.area_id for r in reservations})
+
+    candidatas = []
+    for posicao, reservation in enumerate(reservations):
+        if reservation.usuario_id not in usuarios:
+            ex = ObjectNotFoundException('User', reservation.usuario_id)
+        elif reservation.area_id not in areas:
+            ex = ObjectNotFoundException('Area', reservation.area_id)
+        else:
+            candidatas.append((posicao, reservation))
+            continue
+        resultados[posicao] = {
+            'indice': indices[posicao],
+            'status': 'nao_encontrado',
+            'detail': ex.args[0],
+        }
+
+    if candidatas:
+        # Locks sempre na mesma ordem para não haver deadlock entre lotes. No
+        # PostgreSQL eles ainda protegem a checagem das regras recorrentes,
+        # que a exclusion constraint não cobre.
+        with ExitStack() as stack:
+            for area_id in sorted({r.area_id for _, r in candidatas}):
+                stack.enter_context(area_lock(db, area_id))
+            _insert_batch(db, candidatas, indices, resultados)
+    return resultados
+
+
+def _existing_ids(db: Session, id_column, ids: set[int]) -> set[int]:
+    return set(db.scalars(select(id_column).where(id_column.in_(ids))))
+
+
+def _stored_intervals(
+    db: Session, reservations: list[ReservationCreate]
+) -> dict[tuple[int, datetime], IntervalosArea]:
+    # Uma consulta para todas as (área, data) do lote, limitada à janela de
+    # horários coberta por ele; o filtro exato é feito pelos intervalos.
+    chaves = {(r.area_id, r.reserva_data) for r in reservations}
+    stmt = (
+        select(
+            Reservation.id,
+            Reservation.area_id,
+            Reservation.reserva_data,
+            Reservation.hora_inicio,
+            Reservation.hora_fim,
+        )
+        .where(
+            Reservation.area_id.in_({area_id for area_id, _ in chaves}),
+            Reservation.reserva_data.in_({data for _, data in chaves}),
+            Reservation.hora_inicio < max(r.hora_fim for r in reservations),
+            Reservation.hora_fim > min(r.hora_inicio for r in reservations),
+        )
+        .order_by(Reservation.hora_inicio)
+    )
+    intervalos: dict[tuple[int, datetime], IntervalosArea] = {}
+    for reserva_id, area_id, reserva_data, inicio, fim in db.execute(stmt):
+        chave = (area_id, reserva_data)
+        if chave in chaves:
+            intervalos.setdefault(chave, IntervalosArea()).adicionar(
+                inicio, fim, reserva_id
+            )
+    return intervalos
+
+
+def _insert_batch(
+    db: Session,
+    candidatas: list[tuple[int, ReservationCreate]],
+    indices: Sequence[int],
+    resultados: list[dict | None],
+):
+    gravadas = _stored_intervals(db, [r for _, r in candidatas])
+    lote: dict[tuple[int, datetime], IntervalosArea] = {}
+    aceitas = []
+    for posicao, reservation in candidatas:
+        chave = (reservation.area_id, reservation.reserva_data)
+        inicio, fim = reservation.hora_inicio, reservation.hora_fim
+        conflito_id = conflito_indice = conflito_regra_id = None
+        if chave in gravadas:
+            conflito_id = gravadas[chave].buscar_conflito(inicio, fim)
+        if conflito_id is None:
+            conflito_regra_id = occurrence_cache.buscar_conflito(
+                db, reservation.area_id, inicio, fim
+            )
+        if conflito_id is None and conflito_regra_id is None and chave in lote:
+            conflito_indice = lote[chave].buscar_conflito(inicio, fim)
+        if conflito_id is not None:
+            detail = ObjectConflitException('Reserva', conflito_id).args[0]
+        elif conflito_regra_id is not None:
+            detail = ObjectConflitException(
+                'Regra de recorrência', conflito_regra_id
+            ).args[0]
+        elif conflito_indice is not None:
+            detail = ObjectConflitException(
+                'Reserva do lote', f'#{conflito_indice}'
+            ).args[0]
+        else:
+            lote.setdefault(chave, IntervalosArea()).adicionar(
+                inicio, fim, indices[posicao]
+            )
+            aceitas.append((posicao, reservation))
+            continue
+        resultados[posicao] = {
+            'indice': indices[posicao],
+            'status': 'conflito',
+            'detail': detail,
+            'conflito_id': conflito_id,
+            'conflito_indice': conflito_indice,
+            'conflito_regra_id': conflito_regra_id,
+        }
+
+    if not aceitas:
+        return
+    tabelas = pricing_cache.tabelas(db, {r.area_id for _, r in aceitas})
+    linhas = [
+        {
+            **reservation.model_dump(),
+            'valor': tabelas[reservation.area_id].calcular(
+                reservation.hora_inicio, reservation.hora_fim
+            ),
+            # TODO: STATUS SEMPRE FICA EM ANALISE (ver create_reservation)
+            'status': 'Em análise',
+        }
+        for _, reservation in aceitas
+    ]
+    ids = db.scalars(
+        insert(Reservation).returning(
+            Reservation.id, sort_by_parameter_order=True
+        ),
+        linhas,
+    ).all()
+    try:
+        db.commit()
+    except IntegrityError as ex:
+        db.rollback()
+        if not is_exclusion_violation(ex):
+            raise
+        raise ObjectConflitException('Reserva', 'lote') from ex
+
+    for (posicao, _), reserva_id, linha in zip(aceitas, ids, linhas):
+        resultados[posicao] = {
+            'indice': indices[posicao],
+            'status': 'criada',
+            'id': reserva_id,
+        }
+        if get_settings().RESERVA_INTERVAL_INDEX:
+            reservation_index.adicionar(Reservation(id=reserva_id, **linha))
+        occupancy_bitmap.adicionar(
+            linha['area_id'], linha['hora_inicio'], linha['hora_fim']
+        )
+
+
+def uses_exclusion_constraint(db: Session) -> bool:
     """
-    inicio = reservation.hora_inicio
-    fim = reservation.hora_fim
+    Indica se o banco garante sozinho que reservas não se sobrepõem.
+
+    No PostgreSQL a tabela `reservations` tem a exclusion constraint
+    `reservations_sem_sobreposicao` (GiST sobre area_id, reserva_data e o
+    intervalo da reserva); nos demais bancos a checagem é feita pela aplicação.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        bool: True se o banco for PostgreSQL.
+    """
+    return db.get_bind().dialect.name == 'postgresql'
+
+
+def is_exclusion_violation(ex: IntegrityError) -> bool:
+    """
+    Indica se o erro de integridade veio da exclusion constraint de reservas.
+    """
+    return getattr(ex.orig, 'pgcode', None) == EXCLUSION_VIOLATION
+
+
+def get_area_lock(area_id: int) -> Lock:
+    """
+    Retorna o lock que serializa checagem de conflito e gravação de uma área.
+
+    Args:
+        area_id (int): O ID da área.
+
+    Returns:
+        Lock: O lock da área.
+    """
+    with area_locks_guard:
+        return area_locks.setdefault(area_id, Lock())
+
+
+def uses_advisory_lock(db: Session) -> bool:
+    """
+    Indica se a trava de área também é tomada no banco (PostgreSQL).
+    """
+    return db.get_bind().dialect.name == 'postgresql'
+
+
+@contextmanager
+def area_lock(db: Session, area_id: int) -> Iterator[None]:
+    """
+    Serializa checagem de conflito e gravação de uma área.
+
+    Neste processo usa o lock de `get_area_lock`. No PostgreSQL também toma
+    `pg_advisory_xact_lock` na transação da sessão, que vale entre workers e
+    é liberado no commit ou rollback; com a trava, as regras recorrentes da
+    área são relidas do banco, para que a checagem veja as gravadas por
+    outro worker antes de a invalidação dele chegar. O SQLite não tem trava
+    entre processos: o servidor só aceita um worker com ele (`app.server`).
 
-    reservas_conflito = (
-        db.query(Reservation)
-        .filter(
+    Args:
+        db (Session): Sessão do banco de dados.
+        area_id (int): O ID da área.
+    """
+    with get_area_lock(area_id):
+        if uses_advisory_lock(db):
+            db.execute(
+                select(func.pg_advisory_xact_lock(AREA_ADVISORY_LOCK, area_id))
+            )
+            occurrence_cache.recarregar_area(db, area_id)
+        yield
+
+
+def commit_reservation(
+    db: Session,
+    reservation: ReservationCreate,
+    reservation_id: int | None = None,
+):
+    """
+    Efetiva a gravação de uma reserva, convertendo a violação da exclusion
+    constraint em um conflito de reserva.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        reservation (ReservationCreate): Os dados da reserva gravada.
+        reservation_id (int, optional): O ID da reserva, quando for uma atualização.
+
+    Raises:
+        ObjectConflitException: Se o horário já estiver ocupado por outra reserva.
+    """
+    try:
+        db.commit()
+    except IntegrityError as ex:
+        db.rollback()
+        if not is_exclusion_violation(ex):
+            raise
+        conflito_id = get_conflicting_reservation_id(
+            db, reservation, ignore_id=reservation_id
+        )
+        raise ObjectConflitException('Reserva', conflito_id) from ex
+
+
+def get_conflicting_reservation_id(
+    db: Session,
+    reservation: ReservationCreate,
+    ignore_id: int | None = None,
+) -> int | None:
+    """
+    Procura uma reserva que conflite com o horário informado.
+
+    Quando `RESERVA_INTERVAL_INDEX` está habilitado, a busca é feita no índice
+    de intervalos em memória (aquecido a partir do banco na primeira chamada);
+    caso contrário é feita uma consulta que para na primeira linha encontrada,
+    apoiada pelo índice (area_id, hora_inicio, hora_fim).
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        reservation (ReservationCreate): Os dados da reserva a ser verificada.
+        ignore_id (int, optional): ID de uma reserva a desconsiderar (a própria reserva numa atualização).
+
+    Returns:
+        int | None: O ID da primeira reserva em conflito, ou None se o horário estiver livre.
+    """
+    if get_settings().RESERVA_INTERVAL_INDEX and ignore_id is None:
+        reservation_index.aquecer(db)
+        return reservation_index.buscar_conflito(
+            reservation.area_id,
+            reservation.reserva_data,
+            reservation.hora_inicio,
+            reservation.hora_fim,
+        )
+
+    return db.scalar(conflicting_reservation_stmt(reservation, ignore_id))
+
+
+def conflicting_reservation_stmt(
+    reservation: ReservationCreate, ignore_id: int | None = None
+) -> Select:
+    """
+    Monta a consulta pelo ID da primeira reserva em conflito com o horário.
+
+    Args:
+        reservation (ReservationCreate): Os dados da reserva a ser verificada.
+        ignore_id (int, optional): ID de uma reserva a desconsiderar.
+
+    Returns:
+        Select: A consulta, limitada a uma linha.
+    """
+    stmt = (
+        select(Reservation.id)
+        .where(
             Reservation.area_id == reservation.area_id,
             Reservation.reserva_data == reservation.reserva_data,
-            Reservation.hora_inicio < fim,
-            Reservation.hora_fim > inicio,
+            Reservation.hora_inicio < reservation.hora_fim,
+            Reservation.hora_fim > reservation.hora_inicio,
         )
-        .all()
+        .limit(1)
     )
+    if ignore_id is not None:
+        stmt = stmt.where(Reservation.id != ignore_id)
+    return stmt
 
-    if reservas_conflito:
-        # TODO: COMO PEGO O ID DA RESERVA QUE ESTÁ EM CONFLITO?
-        raise ObjectConflitException('Reserva', Reservation.id)
+
+def check_reservation_conflict(
+    db: Session,
+    reservation: ReservationCreate,
+    ignore_id: int | None = None,
+):
+    """
+    Verifica se há conflito de horários entre as reservas.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        reservation (ReservationCreate): Os dados da reserva a ser criada.
+        ignore_id (int, optional): ID de uma reserva a desconsiderar (a própria reserva numa atualização).
+
+    Raises:
+        ObjectConflitException: Exceção lançada se houver um conflito com
+            outra reserva ou com uma regra recorrente.
+    """
+    # Pré-filtro: se os slots de 15 minutos estão livres no mapa de ocupação
+    # nenhuma reserva cruza o horário e a consulta exata é dispensada.
+    if not get_settings().RESERVA_OCUPACAO_BITMAP or (
+        occupancy_bitmap.pode_conflitar(
+            db,
+            reservation.area_id,
+            reservation.hora_inicio,
+            reservation.hora_fim,
+        )
+    ):
+        conflito_id = get_conflicting_reservation_id(
+            db, reservation, ignore_id
+        )
+        if conflito_id is not None:
+            raise ObjectConflitException('Reserva', conflito_id)
+    check_recurrence_conflict(db, reservation)
+
+
+def check_recurrence_conflict(db: Session, reservation: ReservationCreate):
+    """
+    Verifica se o horário cruza alguma ocorrência de regra recorrente da área.
+
+    As ocorrências vêm do cache por área, expandidas apenas para os dias do
+    horário verificado.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        reservation (ReservationCreate): Os dados da reserva a ser verificada.
+
+    Raises:
+        ObjectConflitException: Se houver uma ocorrência no horário.
+    """
+    regra_id = occurrence_cache.buscar_conflito(
+        db, reservation.area_id, reservation.hora_inicio, reservation.hora_fim
+    )
+    if regra_id is not None:
+        raise ObjectConflitException('Regra de recorrência', regra_id)
 
 
 def update_reservation(
@@ -163,7 +649,8 @@ def update_reservation(
         db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
 
     Raises:
-        HTTPException: Retorna um erro 404 se a reserva não for encontrada.
+        ObjectNotFoundException: Se a reserva não for encontrada.
+        ObjectConflitException: Se o novo horário conflitar com outra reserva.
 
     Returns:
         Reservation: A reserva atualizada.
@@ -173,12 +660,58 @@ def update_reservation(
     except ObjectNotFoundException:
         raise
     else:
-        for dado, valor in reservation.model_dump().items():
-            setattr(db_reservation, dado, valor)
-        db_reservation.valor = define_preco_por_hora(reservation)
-        db.commit()
-        db.refresh(db_reservation)
-        return db_reservation
+        while True:
+            # Trava a área atual e a nova, em ordem, como no cadastro em lote
+            area_ids = sorted({db_reservation.area_id, reservation.area_id})
+            with ExitStack() as stack:
+                for area_id in area_ids:
+                    stack.enter_context(area_lock(db, area_id))
+                # Relê a reserva com as travas: outra atualização pode tê-la
+                # mudado (até de área) depois da primeira leitura
+                db.expire(db_reservation)
+                db_reservation = get_reservation_by_id(reservation_id, db)
+                if db_reservation.area_id not in area_ids:
+                    # Libera as travas do banco antes de tentar de novo
+                    db.rollback()
+                    continue
+                anterior = (
+                    db_reservation.area_id,
+                    db_reservation.hora_inicio,
+                    db_reservation.hora_fim,
+                )
+                if uses_exclusion_constraint(db):
+                    check_recurrence_conflict(db, reservation)
+                else:
+                    check_reservation_conflict(db, reservation, reservation_id)
+                apply_reservation_update(
+                    db_reservation, reservation, preco_reserva(db, reservation)
+                )
+                commit_reservation(db, reservation, reservation_id)
+                if get_settings().RESERVA_INTERVAL_INDEX:
+                    reservation_index.adicionar(db_reservation)
+                occupancy_bitmap.remover(*anterior)
+                occupancy_bitmap.adicionar(
+                    db_reservation.area_id,
+                    db_reservation.hora_inicio,
+                    db_reservation.hora_fim,
+                )
+            return db_reservation
+
+
+def apply_reservation_update(
+    db_reservation: Reservation, reservation: ReservationCreate, valor: int
+):
+    """
+    Copia os novos dados e o novo valor para a reserva.
+
+    Args:
+        db_reservation (Reservation): A reserva persistida.
+        reservation (ReservationCreate): Os novos detalhes da reserva.
+        valor (int): O valor recalculado (ver `crud_preco.preco_reserva`).
+    """
+    for dado, novo in reservation.model_dump().items():
+        setattr(db_reservation, dado, novo)
+    db_reservation.valor = valor
 
 
 def delete_reservation(reservation_id: int, db: Session):
@@ -193,26 +726,10 @@ def delete_reservation(reservation_id: int, db: Session):
         HTTPException: Retorna um erro HTTP 404 se a área não for encontrada.
     """
     db_reserva = get_reservation_by_id(reservation_id, db)
-    db.delete(db_reserva)
-    db.commit()
-
-
-# TODO: transformar em uma função generica e flexivel para receber parametros de preço de determinada area quando o usuario criar a area ele defina o parâmetros dinâmicos, como taxas variáveis de custo por hora ou por dia seila
-def define_preco_por_hora(reservation: ReservationCreate):
-    """
-    Calcula o preço da reserva com base nas horas de início e fim.
-
-    Args:
-        reservation (ReservationCreate): Os detalhes da reserva.
-
-    Returns:
-        int: O preço da reserva.
-    """
-    horas = (
-        reservation.hora_fim - reservation.hora_inicio
-    ).total_seconds() / 3600
-
-    if horas <= 0:
-        return 10
-    else:
-        return int(horas) * 10
+    horario = (db_reserva.area_id, db_reserva.hora_inicio, db_reserva.hora_fim)
+    with area_lock(db, db_reserva.area_id):
+        db.delete(db_reserva)
+        db.commit()
+        if get_settings().RESERVA_INTERVAL_INDEX:
+            reservation_index.remover(reservation_id)
+        occupancy_bitmap.remover(*horario)
@@ -0,0 +1,200 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from threading import RLock
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.reserva.reserva_model import Reservation
+
+
+class IntervalosArea:
+    """
+    Intervalos de reservas de uma área ordenados pela hora de início.
+
+    Além das listas ordenadas, mantém o maior `hora_fim` de cada prefixo
+    (e a posição onde ele ocorre), o que permite responder se algum intervalo
+    cruza `[inicio, fim)` com uma única busca binária, mesmo que existam
+    reservas sobrepostas gravadas no banco.
+    """
+
+    __slots__ = ('inicios', 'fins', 'ids', 'max_fim', 'pos_max_fim')
+
+    def __init__(self):
+        self.inicios: list[datetime] = []
+        self.fins: list[datetime] = []
+        self.ids: list[int] = []
+        self.max_fim: list[datetime] = []
+        self.pos_max_fim: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def adicionar(self, inicio: datetime, fim: datetime, reserva_id: int):
+        """
+        Insere um intervalo mantendo a ordenação pela hora de início.
+        """
+        pos = bisect_right(self.inicios, inicio)
+        self.inicios.insert(pos, inicio)
+        self.fins.insert(pos, fim)
+        self.ids.insert(pos, reserva_id)
+        self._recalcular_prefixos(pos)
+
+    def remover(self, inicio: datetime, reserva_id: int) -> bool:
+        """
+        Remove o intervalo da reserva informada.
+
+        Returns:
+            bool: True se o intervalo foi encontrado e removido.
+        """
+        pos = bisect_left(self.inicios, inicio)
+        while pos < len(self.ids) and self.inicios[pos] == inicio:
+            if self.ids[pos] == reserva_id:
+                del self.inicios[pos]
+                del self.fins[pos]
+                del self.ids[pos]
+                self._recalcular_prefixos(pos)
+                return True
+            pos += 1
+        return False
+
+    def buscar_conflito(self, inicio: datetime, fim: datetime) -> int | None:
+        """
+        Retorna o ID de uma reserva que cruza `[inicio, fim)`, se houver.
+
+        Todos os intervalos antes de `bisect_left(inicios, fim)` começam antes
+        de `fim`; basta então saber se o maior `hora_fim` desse prefixo
+        termina depois de `inicio`.
+        """
+        pos = bisect_left(self.inicios, fim)
+        if pos == 0:
+            return None
+        if self.max_fim[pos - 1] > inicio:
+            return self.ids[self.pos_max_fim[pos - 1]]
+        return None
+
+    def _recalcular_prefixos(self, desde: int):
+        del self.max_fim[desde:]
+        del self.pos_max_fim[desde:]
+        for pos in range(desde, len(self.fins)):
+            if pos and self.max_fim[pos - 1] >= self.fins[pos]:
+                self.max_fim.append(self.max_fim[pos - 1])
+                self.pos_max_fim.append(self.pos_max_fim[pos - 1])
+            else:
+                self.max_fim.append(self.fins[pos])
+                self.pos_max_fim.append(pos)
+
+
+class ReservationIntervalIndex:
+    """
+    Índice em memória (por processo) das reservas, agrupado por área.
+
+    Os intervalos são separados por `(area_id, reserva_data)`, que é a mesma
+    regra de conflito usada pela consulta em `crud_reserva`. O índice é
+    aquecido a partir da tabela `reservations` na primeira consulta e deve ser
+    mantido coerente pelas operações de criação, atualização e remoção.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._areas: dict[tuple[int, datetime], IntervalosArea] = {}
+        self._reservas: dict[int, tuple[tuple[int, datetime], datetime]] = {}
+        self.carregado = False
+
+    def aquecer(self, db: Session):
+        """
+        Carrega todas as reservas do banco, caso o índice ainda esteja vazio.
+
+        Args:
+            db (Session): Sessão do banco de dados.
+        """
+        if self.carregado:
+            return
+        with self._lock:
+            if self.carregado:
+                return
+            stmt = select(
+                Reservation.id,
+                Reservation.area_id,
+                Reservation.reserva_data,
+                Reservation.hora_inicio,
+                Reservation.hora_fim,
+            ).order_by(Reservation.hora_inicio)
+            for reserva_id, area_id, reserva_data, inicio, fim in db.execute(
+                stmt
+            ):
+                self._adicionar(reserva_id, area_id, reserva_data, inicio, fim)
+            self.carregado = True
+
+    def adicionar(self, reserva: Reservation):
+        """
+        Registra (ou substitui) uma reserva no índice.
+
+        Antes do aquecimento não faz nada: a reserva já está no banco e será
+        carregada por `aquecer` (registrá-la agora a duplicaria).
+        """
+        with self._lock:
+            if not self.carregado:
+                return
+            self._remover(reserva.id)
+            self._adicionar(
+                reserva.id,
+                reserva.area_id,
+                reserva.reserva_data,
+                reserva.hora_inicio,
+                reserva.hora_fim,
+            )
+
+    def remover(self, reserva_id: int):
+        """
+        Remove uma reserva do índice, se ela estiver presente.
+        """
+        with self._lock:
+            if not self.carregado:
+                return
+            self._remover(reserva_id)
+
+    def buscar_conflito(
+        self,
+        area_id: int,
+        reserva_data: datetime,
+        inicio: datetime,
+        fim: datetime,
+    ) -> int | None:
+        """
+        Retorna o ID de uma reserva conflitante com o intervalo, se houver.
+        """
+        with self._lock:
+            intervalos = self._areas.get((area_id, reserva_data))
+            if intervalos is None:
+                return None
+            return intervalos.buscar_conflito(inicio, fim)
+
+    def limpar(self):
+        """
+        Esvazia o índice; a próxima consulta vai aquecê-lo novamente.
+        """
+        with self._lock:
+            self._areas.clear()
+            self._reservas.clear()
+            self.carregado = False
+
+    def _adicionar(self, reserva_id, area_id, reserva_data, inicio, fim):
+        chave = (area_id, reserva_data)
+        self._areas.setdefault(chave, IntervalosArea()).adicionar(
+            inicio, fim, reserva_id
+        )
+        self._reservas[reserva_id] = (chave, inicio)
+
+    def _remover(self, reserva_id):
+        localizacao = self._reservas.pop(reserva_id, None)
+        if localizacao is None:
+            return
+        chave, inicio = localizacao
+        intervalos = self._areas[chave]
+        intervalos.remover(inicio, reserva_id)
+        if not intervalos:
+            del self._areas[chave]
+
+
+reservation_index = ReservationIntervalIndex()
@@ -0,0 +1,191 @@
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.reserva.reserva_model import Reservation
+from app.config.config import get_settings
+from app.utils.slots import DIA, SLOT, SLOTS_POR_DIA
+
+
+def slots(inicio: datetime, fim: datetime) -> Iterator[tuple[date, int, int]]:
+    """
+    Divide `[inicio, fim)` por dia, em faixas de slots de 15 minutos.
+
+    Um slot parcialmente coberto conta como ocupado, então um bit zerado
+    garante que não há reserva naquele slot.
+
+    Returns:
+        Iterator[tuple[date, int, int]]: (dia, primeiro slot, slot final exclusivo).
+    """
+    dia = inicio.date()
+    while True:
+        comeco = datetime.combine(dia, time.min)
+        primeiro = max(inicio - comeco, timedelta(0)) // SLOT
+        ultimo = -(-(min(fim, comeco + DIA) - comeco) // SLOT)
+        if ultimo > primeiro:
+            yield dia, primeiro, ultimo
+        if fim <= comeco + DIA:
+            return
+        dia += DIA
+
+
+def mascara(primeiro: int, ultimo: int) -> int:
+    """
+    Retorna o inteiro com os bits dos slots `[primeiro, ultimo)` ligados.
+    """
+    return ((1 << (ultimo - primeiro)) - 1) << primeiro
+
+
+def mascara_intervalo(dia: date, inicio: datetime, fim: datetime) -> int:
+    """
+    Retorna os bits dos slots do dia cruzados por `[inicio, fim)`.
+    """
+    for slot_dia, primeiro, ultimo in slots(inicio, fim):
+        if slot_dia == dia:
+            return mascara(primeiro, ultimo)
+    return 0
+
+
+class OcupacaoDia:
+    """
+    Ocupação de uma área em um dia: 96 slots de 15 minutos.
+
+    `mapa` tem um bit por slot (bit 0 = 00:00 às 00:15); `contagens` guarda
+    quantas reservas tocam cada slot, o que permite remover uma reserva sem
+    reconstruir o mapa.
+    """
+
+    __slots__ = ('contagens', 'mapa')
+
+    def __init__(self):
+        self.contagens = [0] * SLOTS_POR_DIA
+        self.mapa = 0
+
+    def alterar(self, primeiro: int, ultimo: int, delta: int):
+        for slot in range(primeiro, ultimo):
+            self.contagens[slot] += delta
+            if self.contagens[slot] > 0:
+                self.mapa |= 1 << slot
+            else:
+                self.mapa &= ~(1 << slot)
+
+
+class OccupancyBitmap:
+    """
+    Mapa de ocupação (por processo) de cada (área, dia), em slots de 15
+    minutos.
+
+    Os dias são carregados do banco na primeira consulta (vários de uma vez,
+    numa única leitura) e mantidos com TTL, que limita a defasagem em relação
+    a gravações feitas por outros processos. As gravações deste processo
+    atualizam os dias já carregados de forma incremental; assim como no cache
+    de ocorrências, `geracao` impede que uma leitura concorrente recoloque no
+    cache um dia carregado antes da gravação.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._lock = Lock()
+        self._dias: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.geracao = 0
+
+    def mapas(
+        self, db: Session, area_ids: Iterable[int], dia: date
+    ) -> dict[int, int]:
+        """
+        Retorna o mapa de ocupação de cada área no dia.
+
+        Args:
+            db (Session): Sessão do banco de dados.
+            area_ids (Iterable[int]): Os IDs das áreas.
+            dia (date): O dia.
+
+        Returns:
+            dict[int, int]: O mapa (um bit por slot) de cada área.
+        """
+        resultado = {}
+        with self._lock:
+            for area_id in area_ids:
+                ocupacao = self._dias.get((area_id, dia))
+                resultado[area_id] = (
+                    ocupacao.mapa if ocupacao is not None else None
+                )
+            geracao = self.geracao
+        faltando = [a for a, mapa in resultado.items() if mapa is None]
+        if not faltando:
+            return resultado
+
+        comeco = datetime.combine(dia, time.min)
+        carregados = {area_id: OcupacaoDia() for area_id in faltando}
+        stmt = select(
+            Reservation.area_id, Reservation.hora_inicio, Reservation.hora_fim
+        ).where(
+            Reservation.area_id.in_(faltando),
+            Reservation.hora_inicio < comeco + DIA,
+            Reservation.hora_fim > comeco,
+        )
+        for area_id, inicio, fim in db.execute(stmt):
+            for slot_dia, primeiro, ultimo in slots(inicio, fim):
+                if slot_dia == dia:
+                    carregados[area_id].alterar(primeiro, ultimo, 1)
+        with self._lock:
+            if geracao == self.geracao:
+                for area_id, ocupacao in carregados.items():
+                    self._dias[(area_id, dia)] = ocupacao
+        resultado.update(
+            (area_id, ocupacao.mapa)
+            for area_id, ocupacao in carregados.items()
+        )
+        return resultado
+
+    def pode_conflitar(
+        self, db: Session, area_id: int, inicio: datetime, fim: datetime
+    ) -> bool:
+        """
+        Indica se algum slot de `[inicio, fim)` está ocupado na área.
+
+        False garante que nenhuma reserva cruza o intervalo; True só diz que
+        a consulta exata ainda é necessária.
+        """
+        return any(
+            self.mapas(db, (area_id,), dia)[area_id] & mascara(p, u)
+            for dia, p, u in slots(inicio, fim)
+        )
+
+    def adicionar(self, area_id: int, inicio: datetime, fim: datetime):
+        """
+        Registra uma reserva gravada nos dias já carregados.
+        """
+        self._alterar(area_id, inicio, fim, 1)
+
+    def remover(self, area_id: int, inicio: datetime, fim: datetime):
+        """
+        Retira uma reserva removida (ou o horário antigo de uma reserva
+        alterada) dos dias já carregados.
+        """
+        self._alterar(area_id, inicio, fim, -1)
+
+    def limpar(self):
+        """
+        Esvazia o cache.
+        """
+        with self._lock:
+            self.geracao += 1
+            self._dias.clear()
+
+    def _alterar(self, area_id, inicio, fim, delta):
+        with self._lock:
+            self.geracao += 1
+            for dia, primeiro, ultimo in slots(inicio, fim):
+                ocupacao = self._dias.get((area_id, dia))
+                if ocupacao is not None:
+                    ocupacao.alterar(primeiro, ultimo, delta)
+
+
+occupancy_bitmap = OccupancyBitmap(
+    maxsize=get_settings().OCUPACAO_CACHE_SIZE,
+    ttl=get_settings().OCUPACAO_CACHE_TTL,
+)
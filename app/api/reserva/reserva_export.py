@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+
+from sqlalchemy import Row
+
+# Colunas exportadas, na ordem do cabeçalho do CSV
+EXPORT_COLUMNS = (
+    'id',
+    'valor',
+    'reserva_data',
+    'hora_inicio',
+    'hora_fim',
+    'justificacao',
+    'reserva_tipo',
+    'status',
+    'area_id',
+    'usuario_id',
+)
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def _valor(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+
+def ndjson_chunks(partitions: Iterable[list[Row]]) -> Iterator[bytes]:
+    """
+    Serializa as reservas como NDJSON (um objeto JSON por linha), gerando um
+    bloco de bytes por lote lido do banco.
+    """
+    for rows in partitions:
+        yield ''.join(
+            json.dumps(
+                {
+                    coluna: _valor(valor)
+                    for coluna, valor in zip(EXPORT_COLUMNS, row)
+                },
+                ensure_ascii=False,
+            )
+            + '\n'
+            for row in rows
+        ).encode('utf-8')
+
+
+def csv_chunks(partitions: Iterable[list[Row]]) -> Iterator[bytes]:
+    """
+    Serializa as reservas como CSV. O cabeçalho é enviado antes da primeira
+    leitura, e depois um bloco de bytes por lote lido do banco.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def esvaziar() -> bytes:
+        dados = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return dados
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield esvaziar()
+    for rows in partitions:
+        writer.writerows([_valor(valor) for valor in row] for row in rows)
+        yield esvaziar()
+
+
+SERIALIZERS = {'ndjson': ndjson_chunks, 'csv': csv_chunks}
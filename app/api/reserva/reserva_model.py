@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -13,6 +13,23 @@ if TYPE_CHECKING:
 
 class Reservation(Base):
     __tablename__ = 'reservations'
+    # No PostgreSQL a tabela ainda tem a coluna gerada `periodo` e a exclusion
+    # constraint `reservations_sem_sobreposicao`, criadas por migração e não
+    # mapeadas aqui para manter o modelo compatível com o SQLite.
+    __table_args__ = (
+        Index(
+            'ix_reservations_area_id_hora_inicio_hora_fim',
+            'area_id',
+            'hora_inicio',
+            'hora_fim',
+        ),
+        Index(
+            'ix_reservations_area_id_reserva_data',
+            'area_id',
+            'reserva_data',
+        ),
+        Index('ix_reservations_reserva_data', 'reserva_data'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     valor: Mapped[int] = mapped_column(Integer)
@@ -24,9 +41,15 @@ class Reservation(Base):
     justificacao: Mapped[str] = mapped_column(String)
     reserva_tipo: Mapped[str] = mapped_column(String)
     status: Mapped[str] = mapped_column(String)
+    # Última alteração da linha (UTC), base do ETag/Last-Modified da leitura
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     area_id: Mapped[int] = mapped_column(Integer, ForeignKey('areas.id'))
-    usuario_id: Mapped[int] = mapped_column(Integer, ForeignKey('usuario.id'))
+    usuario_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('usuario.id'), index=True
+    )
 
     usuario: Mapped['Usuario'] = relationship(
         'Usuario', back_populates='reservations'
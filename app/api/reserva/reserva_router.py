@@ -1,31 +1,90 @@
-from typing import Annotated
+from datetime import date
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+import app.api.preco.crud_preco as crud_preco
 import app.api.reserva.crud_reserva as crud_reserva
-from app.api.auth.crud_auth import get_current_user, verify_permission
+from app.api.auth.crud_auth import verify_permission
+from app.api.auth.principal import CurrentPrincipal
+from app.api.preco.preco_schema import CotacaoItem, CotacaoResult
+from app.api.reserva.reserva_export import MEDIA_TYPES, SERIALIZERS
 from app.api.reserva.reserva_model import Reservation
-from app.api.reserva.reserva_schema import ReservationCreate, ReservationList
-from app.api.usuario.usuario_model import Usuario
+from app.api.reserva.reserva_schema import (
+    ReservationBulkResult,
+    ReservationCreate,
+    ReservationList,
+)
 from app.config.config import get_settings
 from app.database.get_db import get_db
+from app.utils.conditional import (
+    is_conditional,
+    make_etag,
+    not_modified,
+    validators,
+)
 from app.utils.Exceptions.exceptions import (
+    ObjectConflitException,
     ObjectNotFoundException,
     PermissionException,
     sem_permissao_exception,
 )
+from app.utils.pagination import Pagination, set_next_cursor
+from app.utils.responses import PydanticResponse
 
 router_reserva = APIRouter()
 
 Session = Annotated[Session, Depends(get_db)]
-Current_User = Annotated[Usuario, Depends(get_current_user)]
+
+
+def _verifica_dono(current_user, usuario_id: int):
+    try:
+        if current_user.id != usuario_id and not verify_permission(
+            current_user.permissions, get_settings().ADMINISTRADOR
+        ):
+            raise PermissionException('user')
+    except PermissionException as ex:
+        raise HTTPException(status_code=403, detail=ex.args[0]) from ex
+
+
+def _reserva_nao_modificada(
+    request: Request, reservation_id: int, db: Session, current_user=None
+) -> Response | None:
+    """
+    Responde 304 a uma leitura condicional de reserva consultando só o dono
+    e o `updated_at` da linha. Com `current_user`, a reserva precisa ser
+    desse usuário, ou o usuário ser administrador, como na leitura completa.
+    """
+    if not is_conditional(request):
+        return None
+    try:
+        versao = crud_reserva.get_reservation_version(reservation_id, db)
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    if current_user is not None:
+        _verifica_dono(current_user, versao.usuario_id)
+    return not_modified(
+        request,
+        make_etag(reservation_id, versao.updated_at),
+        versao.updated_at,
+    )
+
+
+def _set_validators(response: Response, db_reservation: Reservation):
+    response.headers.update(
+        validators(
+            make_etag(db_reservation.id, db_reservation.updated_at),
+            db_reservation.updated_at,
+        )
+    )
 
 
 @router_reserva.post('/reservas')
 def create_reserva(
     reserva: ReservationCreate,
-    Current_User: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
 ):
     """
@@ -34,16 +93,14 @@ def create_reserva(
     Args:
         reserva (ReservationCreate): Os detalhes da reserva a ser criada.
         db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
-        current_user (Type, optional): O usuário autenticado. Obtido via Depends(get_current_user).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
 
     Returns:
         Reservation: A reserva criada.
     """
     try:
-        if Current_User[
-            'user'
-        ].id != reserva.usuario_id and not verify_permission(
-            Current_User['permissions'], get_settings().ADMINISTRADOR
+        if current_user.id != reserva.usuario_id and not verify_permission(
+            current_user.permissions, get_settings().ADMINISTRADOR
         ):
             raise PermissionException('Create Reserva')
     except PermissionException as ex:
@@ -51,32 +108,187 @@ def create_reserva(
     return crud_reserva.create_reservation(db=db, reservation=reserva)
 
 
+@router_reserva.post('/reservas/bulk', response_model=ReservationBulkResult)
+def create_reservas_bulk(
+    reservas: list[ReservationCreate],
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Cria várias reservas numa única requisição (ex.: reservas recorrentes).
+
+    Cada reserva é avaliada individualmente: as válidas são criadas e as
+    demais são informadas no resultado com o motivo (usuário ou área
+    inexistente, conflito de horário com uma reserva gravada ou com outra do
+    próprio lote, ou falta de permissão).
+
+    Args:
+        reservas (list[ReservationCreate]): As reservas a serem criadas.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        ReservationBulkResult: A quantidade criada e o resultado de cada reserva, na ordem enviada.
+
+    Raises:
+        HTTPException(413): Se o lote tiver mais de `RESERVA_BULK_LIMIT` reservas.
+        HTTPException(400): Se outra transação ocupar um dos horários durante a gravação.
+    """
+    limite = get_settings().RESERVA_BULK_LIMIT
+    if len(reservas) > limite:
+        raise HTTPException(
+            status_code=413, detail=f'Máximo de {limite} reservas por lote'
+        )
+
+    admin = verify_permission(
+        current_user.permissions, get_settings().ADMINISTRADOR
+    )
+    resultados = [None] * len(reservas)
+    permitidas = []
+    for indice, reserva in enumerate(reservas):
+        if admin or reserva.usuario_id == current_user.id:
+            permitidas.append(indice)
+        else:
+            resultados[indice] = {
+                'indice': indice,
+                'status': 'sem_permissao',
+                'detail': PermissionException('Create Reserva').args[0],
+            }
+
+    try:
+        criadas = crud_reserva.create_reservations_bulk(
+            db, [reservas[indice] for indice in permitidas], permitidas
+        )
+    except ObjectConflitException as ex:
+        raise HTTPException(status_code=400, detail=ex.args[0]) from ex
+    for indice, resultado in zip(permitidas, criadas):
+        resultados[indice] = resultado
+
+    return {
+        'criadas': sum(r['status'] == 'criada' for r in resultados),
+        'resultados': resultados,
+    }
+
+
+@router_reserva.post('/reservas/cotacao', response_model=CotacaoResult)
+def cotar_reservas(
+    itens: list[CotacaoItem],
+    current_user: CurrentPrincipal,
+    db: Session,
+):
+    """
+    Calcula o valor de vários horários candidatos numa única requisição
+    (ex.: os horários de um calendário), sem criar reservas.
+
+    Args:
+        itens (list[CotacaoItem]): Os horários (area_id, hora_inicio, hora_fim).
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        CotacaoResult: O valor de cada horário, na ordem enviada.
+
+    Raises:
+        HTTPException(413): Se o lote tiver mais de `COTACAO_LIMITE` horários.
+        HTTPException(404): Se alguma das áreas não existir.
+    """
+    limite = get_settings().COTACAO_LIMITE
+    if len(itens) > limite:
+        raise HTTPException(
+            status_code=413, detail=f'Máximo de {limite} horários por cotação'
+        )
+    try:
+        return {'valores': crud_preco.quote_reservations(db, itens)}
+    except ObjectNotFoundException as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+
+
 @router_reserva.get('/reservas', response_model=ReservationList)
-def read_reservas(db: Session, skip: int = 0, limit: int = 100):
+def read_reservas(
+    db: Session,
+    page: Annotated[Pagination, Depends()],
+):
     """
     Retorna uma lista de reservas com paginação.
 
+    O cursor da próxima página, quando houver, vem no header `X-Next-Cursor`.
+    As reservas são validadas uma única vez e serializadas direto em JSON
+    (`PydanticResponse`).
+
     Parâmetros:
     db (Session): Sessão do banco de dados.
-    skip (int): Quantidade de registros a serem ignorados.
-    limit (int): Quantidade máxima de registros a serem retornados.
+    page (Pagination): `skip`/`limit` ou `cursor`/`limit` (paginação por cursor).
 
     Retorna:
-    dict: Dicionário contendo a lista de reservas.
+    PydanticResponse: O JSON com a lista de reservas.
+    """
+    reservas: list[Reservation] = crud_reserva.get_reservas(
+        db, page.skip, page.limit, page.after
+    )
+    response = PydanticResponse(
+        ReservationList.model_validate(
+            {'Reservation': reservas}, from_attributes=True
+        )
+    )
+    set_next_cursor(response, reservas, page.limit)
+    return response
+
+
+@router_reserva.get('/reservas/export')
+def export_reservas(
+    current_user: CurrentPrincipal,
+    db: Session,
+    formato: Literal['ndjson', 'csv'] = 'ndjson',
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+):
+    """
+    Exporta as reservas de um período em NDJSON ou CSV (somente administradores).
+
+    As linhas são lidas do banco em lotes de `EXPORT_BATCH_SIZE` e escritas na
+    resposta conforme chegam, então a memória usada não depende do total
+    exportado e os primeiros bytes saem antes do fim da consulta.
+
+    Args:
+        formato (str): 'ndjson' (padrão) ou 'csv'.
+        data_inicio (date, optional): Primeiro dia (inclusive) de `reserva_data`.
+        data_fim (date, optional): Último dia (inclusive) de `reserva_data`.
+        db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
+        current_user (Principal): O usuário autenticado. Obtido via Depends(get_current_principal).
+
+    Returns:
+        StreamingResponse: O arquivo exportado.
     """
-    reservas: list[Reservation] = crud_reserva.get_reservas(db, skip, limit)
-    return {'Reservation': reservas}
+    if not verify_permission(
+        current_user.permissions, get_settings().ADMINISTRADOR
+    ):
+        raise sem_permissao_exception()
+    partitions = crud_reserva.stream_reservations(
+        db, data_inicio, data_fim, get_settings().EXPORT_BATCH_SIZE
+    )
+    return StreamingResponse(
+        SERIALIZERS[formato](partitions),
+        media_type=MEDIA_TYPES[formato],
+        headers={
+            'Content-Disposition': f'attachment; filename="reservas.{formato}"'
+        },
+    )
 
 
 @router_reserva.get('/reservas/{reservation_id}')
 def get_reserva(
     reservation_id: int,
-    current_user: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
+    request: Request,
+    response: Response,
 ):
     """
     Obter os detalhes de uma reserva pelo ID.
 
+    A resposta traz `ETag` e `Last-Modified`; com `If-None-Match` ou
+    `If-Modified-Since` ainda atuais, responde 304 sem carregar a reserva.
+
     Args:
         reservation_id (int): O ID da reserva.
         db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
@@ -84,17 +296,22 @@ def get_reserva(
     Returns:
         Reservation: Os detalhes da reserva.
     """
+    resposta = _reserva_nao_modificada(request, reservation_id, db)
+    if resposta is not None:
+        return resposta
     try:
-        return crud_reserva.get_reservation_by_id(reservation_id, db)
+        db_reservation = crud_reserva.get_reservation_by_id(reservation_id, db)
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    _set_validators(response, db_reservation)
+    return db_reservation
 
 
 @router_reserva.put('/reservas/{reservation_id}')
 def update_reserva(
     reservation_id: int,
     reserva: ReservationCreate,
-    current_user: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
 ):
     """
@@ -108,8 +325,8 @@ def update_reserva(
     Returns:
         Reservation: Os detalhes atualizados da reserva.
     """
-    if reserva.usuario_id != current_user['user'].id and not verify_permission(
-        current_user['permissions'], get_settings().ADMINISTRADOR
+    if reserva.usuario_id != current_user.id and not verify_permission(
+        current_user.permissions, get_settings().ADMINISTRADOR
     ):
         raise sem_permissao_exception()
     try:
@@ -118,6 +335,8 @@ def update_reserva(
         )
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
+    except ObjectConflitException as ex:
+        raise HTTPException(status_code=400, detail=ex.args[0]) from ex
     return updated_reserva
 
 
@@ -125,7 +344,7 @@ def update_reserva(
 def delete_reserva(
     reservation_id: int,
     db: Session,
-    current_user: Current_User,
+    current_user: CurrentPrincipal,
 ):
     """
     Deleta uma reserva.
@@ -143,10 +362,11 @@ def delete_reserva(
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
 
     try:
-        if current_user[
-            'user'
-        ].id != db_reservation.usuario_id and not verify_permission(
-            current_user['permissions'], get_settings().ADMINISTRADOR
+        if (
+            current_user.id != db_reservation.usuario_id
+            and not verify_permission(
+                current_user.permissions, get_settings().ADMINISTRADOR
+            )
         ):
             raise PermissionException('user')
     except PermissionException as ex:
@@ -158,14 +378,14 @@ def delete_reserva(
 
 @router_reserva.get('/usuario/reservas')
 def get_reservas_usuario(
-    current_user: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
 ):
     """
     Obtém as reservas associadas ao usuário atualmente autenticado.
 
     Args:
-        current_user (Type, optional): O usuário atualmente autenticado. Obtido via Depends(crud_user.get_current_user).
+        current_user (Principal): O usuário atualmente autenticado. Obtido via Depends(get_current_principal).
         db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
 
     Returns:
@@ -173,7 +393,7 @@ def get_reservas_usuario(
     """
     try:
         reservations = crud_reserva.get_reservations_by_user_id(
-            current_user['user'].id, db
+            current_user.id, db
         )
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
@@ -183,15 +403,19 @@ def get_reservas_usuario(
 @router_reserva.get('/usuario/reservas/{reservation_id}')
 def get_reserva_usuario(
     reservation_id: int,
-    current_user: Current_User,
+    current_user: CurrentPrincipal,
     db: Session,
+    request: Request,
+    response: Response,
 ):
     """
     Obtém uma reserva específica pelo ID associada ao usuário atualmente autenticado.
 
+    Aceita leituras condicionais como `GET /reservas/{reservation_id}`.
+
     Args:
         reservation_id (str): O ID da reserva a ser obtida.
-        current_user (Type, optional): O usuário atualmente autenticado. Obtido via Depends(crud_user.get_current_user).
+        current_user (Principal): O usuário atualmente autenticado. Obtido via Depends(get_current_principal).
         db (Session, optional): Uma sessão do banco de dados. obtida via Depends(get_db).
 
     Returns:
@@ -200,17 +424,15 @@ def get_reserva_usuario(
     Raises:
         HTTPException(404): Se a reserva não for encontrada ou não estiver associada ao usuário atual.
     """
+    resposta = _reserva_nao_modificada(
+        request, reservation_id, db, current_user
+    )
+    if resposta is not None:
+        return resposta
     try:
         db_reservation = crud_reserva.get_reservation_by_id(reservation_id, db)
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
-    try:
-        if current_user[
-            'user'
-        ].id != db_reservation.usuario_id and not verify_permission(
-            current_user['permissions'], get_settings().ADMINISTRADOR
-        ):
-            raise PermissionException('user')
-    except PermissionException as ex:
-        raise HTTPException(status_code=403, detail=ex.args[0]) from ex
+    _verifica_dono(current_user, db_reservation.usuario_id)
+    _set_validators(response, db_reservation)
     return db_reservation
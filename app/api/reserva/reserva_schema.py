@@ -1,12 +1,14 @@
-from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from app.utils.schemas.base_schemas import DataHora, valida_horario
 
 
 class ReservationCreate(BaseModel):
-    reserva_data: datetime
-    hora_inicio: datetime
-    hora_fim: datetime
+    reserva_data: DataHora
+    hora_inicio: DataHora
+    hora_fim: DataHora
     justificacao: str
     reserva_tipo: str
     status: str
@@ -14,11 +16,36 @@ class ReservationCreate(BaseModel):
     usuario_id: int
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode='after')
+    def valida_horario(self) -> 'ReservationCreate':
+        valida_horario(self.hora_inicio, self.hora_fim)
+        return self
+
 
 class ReservationBase(ReservationCreate):
     id: int
     valor: int
 
+    @model_validator(mode='after')
+    def valida_horario(self) -> 'ReservationBase':
+        # Reservas já gravadas são listadas mesmo fora dos limites atuais
+        return self
+
 
 class ReservationList(BaseModel):
     Reservation: list[ReservationBase]
+
+
+class ReservationBulkItem(BaseModel):
+    indice: int
+    status: Literal['criada', 'nao_encontrado', 'conflito', 'sem_permissao']
+    id: int | None = None
+    detail: str | None = None
+    conflito_id: int | None = None
+    conflito_regra_id: int | None = None
+    conflito_indice: int | None = None
+
+
+class ReservationBulkResult(BaseModel):
+    criadas: int
+    resultados: list[ReservationBulkItem]
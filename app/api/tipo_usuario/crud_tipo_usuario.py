@@ -1,13 +1,25 @@
+from functools import partial
+
 from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
+from app.api.auth.identity_cache import identity_cache
 from app.api.tipo_usuario.tipo_usuario_model import TipoUser
 from app.api.tipo_usuario.tipo_usuario_schemas import TipoUserCreate
 from app.api.usuario.usuario_model import Usuario
+from app.database.catalog_version import (
+    bump_catalog_version,
+    get_catalog_version,
+)
+from app.database.unit_of_work import commit_or_defer, update_by_id
 from app.utils.Exceptions.exceptions import (
     ObjectAlreadyExistException,
     ObjectNotFoundException,
 )
+from app.utils.pagination import paginate
+
+# Nome do catálogo de tipos de usuário em `catalog_versions`
+TIPOS_USUARIO = 'tipos_usuario'
 
 
 def get_tipo_usuario_by_name(db: Session, tipo: str):
@@ -21,9 +33,15 @@ def get_tipo_usuario_by_name(db: Session, tipo: str):
     Returns:
         TipoUser: O objeto do tipo de usuário.
     """
+    # O nome exato usa o índice em lower(tipo); a busca por trecho fica
+    # como alternativa (no PostgreSQL, apoiada pelo índice de trigramas).
     tipouser = (
         db.query(TipoUser)
-        .filter(func.lower(TipoUser.tipo).ilike(func.lower(f'%{tipo}%')))
+        .filter(func.lower(TipoUser.tipo) == tipo.lower())
+        .first()
+    ) or (
+        db.query(TipoUser)
+        .filter(func.lower(TipoUser.tipo).ilike(f'%{tipo.lower()}%'))
         .first()
     )
     if not tipouser:
@@ -48,8 +66,8 @@ def create_tipo_usuario(db: Session, tipo_usuario: TipoUserCreate):
     except ObjectNotFoundException:
         db_tipo_usuario = TipoUser(**tipo_usuario.model_dump())
         db.add(db_tipo_usuario)
-        db.commit()
-        db.refresh(db_tipo_usuario)
+        bump_catalog_version(db, TIPOS_USUARIO)
+        commit_or_defer(db)
         return db_tipo_usuario
 
 
@@ -72,7 +90,7 @@ def get_tipo_usuario(db: Session, tipo_usuario_id: int):
 
 
 def get_tipo_usuarios(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session, skip: int = 0, limit: int = 100, after: int | None = None
 ) -> list[TipoUser]:
     """
     Retorna uma lista de tipos de usuario a partir do banco de dados.
@@ -81,11 +99,26 @@ def get_tipo_usuarios(
     db (Session): Sessão do banco de dados.
     skip (int): Quantidade de usuários a serem ignorados.
     limit (int): Quantidade máxima de usuários a serem retornados.
+    after (int, optional): Último ID da página anterior (paginação por cursor).
 
     Retorna:
     list[TipoUser]: Lista de tipos de usuario.
     """
-    return db.query(TipoUser).offset(skip).limit(limit).all()
+    return paginate(db.query(TipoUser), TipoUser.id, skip, limit, after).all()
+
+
+def get_tipo_usuarios_version(db: Session) -> int:
+    """
+    Obtém a versão do catálogo de tipos de usuário, incrementada a cada
+    escrita; serve de ETag da listagem sem ler os tipos.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        int: A versão atual.
+    """
+    return get_catalog_version(db, TIPOS_USUARIO)
 
 
 def update_tipo_usuario(
@@ -101,12 +134,19 @@ def update_tipo_usuario(
 
     Returns:
         TipoUser: O objeto do tipo de usuário atualizado.
+
+    Raises:
+        ObjectNotFoundException: Se o tipo de usuário não for encontrado.
     """
-    db_tipo_usuario = get_tipo_usuario(db, tipo_usuario_id)
-    for key, value in tipo_usuario.model_dump().items():
-        setattr(db_tipo_usuario, key, value)
-    db.commit()
-    db.refresh(db_tipo_usuario)
+    db_tipo_usuario = update_by_id(
+        db, TipoUser, tipo_usuario_id, tipo_usuario.model_dump()
+    )
+    if not db_tipo_usuario:
+        raise ObjectNotFoundException('Tipo de usuario', tipo_usuario_id)
+    bump_catalog_version(db, TIPOS_USUARIO)
+    commit_or_defer(
+        db, partial(identity_cache.invalidate_tipo, tipo_usuario_id)
+    )
     return db_tipo_usuario
 
 
@@ -134,4 +174,7 @@ def reassign_users_and_delete_tipo_usuario(
     # Exclui o tipo de usuário anterior
     db_tipo_usuario = get_tipo_usuario(db, tipo_usuario_id)
     db.delete(db_tipo_usuario)
-    db.commit()
+    bump_catalog_version(db, TIPOS_USUARIO)
+    commit_or_defer(
+        db, partial(identity_cache.invalidate_tipo, tipo_usuario_id)
+    )
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String
+from sqlalchemy import Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -15,3 +15,8 @@ class TipoUser(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     tipo: Mapped[str] = mapped_column(String(200))
     usuarios: Mapped['Usuario'] = relationship(back_populates='tipo')
+
+
+# Apoia a busca pelo nome exato em get_tipo_usuario_by_name. No PostgreSQL a
+# migração cria também um índice de trigramas para a busca por trecho.
+Index('ix_tipouser_lower_tipo', func.lower(TipoUser.tipo))
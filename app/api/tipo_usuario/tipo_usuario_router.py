@@ -1,19 +1,21 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 import app.api.tipo_usuario.crud_tipo_usuario as crud_tipo_user
 from app.api.tipo_usuario.tipo_usuario_schemas import TipoList, TipoUserCreate
-from app.database.get_db import get_db
+from app.database.unit_of_work import UnitOfWorkRoute, get_uow
+from app.utils.conditional import make_etag, not_modified, validators
 from app.utils.Exceptions.exceptions import (
     ObjectAlreadyExistException,
     ObjectNotFoundException,
 )
+from app.utils.pagination import Pagination, set_next_cursor
 
-router_tipo_usuario = APIRouter()
+router_tipo_usuario = APIRouter(route_class=UnitOfWorkRoute)
 
-Session = Annotated[Session, Depends(get_db)]
+Session = Annotated[Session, Depends(get_uow)]
 
 
 @router_tipo_usuario.post('/tipos_usuario')
@@ -37,23 +39,38 @@ def create_tipo_usuario(tipo_usuario: TipoUserCreate, db: Session):
 @router_tipo_usuario.get('/tipos_usuario', response_model=TipoList)
 def read_tipo_users(
     db: Session,
+    request: Request,
+    response: Response,
+    page: Annotated[Pagination, Depends()],
     # current_user: Current_User,
-    skip: int = 0,
-    limit: int = 100,
 ):
     """
     Retorna uma lista de tipos de usuarios com paginação.
 
+    O cursor da próxima página, quando houver, vem no header `X-Next-Cursor`.
+    O ETag vem da versão do catálogo de tipos; com um `If-None-Match` ainda
+    atual, responde 304 sem consultar os tipos.
+
     Parâmetros:
     db (Session): Sessão do banco de dados.
     current_user (Usuario): Usuário autenticado.
-    skip (int): Quantidade de registros a serem ignorados.
-    limit (int): Quantidade máxima de registros a serem retornados.
+    page (Pagination): `skip`/`limit` ou `cursor`/`limit` (paginação por cursor).
 
     Retorna:
     dict: Dicionário contendo a lista de tipos.
     """
-    tipos: list[TipoList] = crud_tipo_user.get_tipo_usuarios(db, skip, limit)
+    etag = make_etag(
+        crud_tipo_user.TIPOS_USUARIO,
+        crud_tipo_user.get_tipo_usuarios_version(db),
+    )
+    resposta = not_modified(request, etag)
+    if resposta is not None:
+        return resposta
+    tipos: list[TipoList] = crud_tipo_user.get_tipo_usuarios(
+        db, page.skip, page.limit, page.after
+    )
+    set_next_cursor(response, tipos, page.limit)
+    response.headers.update(validators(etag))
     return {'tipos': tipos}
 
 
@@ -72,14 +89,12 @@ def update_tipo_usuario(
         TipoUser: O objeto do tipo de usuário atualizado.
     """
     try:
-        crud_tipo_user.get_tipo_usuario(db=db, tipo_usuario_id=tipo_usuario_id)
+        return crud_tipo_user.update_tipo_usuario(
+            db=db, tipo_usuario_id=tipo_usuario_id, tipo_usuario=tipo_usuario
+        )
     except ObjectNotFoundException as ex:
         raise HTTPException(status_code=404, detail=ex.args[0]) from ex
 
-    return crud_tipo_user.update_tipo_usuario(
-        db=db, tipo_usuario_id=tipo_usuario_id, tipo_usuario=tipo_usuario
-    )
-
 
 @router_tipo_usuario.delete('/tipos_usuario/{tipo_usuario_id}')
 def delete_tipo_usuario(tipo_usuario_id: int, db: Session):
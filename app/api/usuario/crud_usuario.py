@@ -1,14 +1,18 @@
+from functools import partial
 from typing import Annotated
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
 import app.config.auth as auth
+from app.api.auth.identity_cache import identity_cache
 from app.api.reserva.reserva_model import Reservation
 from app.api.usuario.usuario_model import Usuario
 from app.api.usuario.usuario_schemas import UsuarioCreate
 from app.database.get_db import get_db
+from app.database.unit_of_work import commit_or_defer, update_by_id
 from app.utils.Exceptions.exceptions import ObjectNotFoundException
+from app.utils.pagination import paginate
 
 Session = Annotated[Session, Depends(get_db)]
 
@@ -33,7 +37,9 @@ def get_user_by_id(user_id: int, db: Session):
     return user
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[Usuario]:
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[Usuario]:
     """
     Retorna uma lista de usuários a partir do banco de dados.
 
@@ -41,11 +47,12 @@ def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[Usuario]:
     db (Session): Sessão do banco de dados.
     skip (int): Quantidade de usuários a serem ignorados.
     limit (int): Quantidade máxima de usuários a serem retornados.
+    after (int, optional): Último ID da página anterior (paginação por cursor).
 
     Retorna:
     list[Usuario]: Lista de usuários.
     """
-    return db.query(Usuario).offset(skip).limit(limit).all()
+    return paginate(db.query(Usuario), Usuario.id, skip, limit, after).all()
 
 
 def get_users_count(db: Session):
@@ -72,15 +79,18 @@ def create_user(db: Session, user: UsuarioCreate):
         user_dict['tipo_id'] = 2
 
     db_user = Usuario(**user_dict)
-    db_user.senha = auth.get_password_hash(db_user.senha)
+    db_user.senha = auth.get_password_hash_pooled(db_user.senha)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    commit_or_defer(db)
     return db_user
 
 
 def get_user_reservas(
-    db: Session, user_id: int, skip: int = 0, limit: int = 100
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after: int | None = None,
 ) -> list[Reservation]:
     """
     Retorna uma lista de reservas de um usuário a partir do banco de dados.
@@ -90,17 +100,18 @@ def get_user_reservas(
     user_id (int): ID do usuário cujas reservas serão retornadas.
     skip (int): Quantidade de reservas a serem ignorados.
     limit (int): Quantidade máxima de reservas a serem retornados.
+    after (int, optional): Último ID da página anterior (paginação por cursor).
 
     Retorna:
     list[reservas]: Lista de reservas do usuário.
     """
-    reservas = (
-        db.query(Reservation)
-        .filter(Reservation.usuario_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    reservas = paginate(
+        db.query(Reservation).filter(Reservation.usuario_id == user_id),
+        Reservation.id,
+        skip,
+        limit,
+        after,
+    ).all()
     return reservas
 
 
@@ -113,8 +124,10 @@ def update_user_password(db: Session, user: Usuario, new_password: str):
         user (Usuario): O usuário cuja senha será atualizada.
         new_password (str): A nova senha do usuário.
     """
-    user.senha = auth.get_password_hash(new_password)
-    db.commit()
+    user.senha = auth.get_password_hash_pooled(new_password)
+    # Invalida os tokens emitidos com a senha anterior
+    user.token_version += 1
+    commit_or_defer(db, partial(identity_cache.invalidate_user, user.id))
 
 
 def delete_user(db: Session, user: Usuario):
@@ -126,7 +139,7 @@ def delete_user(db: Session, user: Usuario):
         user (Usuario): O usuário a ser deletado.
     """
     db.delete(user)
-    db.commit()
+    commit_or_defer(db, partial(identity_cache.invalidate_user, user.id))
 
 
 def delete_user_by_id(
@@ -146,7 +159,7 @@ def delete_user_by_id(
         raise
     else:
         db.delete(user)
-        db.commit()
+        commit_or_defer(db, partial(identity_cache.invalidate_user, user_id))
 
 
 def update_user(user_id: int, usuario: UsuarioCreate, db: Session):
@@ -159,16 +172,17 @@ def update_user(user_id: int, usuario: UsuarioCreate, db: Session):
         user_update (UsuarioCreate): Os novos detalhes do usuário.
 
     Returns:
-        Usuario: O usuário atualizado ou None se o usuário não for encontrado.
+        Usuario: O usuário atualizado.
+
+    Raises:
+        ObjectNotFoundException: Se o usuário não for encontrado.
     """
-    try:
-        user = get_user_by_id(user_id, db)
-    except ObjectNotFoundException:
-        raise
-    else:
-        for dado, valor in usuario.model_dump().items():
-            setattr(user, dado, valor)
-        user.senha = auth.get_password_hash(usuario.senha)
-        db.commit()
-        db.refresh(user)
-        return user
+    dados = usuario.model_dump()
+    dados['senha'] = auth.get_password_hash_pooled(usuario.senha)
+    # A senha é sempre substituída: invalida os tokens emitidos antes
+    dados['token_version'] = Usuario.token_version + 1
+    user = update_by_id(db, Usuario, user_id, dados)
+    if not user:
+        raise ObjectNotFoundException('User', user_id)
+    commit_or_defer(db, partial(identity_cache.invalidate_user, user_id))
+    return user
@@ -17,10 +17,15 @@ class Usuario(Base):
     email: Mapped[str] = mapped_column(String(50), unique=True)
     nome: Mapped[str] = mapped_column(String(100))
     senha: Mapped[str] = mapped_column(String(200))
+    # Incrementado a cada troca de senha; tokens com outra versão são recusados
+    token_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default='0'
+    )
     tipo_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey('tipouser.id'),
         nullable=False,
+        index=True,
     )
     tipo: Mapped['TipoUser'] = relationship(back_populates='usuarios')
     reservations: Mapped['Reservation'] = relationship(
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 import app.api.auth.crud_auth as crud_auth
@@ -14,9 +14,9 @@ from app.api.usuario.usuario_schemas import (
     UsuarioList,
     UsuarioPublic,
 )
-from app.config.auth import verify_password
+from app.config.auth import verify_password_pooled
 from app.config.config import get_settings
-from app.database.get_db import get_db
+from app.database.unit_of_work import UnitOfWorkRoute, get_uow
 from app.utils.Exceptions.exceptions import (
     EmailAlreadyRegistered,
     EmptyPasswordException,
@@ -25,10 +25,12 @@ from app.utils.Exceptions.exceptions import (
     PermissionException,
     sem_permissao_exception,
 )
+from app.utils.pagination import Pagination, set_next_cursor
+from app.utils.responses import PydanticResponse
 
-router_usuario = APIRouter()
+router_usuario = APIRouter(route_class=UnitOfWorkRoute)
 
-Session = Annotated[Session, Depends(get_db)]
+Session = Annotated[Session, Depends(get_uow)]
 Current_User = Annotated[Usuario, Depends(get_current_user)]
 
 
@@ -66,23 +68,27 @@ def create_usuario(usuario: UsuarioCreate, db: Session):
 @router_usuario.get('/usuarios', response_model=UsuarioList)
 def read_users(
     db: Session,
+    response: Response,
+    page: Annotated[Pagination, Depends()],
     # current_user: Current_User,
-    skip: int = 0,
-    limit: int = 100,
 ):
     """
     Retorna uma lista de usuários com paginação.
 
+    O cursor da próxima página, quando houver, vem no header `X-Next-Cursor`.
+
     Parâmetros:
     db (Session): Sessão do banco de dados.
     current_user (Usuario): Usuário autenticado.
-    skip (int): Quantidade de registros a serem ignorados.
-    limit (int): Quantidade máxima de registros a serem retornados.
+    page (Pagination): `skip`/`limit` ou `cursor`/`limit` (paginação por cursor).
 
     Retorna:
     dict: Dicionário contendo a lista de usuários.
     """
-    users: list[Usuario] = crud_usuario.get_users(db, skip, limit)
+    users: list[Usuario] = crud_usuario.get_users(
+        db, page.skip, page.limit, page.after
+    )
+    set_next_cursor(response, users, page.limit)
     return {'users': users}
 
 
@@ -198,20 +204,32 @@ def update_user_auth(
 def get_user_reservations(
     db: Session,
     current_user: Current_User,
+    page: Annotated[Pagination, Depends()],
 ):
     """
     Obtém as reservas do usuário atualmente autenticado.
 
+    O cursor da próxima página, quando houver, vem no header `X-Next-Cursor`.
+
     Args:
         db (Session, optional): Sessão do banco de dados. obtido via Depends(get_db).
         current_user (Type, optional): O usuário atual obtido a partir do token. obtido via Depends(crud_user.get_current_user).
+        page (Pagination): `skip`/`limit` ou `cursor`/`limit` (paginação por cursor).
 
     Returns:
-        List[reservas]: Lista de reservas associadas ao usuário.
+        PydanticResponse: O JSON com a lista de reservas do usuário.
     """
 
-    reservations = crud_usuario.get_user_reservas(db, current_user['user'].id)
-    return {'Reservation': reservations}
+    reservations = crud_usuario.get_user_reservas(
+        db, current_user['user'].id, page.skip, page.limit, page.after
+    )
+    response = PydanticResponse(
+        ReservationList.model_validate(
+            {'Reservation': reservations}, from_attributes=True
+        )
+    )
+    set_next_cursor(response, reservations, page.limit)
+    return response
 
 
 @router_usuario.put('/usuario/update_senha')
@@ -237,8 +255,9 @@ def update_senha(
         HTTPException(401): Se a senha antiga fornecida não corresponder à senha atual do usuário.
         HTTPException(400): Se a nova senha for vazia.
     """
-    user = Current_User['user']
-    if not verify_password(old_password, user.senha):
+    # O usuário autenticado é um snapshot sem o hash da senha
+    user = crud_usuario.get_user_by_id(Current_User['user'].id, db)
+    if not verify_password_pooled(old_password, user.senha):
         raise IncorrectOldPasswordException()
     if not new_password:
         raise EmptyPasswordException()
@@ -261,7 +280,7 @@ def delete(
     Returns:
         dict: Um dicionário indicando que o usuário foi deletado com sucesso.
     """
-    user = Current_User['user']
+    user = crud_usuario.get_user_by_id(Current_User['user'].id, db)
     crud_usuario.delete_user(db, user)
     return {'detail': 'Usuário deletado com sucesso'}
 
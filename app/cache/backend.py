@@ -0,0 +1,152 @@
+import math
+import time
+from collections.abc import Callable
+from threading import Lock
+from typing import Protocol
+from uuid import uuid4
+
+from cachetools import TLRUCache
+
+from app.config.config import get_settings
+
+# Recebe a mensagem publicada, ou None quando mensagens foram perdidas e o
+# assinante deve descartar tudo o que guardou.
+Assinante = Callable[[bytes | None], None]
+
+ORIGEM_BYTES = 16
+
+
+class CacheBackend(Protocol):
+    """
+    Armazenamento de chave/valor (bytes) com TTL e canais de invalidação,
+    compartilhado entre os workers conforme a implementação.
+
+    As mensagens publicadas chegam aos assinantes dos outros processos (nunca
+    ao próprio publicador) quando eles chamam `poll`; os caches chamam
+    `poll` antes de cada leitura, então a invalidação vale a partir da
+    próxima leitura em qualquer worker, sem thread de fundo.
+    """
+
+    # False quando os valores ficam só no processo (não vale a pena guardar
+    # neles o que o cache em memória já guarda)
+    compartilhado: bool
+
+    def get(self, chave: str) -> bytes | None:
+        ...
+
+    def set(self, chave: str, valor: bytes, ttl: float | None = None):
+        ...
+
+    def delete(self, *chaves: str):
+        ...
+
+    def publish(self, canal: str, mensagem: bytes):
+        ...
+
+    def subscribe(self, canal: str, callback: Assinante):
+        ...
+
+    def poll(self):
+        ...
+
+    def clear(self):
+        ...
+
+    def close(self):
+        ...
+
+
+def nova_origem() -> bytes:
+    """
+    Identificador da instância do backend, enviado junto das mensagens para
+    que o publicador ignore as próprias.
+    """
+    return uuid4().bytes
+
+
+class LocalBackend:
+    """
+    Backend em memória do próprio processo (LRU com TTL por item).
+
+    Com um único worker não há outros processos para avisar: `publish` não
+    entrega nada e os caches continuam invalidando a própria cópia.
+    """
+
+    name = 'local'
+    compartilhado = False
+
+    def __init__(self, maxsize: int):
+        self._lock = Lock()
+        self._itens: TLRUCache = TLRUCache(
+            maxsize=maxsize, ttu=lambda _chave, item, _agora: item[1]
+        )
+
+    def get(self, chave: str) -> bytes | None:
+        with self._lock:
+            item = self._itens.get(chave)
+        return None if item is None else item[0]
+
+    def set(self, chave: str, valor: bytes, ttl: float | None = None):
+        expira = math.inf if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._itens[chave] = (valor, expira)
+
+    def delete(self, *chaves: str):
+        with self._lock:
+            for chave in chaves:
+                self._itens.pop(chave, None)
+
+    def publish(self, canal: str, mensagem: bytes):
+        pass
+
+    def subscribe(self, canal: str, callback: Assinante):
+        pass
+
+    def poll(self):
+        pass
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+    def close(self):
+        self.clear()
+
+
+def _criar_backend(nome: str) -> CacheBackend:
+    settings = get_settings()
+    if nome == 'mmap':
+        from app.cache.shared_memory import SharedMemoryBackend
+
+        return SharedMemoryBackend(
+            settings.CACHE_MMAP_PATH,
+            slots=settings.CACHE_MMAP_SLOTS,
+            slot_bytes=settings.CACHE_MMAP_SLOT_BYTES,
+        )
+    if nome == 'redis':
+        from app.cache.redis_backend import RedisBackend
+
+        return RedisBackend(settings.REDIS_URL, prefixo=settings.CACHE_PREFIXO)
+    return LocalBackend(settings.CACHE_LOCAL_SIZE)
+
+
+_backends: dict[str, CacheBackend] = {}
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Retorna o backend configurado em `CACHE_BACKEND`, criado no primeiro uso.
+    """
+    nome = get_settings().CACHE_BACKEND
+    if nome not in _backends:
+        _backends[nome] = _criar_backend(nome)
+    return _backends[nome]
+
+
+def close_cache_backends():
+    """
+    Fecha os backends criados (conexões e arquivos mapeados).
+    """
+    while _backends:
+        _, backend = _backends.popitem()
+        backend.close()
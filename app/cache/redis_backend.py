@@ -0,0 +1,165 @@
+import logging
+from threading import Lock
+
+from app.cache.backend import ORIGEM_BYTES, Assinante, nova_origem
+
+try:
+    import redis
+    from redis import RedisError
+except ImportError:  # pragma: no cover - redis é opcional
+    redis = None
+
+    class RedisError(Exception):
+        pass
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisBackend:
+    """
+    Backend num servidor Redis (ou compatível), compartilhado por todos os
+    workers e máquinas que usam o mesmo servidor.
+
+    As chaves e canais recebem `prefixo`. A invalidação usa o pub/sub do
+    Redis; as mensagens ficam no buffer da conexão de assinatura até o
+    próximo `poll`. Se essa conexão cair, as mensagens do intervalo se
+    perdem e a defasagem fica limitada pelo TTL de cada cache.
+
+    Falhas do servidor não chegam às requisições: são registradas no log e
+    o cache segue só com a memória do processo (`get` responde que não
+    tem o valor, gravações e mensagens são descartadas e, se a leitura das
+    mensagens falhar, os assinantes recebem None e descartam o que
+    guardaram). Uma assinatura que falhar é refeita no `poll` seguinte.
+
+    Args:
+        url (str): URL do servidor (`redis://host:porta/db`).
+        prefixo (str): Prefixo das chaves e canais.
+        client: Um cliente já criado, com a interface do redis-py (útil
+            para testes); dispensa `url`.
+    """
+
+    name = 'redis'
+    compartilhado = True
+
+    def __init__(self, url: str | None = None, prefixo: str = '', client=None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError(
+                    'CACHE_BACKEND=redis requer o pacote redis '
+                    '(poetry install -E redis)'
+                )
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._prefixo = prefixo
+        self._origem = nova_origem()
+        self._lock = Lock()
+        self._pubsub = None
+        self._assinantes: dict[str, list[Assinante]] = {}
+        # Canais cuja assinatura falhou e ainda precisa ser refeita
+        self._pendentes: set[str] = set()
+
+    def get(self, chave: str) -> bytes | None:
+        try:
+            return self._client.get(self._prefixo + chave)
+        except RedisError as ex:
+            _avisar('get', ex)
+            return None
+
+    def set(self, chave: str, valor: bytes, ttl: float | None = None):
+        px = None if ttl is None else max(1, int(ttl * 1000))
+        try:
+            self._client.set(self._prefixo + chave, valor, px=px)
+        except RedisError as ex:
+            _avisar('set', ex)
+
+    def delete(self, *chaves: str):
+        if not chaves:
+            return
+        try:
+            self._client.delete(*(self._prefixo + chave for chave in chaves))
+        except RedisError as ex:
+            _avisar('delete', ex)
+
+    def publish(self, canal: str, mensagem: bytes):
+        try:
+            self._client.publish(
+                self._prefixo + canal, self._origem + mensagem
+            )
+        except RedisError as ex:
+            _avisar('publish', ex)
+
+    def subscribe(self, canal: str, callback: Assinante):
+        with self._lock:
+            self._assinantes.setdefault(canal, []).append(callback)
+            if canal in self._pendentes:
+                return
+            try:
+                self._assinar(canal)
+            except RedisError as ex:
+                _avisar('subscribe', ex)
+                self._pendentes.add(canal)
+
+    def _assinar(self, *canais: str):
+        if self._pubsub is None:
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(*(self._prefixo + canal for canal in canais))
+
+    def poll(self):
+        if self._pubsub is None and not self._pendentes:
+            return
+        with self._lock:
+            recebidas, perdidas = [], set()
+            if self._pendentes:
+                try:
+                    self._assinar(*self._pendentes)
+                except RedisError as ex:
+                    _avisar('subscribe', ex)
+                else:
+                    # Até aqui esses canais não recebiam as mensagens
+                    perdidas.update(self._pendentes)
+                    self._pendentes.clear()
+            try:
+                while self._pubsub is not None and (
+                    mensagem := self._pubsub.get_message(timeout=0)
+                ):
+                    recebidas.append(mensagem)
+            except RedisError as ex:
+                _avisar('poll', ex)
+                # Mensagens podem ter se perdido com a conexão
+                perdidas.update(self._assinantes)
+        for canal in perdidas:
+            for callback in list(self._assinantes.get(canal, ())):
+                callback(None)
+        for mensagem in recebidas:
+            if mensagem['type'] != 'message':
+                continue
+            dados = mensagem['data']
+            if dados[:ORIGEM_BYTES] == self._origem:
+                continue
+            canal = mensagem['channel']
+            if isinstance(canal, bytes):
+                canal = canal.decode()
+            for callback in self._assinantes.get(
+                canal.removeprefix(self._prefixo), ()
+            ):
+                callback(dados[ORIGEM_BYTES:])
+
+    def clear(self):
+        try:
+            chaves = list(self._client.scan_iter(match=f'{self._prefixo}*'))
+            if chaves:
+                self._client.delete(*chaves)
+        except RedisError as ex:
+            _avisar('clear', ex)
+
+    def close(self):
+        with self._lock:
+            if self._pubsub is not None:
+                self._pubsub.close()
+                self._pubsub = None
+        self._client.close()
+
+
+def _avisar(operacao: str, ex: Exception):
+    logger.warning('Redis indisponível (%s): %s', operacao, ex)
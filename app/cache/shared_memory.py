@@ -0,0 +1,210 @@
+import fcntl
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from hashlib import blake2b
+from threading import Lock
+
+from app.cache.backend import ORIGEM_BYTES, Assinante, nova_origem
+
+MAGIC = b'FCACHE01'
+# magic, slots, bytes por valor, mensagens na fila, sequência da última
+CABECALHO = struct.Struct('<8sIIIQ')
+SEQUENCIA = struct.Struct('<Q')
+SEQUENCIA_OFFSET = CABECALHO.size - SEQUENCIA.size
+CABECALHO_BYTES = 64
+# sequência, origem, tamanho do canal e da mensagem
+MENSAGEM = struct.Struct(f'<Q{ORIGEM_BYTES}sHH')
+MENSAGEM_BYTES = 512
+# hash da chave, expiração (epoch; 0 = sem TTL), tamanho do valor e da chave
+SLOT = struct.Struct('<8sdIH')
+CHAVE_MAX = 256 - SLOT.size
+VAZIO = bytes(8)
+
+
+class SharedMemoryBackend:
+    """
+    Backend num arquivo mapeado em memória (mmap), compartilhado pelos
+    workers da mesma máquina.
+
+    Os valores ficam numa tabela de `slots` de tamanho fixo, endereçada pelo
+    hash da chave (uma chave que colide substitui a anterior; valores maiores
+    que `slot_bytes` não são guardados). As mensagens vão para uma fila
+    circular no mesmo arquivo, lida por cada processo em `poll`; quem ficou
+    para trás mais que o tamanho da fila recebe None e descarta tudo.
+
+    O acesso é serializado com `flock` no arquivo (e um Lock entre as
+    threads do processo). Todos os workers precisam usar os mesmos
+    parâmetros: um arquivo com outro formato é recriado.
+    """
+
+    name = 'mmap'
+    compartilhado = True
+
+    def __init__(
+        self,
+        path: str,
+        slots: int = 1024,
+        slot_bytes: int = 65536,
+        fila: int = 256,
+    ):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.fila = fila
+        self._slot_total = 256 + slot_bytes
+        self._inicio_slots = CABECALHO_BYTES + fila * MENSAGEM_BYTES
+        tamanho = self._inicio_slots + slots * self._slot_total
+
+        self._lock = Lock()
+        self._poll_lock = Lock()
+        self._origem = nova_origem()
+        self._assinantes: dict[str, list[Assinante]] = {}
+        self._vista: int | None = None
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        cabecalho = CABECALHO.pack(MAGIC, slots, slot_bytes, fila, 0)
+        with self._travado(fcntl.LOCK_EX):
+            atual = os.pread(self._fd, CABECALHO.size, 0)
+            if (
+                os.fstat(self._fd).st_size != tamanho
+                or atual[:SEQUENCIA_OFFSET] != cabecalho[:SEQUENCIA_OFFSET]
+            ):
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, tamanho)
+                os.pwrite(self._fd, cabecalho, 0)
+        self._mm = mmap.mmap(self._fd, tamanho)
+
+    @contextmanager
+    def _travado(self, modo: int) -> Iterator[None]:
+        with self._lock:
+            fcntl.flock(self._fd, modo)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _slot(self, chave: bytes) -> tuple[bytes, int]:
+        digest = blake2b(chave, digest_size=8).digest()
+        indice = int.from_bytes(digest, 'little') % self.slots
+        return digest, self._inicio_slots + indice * self._slot_total
+
+    def get(self, chave: str) -> bytes | None:
+        chave_bytes = chave.encode()
+        digest, offset = self._slot(chave_bytes)
+        with self._travado(fcntl.LOCK_SH):
+            hash_, expira, tamanho, tamanho_chave = SLOT.unpack_from(
+                self._mm, offset
+            )
+            if hash_ != digest or (expira and expira <= time.time()):
+                return None
+            inicio = offset + SLOT.size
+            if self._mm[inicio : inicio + tamanho_chave] != chave_bytes:
+                return None
+            inicio = offset + 256
+            return self._mm[inicio : inicio + tamanho]
+
+    def set(self, chave: str, valor: bytes, ttl: float | None = None):
+        chave_bytes = chave.encode()
+        if len(chave_bytes) > CHAVE_MAX or len(valor) > self.slot_bytes:
+            return
+        digest, offset = self._slot(chave_bytes)
+        expira = 0.0 if ttl is None else time.time() + ttl
+        with self._travado(fcntl.LOCK_EX):
+            SLOT.pack_into(
+                self._mm, offset, digest, expira, len(valor), len(chave_bytes)
+            )
+            inicio = offset + SLOT.size
+            self._mm[inicio : inicio + len(chave_bytes)] = chave_bytes
+            self._mm[offset + 256 : offset + 256 + len(valor)] = valor
+
+    def delete(self, *chaves: str):
+        with self._travado(fcntl.LOCK_EX):
+            for chave in chaves:
+                digest, offset = self._slot(chave.encode())
+                if self._mm[offset : offset + 8] == digest:
+                    self._mm[offset : offset + 8] = VAZIO
+
+    def publish(self, canal: str, mensagem: bytes):
+        canal_bytes = canal.encode()
+        if MENSAGEM.size + len(canal_bytes) + len(mensagem) > MENSAGEM_BYTES:
+            raise ValueError('Mensagem maior que o espaço da fila')
+        with self._travado(fcntl.LOCK_EX):
+            (sequencia,) = SEQUENCIA.unpack_from(self._mm, SEQUENCIA_OFFSET)
+            sequencia += 1
+            offset = self._offset_mensagem(sequencia)
+            MENSAGEM.pack_into(
+                self._mm,
+                offset,
+                sequencia,
+                self._origem,
+                len(canal_bytes),
+                len(mensagem),
+            )
+            inicio = offset + MENSAGEM.size
+            self._mm[inicio : inicio + len(canal_bytes) + len(mensagem)] = (
+                canal_bytes + mensagem
+            )
+            SEQUENCIA.pack_into(self._mm, SEQUENCIA_OFFSET, sequencia)
+
+    def subscribe(self, canal: str, callback: Assinante):
+        with self._poll_lock:
+            if self._vista is None:
+                with self._travado(fcntl.LOCK_SH):
+                    (self._vista,) = SEQUENCIA.unpack_from(
+                        self._mm, SEQUENCIA_OFFSET
+                    )
+            self._assinantes.setdefault(canal, []).append(callback)
+
+    def poll(self):
+        if self._vista is None:
+            return
+        with self._poll_lock:
+            with self._travado(fcntl.LOCK_SH):
+                (sequencia,) = SEQUENCIA.unpack_from(
+                    self._mm, SEQUENCIA_OFFSET
+                )
+                if sequencia == self._vista:
+                    return
+                perdidas = sequencia - self._vista > self.fila
+                primeira = max(self._vista + 1, sequencia - self.fila + 1)
+                mensagens = [
+                    self._ler_mensagem(numero)
+                    for numero in range(primeira, sequencia + 1)
+                ]
+            self._vista = sequencia
+
+            if perdidas:
+                for callbacks in self._assinantes.values():
+                    for callback in callbacks:
+                        callback(None)
+            for origem, canal, mensagem in mensagens:
+                if origem == self._origem:
+                    continue
+                for callback in self._assinantes.get(canal, ()):
+                    callback(mensagem)
+
+    def clear(self):
+        with self._travado(fcntl.LOCK_EX):
+            for indice in range(self.slots):
+                offset = self._inicio_slots + indice * self._slot_total
+                self._mm[offset : offset + 8] = VAZIO
+
+    def close(self):
+        if not self._mm.closed:
+            self._mm.close()
+            os.close(self._fd)
+
+    def _offset_mensagem(self, sequencia: int) -> int:
+        return CABECALHO_BYTES + (sequencia % self.fila) * MENSAGEM_BYTES
+
+    def _ler_mensagem(self, sequencia: int) -> tuple[bytes, str, bytes]:
+        offset = self._offset_mensagem(sequencia)
+        _, origem, tamanho_canal, tamanho = MENSAGEM.unpack_from(
+            self._mm, offset
+        )
+        inicio = offset + MENSAGEM.size
+        canal = self._mm[inicio : inicio + tamanho_canal].decode()
+        inicio += tamanho_canal
+        return origem, canal, self._mm[inicio : inicio + tamanho]
@@ -1,59 +1,163 @@
 from datetime import datetime, timedelta
 
-from bcrypt import checkpw, gensalt, hashpw
-from fastapi import Depends
-from jose import jwt
+from fastapi import BackgroundTasks, Depends
+from starlette.concurrency import run_in_threadpool
 
 import app.api.auth.crud_auth as crud_auth
-from app.config.config import get_settings
+from app.config.hashing import (
+    check_password,
+    hash_executor,
+    needs_rehash,
+    password_hash_task,
+)
+from app.config.token_codec import encode_token
 from app.database.get_db import SessionLocal, get_db
 from app.utils.Exceptions.exceptions import (
+    HashQueueFullException,
     Incorrect_username_or_password,
     Permission_Exception,
 )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return checkpw(
-        plain_password.encode('utf-8'), hashed_password.encode('utf-8')
-    )
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return hashpw(password.encode('utf-8'), gensalt()).decode('utf-8')
+    fn, *args = password_hash_task(password)
+    return fn(*args)
+
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    """
+    Igual a `verify_password`, mas calculado no executor de hashing; a thread
+    chamadora apenas espera o resultado.
+    """
+    return hash_executor.run(check_password, plain_password, hashed_password)
+
+
+def get_password_hash_pooled(password: str) -> str:
+    """
+    Igual a `get_password_hash`, mas calculado no executor de hashing.
+    """
+    return hash_executor.run(*password_hash_task(password))
+
 
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    """
+    Verifica a senha no executor de hashing sem bloquear o event loop.
+    """
+    return await hash_executor.run_async(
+        check_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Gera o hash da senha no executor de hashing sem bloquear o event loop.
+    """
+    return await hash_executor.run_async(*password_hash_task(password))
+
+
+async def rehash_password(
+    db: SessionLocal, user_id: int, old_hash: str, password: str
+):
+    """
+    Recalcula o hash da senha com o esquema/custo configurado e o grava, desde
+    que a senha não tenha sido alterada nesse meio tempo.
 
-def authenticate(
+    Executada como background task após um login bem-sucedido; se a fila de
+    hashing estiver cheia, a atualização fica para o próximo login.
+
+    Args:
+        db (SessionLocal): A sessão do banco de dados da requisição.
+        user_id (int): O ID do usuário.
+        old_hash (str): O hash verificado no login.
+        password (str): A senha em texto puro informada no login.
+    """
+    try:
+        new_hash = await get_password_hash_async(password)
+    except HashQueueFullException:
+        return
+    await run_in_threadpool(
+        crud_auth.replace_password_hash, db, user_id, old_hash, new_hash
+    )
+
+
+async def authenticate(
     email: str,
     password: str,
     db: SessionLocal = Depends(get_db),
+    background_tasks: BackgroundTasks | None = None,
 ) -> dict | bool:
     """
     Autentica um usuário com base em seu email e senha.
 
+    As consultas usam a sessão síncrona no threadpool e a verificação do
+    bcrypt roda no executor de hashing, então o event loop fica livre
+    durante todo o login.
+
     Args:
         email (str): O email do usuário.
         password (str): A senha do usuário.
         db (SessionLocal, opcional): A sessão do banco de dados. Padrão é Depends(get_db).
+        background_tasks (BackgroundTasks, opcional): Onde agendar a atualização do hash, se necessária.
 
     Returns:
         dict: Um dicionário contendo o usuário autenticado e suas permissões.
         False: Se o usuário não for encontrado ou a senha estiver incorreta.
+
+    Raises:
+        Incorrect_username_or_password: Se o email ou a senha estiverem incorretos.
+        HashQueueFullException: Se a fila de hashing estiver cheia.
     """
     # Obtém o usuário pelo email
-    user = crud_auth.get_user_by_email(db=db, email_user=email)
+    user = await run_in_threadpool(
+        crud_auth.get_user_by_email, db=db, email_user=email
+    )
     # Verifica se o usuário existe e se a senha está correta
     if not user:
         raise Incorrect_username_or_password()
-    if not verify_password(password, user.senha):
+    if not await verify_password_async(password, user.senha):
         raise Incorrect_username_or_password()
     # Obtém as permissões do usuário
-    permissions = crud_auth.get_user_permissions(db=db, user_id=user.id)
+    permissions = await run_in_threadpool(
+        crud_auth.get_user_permissions, db=db, user_id=user.id
+    )
     if permissions is None:
         raise Permission_Exception()
+    if background_tasks is not None and needs_rehash(user.senha):
+        background_tasks.add_task(
+            rehash_password, db, user.id, user.senha, password
+        )
     return {'user': user, 'permissions': permissions}
 
 
+def build_token_claims(user, permissions: list[str]) -> dict:
+    """
+    Monta as claims do token de acesso de um usuário.
+
+    Além do `sub` (email), o token carrega o id, as permissões e a versão do
+    token do usuário, usados por `get_current_principal` sem consultar o
+    banco.
+
+    Args:
+        user (Usuario | UserSnapshot): O usuário autenticado.
+        permissions (list[str]): As permissões do usuário.
+
+    Returns:
+        dict: As claims do token.
+    """
+    return {
+        'sub': user.email,
+        'uid': user.id,
+        'permissions': list(permissions),
+        'ver': user.token_version,
+    }
+
+
 def create_access_token(*, data: dict, expires_delta: timedelta | None = None):
     """
     Cria um token de acesso JWT.
@@ -72,9 +176,5 @@ def create_access_token(*, data: dict, expires_delta: timedelta | None = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({'exp': expire})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        get_settings().SECRET_KEY,
-        algorithm=get_settings().ALGORITHM,
-    )
+    encoded_jwt = encode_token(to_encode)
     return encoded_jwt
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,16 +15,129 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
 
+    # Pool de conexões (não se aplica ao SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    # Recicla conexões antigas e testa cada checkout: no fly.io as conexões
+    # ficam inválidas quando a máquina é suspensa.
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    # Comandos SQL por requisição: contagem e tempo no header Server-Timing
+    # e aviso no log acima do orçamento ou quando o mesmo comando se repete
+    # (possível N+1; 0 desativa esse aviso).
+    QUERY_STATS: bool = True
+    QUERY_BUDGET: int = 25
+    QUERY_REPETICOES_ALERTA: int = 5
+
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # 'jose' (python-jose) ou 'pyjwt' (requer o extra pyjwt)
+    JWT_BACKEND: Literal['jose', 'pyjwt'] = 'jose'
+    # Quantidade de tokens verificados mantidos em cache (0 desativa)
+    JWT_CACHE_SIZE: int = 4096
 
     # SECRETS
     SECRET_KEY: str
 
+    # Hashing de senhas
+    # 'process' usa um processo por worker (paralelismo entre núcleos);
+    # 'thread' usa threads, o bcrypt libera o GIL durante o cálculo.
+    HASH_EXECUTOR: Literal['process', 'thread'] = 'process'
+    # Sem valor definido, usa a quantidade de CPUs da máquina.
+    HASH_WORKERS: int | None = None
+    # Esquema e custo dos novos hashes. Hashes antigos com outro esquema ou
+    # custo são recalculados no próximo login bem-sucedido.
+    PASSWORD_SCHEME: Literal['bcrypt', 'argon2id'] = 'bcrypt'
+    BCRYPT_ROUNDS: int = 12
+    # argon2id (requer argon2-cffi): memória em KiB
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    HASH_QUEUE_LIMIT: int = 64
+
+    # Cache de usuário/permissões usado na autenticação (por processo)
+    IDENTITY_CACHE_SIZE: int = 1024
+    IDENTITY_CACHE_TTL: float = 300
+
+    # Backend compartilhado pelos caches entre workers: 'local' (só o
+    # processo), 'mmap' (arquivo mapeado em memória, workers da mesma
+    # máquina) ou 'redis' (requer o extra redis). Ele propaga as
+    # invalidações dos caches de autenticação, de áreas, de recorrências e
+    # de preços para os outros workers e guarda o catálogo de áreas para
+    # eles.
+    CACHE_BACKEND: Literal['local', 'mmap', 'redis'] = 'local'
+    CACHE_LOCAL_SIZE: int = 1024
+    CACHE_MMAP_PATH: str = '/tmp/fastapi_estudos.cache'
+    CACHE_MMAP_SLOTS: int = 1024
+    CACHE_MMAP_SLOT_BYTES: int = 65536
+    REDIS_URL: str = 'redis://localhost:6379/0'
+    CACHE_PREFIXO: str = 'fastapi_estudos:'
+
+    # Servidor de produção (python -m app.server): sem SERVER_WORKERS, um
+    # worker por CPU (com SQLite, só um worker é aceito). Cada worker é
+    # reciclado depois de SERVER_MAX_REQUESTS requisições (0 desativa), mais
+    # um acréscimo aleatório até o jitter.
+    SERVER_HOST: str = '0.0.0.0'
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = None
+    SERVER_PRELOAD: bool = True
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_TIMEOUT: float = 30
+
     # Permissões
     ADMINISTRADOR: str = 'administrador'
     CLIENTE: str = 'cliente'
 
+    # Reservas
+    # Índice de intervalos em memória para checagem de conflitos. Só é
+    # coerente quando um único processo escreve em `reservations`, então o
+    # servidor não sobe vários workers com ele.
+    RESERVA_INTERVAL_INDEX: bool = False
+    # Mapa de ocupação por (área, dia) em slots de 15 minutos, usado na grade
+    # de ocupação das áreas. Com RESERVA_OCUPACAO_BITMAP ele também dispensa
+    # a consulta de conflito quando os slots estão livres; como o índice de
+    # intervalos, só é coerente quando um único processo escreve (e também
+    # impede vários workers).
+    RESERVA_OCUPACAO_BITMAP: bool = False
+    OCUPACAO_CACHE_SIZE: int = 8192
+    OCUPACAO_CACHE_TTL: float = 300
+    # Linhas lidas do banco por vez na exportação de reservas
+    EXPORT_BATCH_SIZE: int = 1000
+    # Quantidade máxima de reservas aceitas por POST /reservas/bulk
+    RESERVA_BULK_LIMIT: int = 500
+    # Reservas recorrentes: cache de regras/ocorrências por área (por
+    # processo, invalidado pelo CACHE_BACKEND), horizonte usado para
+    # comparar duas séries sem fim e maior janela aceita na listagem de
+    # ocorrências.
+    RECORRENCIA_CACHE_SIZE: int = 4096
+    RECORRENCIA_CACHE_TTL: float = 300
+    RECORRENCIA_HORIZONTE_DIAS: int = 730
+    RECORRENCIA_JANELA_MAX_DIAS: int = 366
+    # Catálogo de áreas em cache (por processo): intervalo, em segundos,
+    # entre as conferências da versão do catálogo no banco. Com 0, toda
+    # leitura confere a versão (uma consulta leve) e nunca serve dados
+    # defasados; acima disso, outro processo pode ficar até esse tempo
+    # defasado depois de uma escrita.
+    AREA_CATALOGO_VERSAO_TTL: float = 0
+    # Maior janela aceita nas consultas de disponibilidade das áreas
+    DISPONIBILIDADE_JANELA_MAX_DIAS: int = 31
+
+    # Preços: tabela das áreas sem tarifa cadastrada e cache das tabelas
+    # compiladas por área (por processo, invalidado pelo CACHE_BACKEND)
+    PRECO_HORA_PADRAO: int = 10
+    PRECO_MINIMO_PADRAO: int = 10
+    PRECO_CACHE_SIZE: int = 1024
+    PRECO_CACHE_TTL: float = 300
+    # Quantidade máxima de horários por POST /reservas/cotacao
+    COTACAO_LIMITE: int = 1000
+    # Maior duração, em dias, de cada horário cotado ou reservado
+    HORARIO_MAX_DIAS: int = 31
+
 
 @lru_cache
 def get_settings() -> Settings:
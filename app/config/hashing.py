@@ -0,0 +1,212 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from threading import Lock
+
+from bcrypt import checkpw, gensalt, hashpw
+
+from app.config.config import Settings, get_settings
+from app.utils.Exceptions.exceptions import HashQueueFullException
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # pragma: no cover - argon2-cffi é opcional
+    PasswordHasher = None
+
+ARGON2_PREFIX = '$argon2id$'
+
+
+def hash_password(password: str, rounds: int) -> str:
+    """
+    Gera o hash bcrypt de uma senha com o custo informado.
+
+    Função de módulo (e não método) para poder ser enviada aos workers do
+    ProcessPoolExecutor.
+    """
+    return hashpw(password.encode('utf-8'), gensalt(rounds)).decode('utf-8')
+
+
+def hash_password_argon2(
+    password: str, time_cost: int, memory_cost: int, parallelism: int
+) -> str:
+    """
+    Gera o hash argon2id de uma senha com os parâmetros informados.
+    """
+    return _argon2_hasher(time_cost, memory_cost, parallelism).hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifica uma senha contra o seu hash, identificando o esquema (bcrypt ou
+    argon2id) pelo prefixo do hash.
+    """
+    if hashed_password.startswith(ARGON2_PREFIX):
+        hasher = _argon2_hasher()
+        try:
+            return hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return checkpw(
+        plain_password.encode('utf-8'), hashed_password.encode('utf-8')
+    )
+
+
+def password_hash_task(
+    password: str, settings: Settings | None = None
+) -> tuple:
+    """
+    Escolhe a função e os argumentos de hashing conforme `PASSWORD_SCHEME`.
+
+    Returns:
+        tuple: `(funcao, *argumentos)`, pronto para ser executado localmente
+        ou enviado ao `hash_executor`.
+    """
+    settings = settings or get_settings()
+    if settings.PASSWORD_SCHEME == 'argon2id':
+        return (
+            hash_password_argon2,
+            password,
+            settings.ARGON2_TIME_COST,
+            settings.ARGON2_MEMORY_COST,
+            settings.ARGON2_PARALLELISM,
+        )
+    return hash_password, password, settings.BCRYPT_ROUNDS
+
+
+def needs_rehash(
+    hashed_password: str, settings: Settings | None = None
+) -> bool:
+    """
+    Indica se um hash foi gerado com esquema ou parâmetros diferentes dos
+    configurados (`PASSWORD_SCHEME`, `BCRYPT_ROUNDS`, `ARGON2_*`).
+
+    Args:
+        hashed_password (str): O hash armazenado em `usuario.senha`.
+        settings (Settings, optional): As configurações; por padrão `get_settings()`.
+
+    Returns:
+        bool: True se a senha deve ser recalculada no próximo login; False
+        também quando os parâmetros do hash não puderem ser lidos (hash
+        malformado ou legado), para não derrubar o login.
+    """
+    settings = settings or get_settings()
+    try:
+        if settings.PASSWORD_SCHEME == 'argon2id':
+            if not hashed_password.startswith(ARGON2_PREFIX):
+                return True
+            return _argon2_hasher(
+                settings.ARGON2_TIME_COST,
+                settings.ARGON2_MEMORY_COST,
+                settings.ARGON2_PARALLELISM,
+            ).check_needs_rehash(hashed_password)
+
+        # Formato bcrypt: $2b$<custo>$<salt+hash>
+        partes = hashed_password.split('$')
+        if len(partes) != 4 or not partes[1].startswith('2'):
+            return True
+        return int(partes[2]) != settings.BCRYPT_ROUNDS
+    except (ValueError, IndexError):
+        return False
+
+
+def _argon2_hasher(*params) -> 'PasswordHasher':
+    if PasswordHasher is None:
+        raise RuntimeError(
+            'PASSWORD_SCHEME=argon2id requer o pacote argon2-cffi '
+            '(poetry install -E argon2)'
+        )
+    return PasswordHasher(*params)
+
+
+class HashExecutor:
+    """
+    Executor dedicado ao hashing de senhas, separado do threadpool usado pelo
+    FastAPI.
+
+    O pool é criado na primeira utilização, de acordo com `HASH_EXECUTOR`
+    ('process' ou 'thread') e `HASH_WORKERS`. O número de tarefas pendentes
+    (na fila ou em execução) é limitado por `HASH_QUEUE_LIMIT`: acima dele a
+    submissão falha imediatamente com 503, em vez de acumular logins que
+    acabariam estourando o timeout do cliente.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._executor: Executor | None = None
+        self.pendentes = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._criar_executor()
+        return self._executor
+
+    def _criar_executor(self) -> Executor:
+        settings = get_settings()
+        workers = settings.HASH_WORKERS or os.cpu_count() or 1
+        if settings.HASH_EXECUTOR == 'thread':
+            return ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='bcrypt'
+            )
+        # spawn: fork a partir de um processo com threads (uvicorn,
+        # threadpool do FastAPI) pode herdar locks em estado inconsistente.
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+
+    def submit(self, fn, *args) -> Future:
+        """
+        Agenda `fn(*args)` no pool respeitando o limite da fila.
+
+        Raises:
+            HashQueueFullException: Se já houver `HASH_QUEUE_LIMIT` tarefas pendentes.
+        """
+        with self._lock:
+            if self.pendentes >= get_settings().HASH_QUEUE_LIMIT:
+                raise HashQueueFullException()
+            self.pendentes += 1
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._finalizar()
+            raise
+        future.add_done_callback(self._finalizar)
+        return future
+
+    def run(self, fn, *args):
+        """
+        Executa `fn(*args)` no pool e espera o resultado (para código síncrono).
+        """
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn, *args):
+        """
+        Executa `fn(*args)` no pool sem bloquear o event loop.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        """
+        Encerra o pool; ele será recriado se for usado novamente.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _finalizar(self, _future: Future | None = None):
+        with self._lock:
+            self.pendentes -= 1
+
+
+hash_executor = HashExecutor()
@@ -0,0 +1,176 @@
+import time
+from hashlib import sha256
+from threading import Lock
+
+from cachetools import TLRUCache
+from jose import JWTError
+from jose import jwt as jose_jwt
+
+from app.config.config import get_settings
+
+try:
+    import jwt as pyjwt
+except ImportError:  # pragma: no cover - PyJWT é opcional
+    pyjwt = None
+
+# Tempo máximo em cache de tokens sem a claim `exp`
+TTL_SEM_EXP = 300
+
+
+class TokenDecodeError(Exception):
+    """
+    Representa um token inválido, expirado ou com assinatura incorreta,
+    independente da biblioteca JWT usada.
+    """
+
+
+class JoseBackend:
+    """
+    Backend JWT baseado no python-jose (padrão).
+    """
+
+    name = 'jose'
+
+    def encode(self, payload: dict, key: str, algorithm: str) -> str:
+        return jose_jwt.encode(payload, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        try:
+            return jose_jwt.decode(token, key, algorithms=[algorithm])
+        except JWTError as ex:
+            raise TokenDecodeError(str(ex)) from ex
+
+
+class PyJWTBackend:
+    """
+    Backend JWT baseado no PyJWT, mais rápido que o python-jose para HMAC.
+    """
+
+    name = 'pyjwt'
+
+    def __init__(self):
+        if pyjwt is None:
+            raise RuntimeError(
+                'JWT_BACKEND=pyjwt requer o pacote PyJWT '
+                '(poetry install -E pyjwt)'
+            )
+
+    def encode(self, payload: dict, key: str, algorithm: str) -> str:
+        return pyjwt.encode(payload, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        try:
+            return pyjwt.decode(token, key, algorithms=[algorithm])
+        except pyjwt.PyJWTError as ex:
+            raise TokenDecodeError(str(ex)) from ex
+
+
+BACKENDS = {'jose': JoseBackend, 'pyjwt': PyJWTBackend}
+_backends: dict[str, JoseBackend | PyJWTBackend] = {}
+
+
+def get_jwt_backend() -> JoseBackend | PyJWTBackend:
+    """
+    Retorna o backend configurado em `JWT_BACKEND`.
+    """
+    name = get_settings().JWT_BACKEND
+    if name not in _backends:
+        _backends[name] = BACKENDS[name]()
+    return _backends[name]
+
+
+def _agora() -> float:
+    # Resolvido a cada chamada (e não `timer=time.time`) para respeitar
+    # relógios substituídos, como o freezegun nos testes.
+    return time.time()
+
+
+def _expira_em(_digest: bytes, payload: dict, agora: float) -> float:
+    exp = payload.get('exp')
+    if isinstance(exp, (int, float)):
+        return exp
+    return agora + TTL_SEM_EXP
+
+
+class VerifiedTokenCache:
+    """
+    Cache dos payloads de tokens já verificados.
+
+    A chave é o SHA-256 do token (o token em si não fica em memória) e cada
+    entrada expira no `exp` do próprio token, então um token vencido nunca é
+    servido pelo cache. Apenas tokens válidos são armazenados.
+    """
+
+    def __init__(self, maxsize: int):
+        self._lock = Lock()
+        self._cache = TLRUCache(
+            maxsize=max(maxsize, 1), ttu=_expira_em, timer=_agora
+        )
+        self.enabled = maxsize > 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str) -> dict | None:
+        """
+        Retorna uma cópia do payload verificado, se o token estiver em cache.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            payload = self._cache.get(self.digest(token))
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return dict(payload)
+
+    def put(self, token: str, payload: dict):
+        """
+        Guarda o payload de um token cuja assinatura já foi verificada.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._cache[self.digest(token)] = dict(payload)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+token_cache = VerifiedTokenCache(get_settings().JWT_CACHE_SIZE)
+
+
+def encode_token(payload: dict) -> str:
+    """
+    Assina um payload com a chave e o algoritmo configurados.
+    """
+    settings = get_settings()
+    return get_jwt_backend().encode(
+        payload, settings.SECRET_KEY, settings.ALGORITHM
+    )
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verifica um token e retorna o seu payload, consultando antes o cache de
+    tokens já verificados.
+
+    Raises:
+        TokenDecodeError: Se o token for inválido ou estiver expirado.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    settings = get_settings()
+    payload = get_jwt_backend().decode(
+        token, settings.SECRET_KEY, settings.ALGORITHM
+    )
+    token_cache.put(token, payload)
+    return payload
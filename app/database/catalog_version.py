@@ -0,0 +1,72 @@
+from sqlalchemy import Integer, String, event, select, update
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.database.base import Base
+
+# Chave em `Session.info` com os catálogos alterados na transação atual
+ALTERADOS = 'catalogos_alterados'
+
+
+class CatalogVersion(Base):
+    """
+    Contador de versão de um catálogo (como o de áreas), incrementado a cada
+    escrita. Os caches em memória de cada processo comparam a versão que
+    carregaram com a do banco para saber se ficaram defasados.
+    """
+
+    __tablename__ = 'catalog_versions'
+
+    nome: Mapped[str] = mapped_column(String(50), primary_key=True)
+    versao: Mapped[int] = mapped_column(Integer, default=0)
+
+
+def get_catalog_version(db: Session, nome: str) -> int:
+    """
+    Obtém a versão atual de um catálogo.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        nome (str): O nome do catálogo.
+
+    Returns:
+        int: A versão, ou 0 se o catálogo ainda não foi alterado.
+    """
+    versao = db.scalar(
+        select(CatalogVersion.versao).where(CatalogVersion.nome == nome)
+    )
+    return versao or 0
+
+
+def bump_catalog_version(db: Session, nome: str):
+    """
+    Incrementa a versão de um catálogo dentro da transação atual, para que
+    o commit da escrita e o da nova versão sejam um só.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        nome (str): O nome do catálogo.
+    """
+    resultado = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.nome == nome)
+        .values(versao=CatalogVersion.versao + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if resultado.rowcount == 0:
+        db.add(CatalogVersion(nome=nome, versao=1))
+        db.flush()
+    db.info.setdefault(ALTERADOS, set()).add(nome)
+
+
+def catalog_changed(db: Session, nome: str) -> bool:
+    """
+    Indica se a transação atual da sessão alterou o catálogo; o que ela lê
+    dele ainda não foi confirmado e não deve ir para um cache.
+    """
+    return nome in db.info.get(ALTERADOS, ())
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _limpa_alterados(session: Session, transaction):
+    if transaction.parent is None:
+        session.info.pop(ALTERADOS, None)
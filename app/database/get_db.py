@@ -2,9 +2,17 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config.config import get_settings
+from app.database.pool import get_engine_options
 
-engine = create_engine(get_settings().DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    get_settings().DATABASE_URL,
+    **get_engine_options(get_settings().DATABASE_URL),
+)
+# Sem expirar no commit, os objetos gravados continuam carregados e não
+# precisam de um SELECT (refresh) depois de cada escrita.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 def get_db():
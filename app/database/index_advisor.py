@@ -0,0 +1,350 @@
+"""
+Consultor de índices: roda o EXPLAIN das consultas feitas pelos CRUDs e
+aponta leituras sequenciais em tabelas acima de um tamanho mínimo.
+
+Uso: python -m app.database.index_advisor [--min-linhas N]
+
+No PostgreSQL o tamanho das tabelas vem da estimativa do planner
+(pg_class.reltuples); rode ANALYZE antes num banco com dados realistas.
+"""
+import argparse
+import re
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import Session
+
+from app.api.area import crud_area, crud_disponibilidade
+from app.api.auth import crud_auth
+from app.api.preco import crud_preco
+from app.api.recorrencia import crud_recorrencia
+from app.api.recorrencia.recurrence import WEEKLY, Regra
+from app.api.reserva import crud_reserva
+from app.api.reserva.reserva_schema import ReservationCreate
+from app.api.tipo_usuario import crud_tipo_usuario
+from app.api.usuario import crud_usuario
+from app.database.base import Base
+from app.database.get_db import SessionLocal
+from app.utils.Exceptions.exceptions import (
+    ObjectNotFoundException,
+    UserNotFoundException,
+)
+
+MIN_LINHAS_PADRAO = 1000
+# 'SCAN reservations' (SQLite >= 3.36) ou 'SCAN TABLE reservations'; com
+# 'USING INDEX' a leitura é pelo índice e não conta como sequencial.
+SCAN_SQLITE = re.compile(r'^SCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)')
+COMANDOS = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+# Listagens paginadas percorrem a tabela por natureza (no SQLite, pela ordem
+# do rowid, parando no LIMIT) e não são apontadas.
+LEITURAS_ESPERADAS = {
+    ('crud_area.get_areas', 'areas'),
+    ('crud_disponibilidade.get_free_areas', 'areas'),
+    ('crud_disponibilidade.get_areas_occupancy', 'areas'),
+    ('crud_reserva.get_reservas', 'reservations'),
+    ('crud_tipo_usuario.get_tipo_usuarios', 'tipouser'),
+    ('crud_usuario.get_users', 'usuario'),
+}
+
+DIA = datetime(2024, 1, 1)
+RESERVA = ReservationCreate(
+    reserva_data=DIA,
+    hora_inicio=DIA + timedelta(hours=8),
+    hora_fim=DIA + timedelta(hours=9),
+    justificacao='',
+    reserva_tipo='',
+    status='',
+    area_id=1,
+    usuario_id=1,
+)
+REGRA = Regra(
+    id=0,
+    area_id=1,
+    frequencia=WEEKLY,
+    intervalo=1,
+    dias_semana=(0,),
+    inicio=RESERVA.hora_inicio,
+    duracao=timedelta(hours=1),
+    contagem=4,
+)
+
+# As consultas de leitura dos CRUDs, com argumentos de exemplo. Chamadas que
+# não encontram o objeto ainda fazem a consulta, que é o que interessa aqui.
+CONSULTAS_CRUD: list[tuple[str, Callable[[Session], object]]] = [
+    ('crud_area.get_areas', lambda db: crud_area.get_areas(db)),
+    (
+        'crud_area.get_area_by_name',
+        lambda db: crud_area.get_area_by_name('Quadra', db),
+    ),
+    ('crud_area.get_area_by_id', lambda db: crud_area.get_area_by_id(1, db)),
+    (
+        'crud_disponibilidade.get_area_availability',
+        lambda db: crud_disponibilidade.get_area_availability(
+            db, 1, DIA, DIA + timedelta(days=1), timedelta(hours=1)
+        ),
+    ),
+    (
+        'crud_disponibilidade.get_free_areas',
+        lambda db: crud_disponibilidade.get_free_areas(
+            db, RESERVA.hora_inicio, RESERVA.hora_fim
+        ),
+    ),
+    (
+        'crud_disponibilidade.get_areas_occupancy',
+        lambda db: crud_disponibilidade.get_areas_occupancy(db, DIA.date()),
+    ),
+    (
+        'crud_auth.get_user_by_email',
+        lambda db: crud_auth.get_user_by_email('usuario@exemplo.com', db),
+    ),
+    (
+        'crud_auth.get_user_permissions',
+        lambda db: crud_auth.get_user_permissions(1, db),
+    ),
+    ('crud_preco.get_tarifa', lambda db: crud_preco.get_tarifa(1, db)),
+    (
+        'crud_preco.preco_reserva',
+        lambda db: crud_preco.preco_reserva(db, RESERVA),
+    ),
+    (
+        'crud_recorrencia.get_rule_by_id',
+        lambda db: crud_recorrencia.get_rule_by_id(1, db),
+    ),
+    (
+        'crud_recorrencia.find_rule_conflict',
+        lambda db: crud_recorrencia.find_rule_conflict(db, REGRA),
+    ),
+    (
+        'crud_reserva.get_reservation_by_id',
+        lambda db: crud_reserva.get_reservation_by_id(1, db),
+    ),
+    (
+        'crud_reserva.get_reservations_by_user_id',
+        lambda db: crud_reserva.get_reservations_by_user_id(1, db),
+    ),
+    ('crud_reserva.get_reservas', lambda db: crud_reserva.get_reservas(db)),
+    (
+        'crud_reserva.stream_reservations',
+        lambda db: crud_reserva.stream_reservations(
+            db, DIA.date(), DIA.date() + timedelta(days=30)
+        ),
+    ),
+    (
+        'crud_reserva.conflicting_reservation_stmt',
+        lambda db: db.scalar(
+            crud_reserva.conflicting_reservation_stmt(RESERVA)
+        ),
+    ),
+    (
+        'crud_tipo_usuario.get_tipo_usuario_by_name',
+        lambda db: crud_tipo_usuario.get_tipo_usuario_by_name(db, 'cliente'),
+    ),
+    (
+        'crud_tipo_usuario.get_tipo_usuario',
+        lambda db: crud_tipo_usuario.get_tipo_usuario(db, 1),
+    ),
+    (
+        'crud_tipo_usuario.get_tipo_usuarios',
+        lambda db: crud_tipo_usuario.get_tipo_usuarios(db),
+    ),
+    (
+        'crud_usuario.get_user_by_id',
+        lambda db: crud_usuario.get_user_by_id(1, db),
+    ),
+    ('crud_usuario.get_users', lambda db: crud_usuario.get_users(db)),
+    (
+        'crud_usuario.get_users_count',
+        lambda db: crud_usuario.get_users_count(db),
+    ),
+    (
+        'crud_usuario.get_user_reservas',
+        lambda db: crud_usuario.get_user_reservas(db, 1),
+    ),
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Achado:
+    """
+    Uma leitura sequencial encontrada no plano de uma consulta.
+    """
+
+    consulta: str
+    tabela: str
+    linhas: int
+    plano: str
+
+
+@contextmanager
+def capturar_consultas(db: Session) -> Iterator[list[tuple[str, object]]]:
+    """
+    Registra os comandos SQL (com os parâmetros) enviados pela sessão
+    enquanto o bloco executa.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+
+    Yields:
+        list[tuple[str, object]]: Os comandos capturados, em ordem.
+    """
+    capturadas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(COMANDOS):
+            capturadas.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, 'before_cursor_execute', registrar)
+    try:
+        yield capturadas
+    finally:
+        event.remove(engine, 'before_cursor_execute', registrar)
+
+
+def leituras_sequenciais(
+    db: Session, statement: str, parameters
+) -> list[tuple[str, str]]:
+    """
+    Roda o EXPLAIN de um comando e lista as leituras sequenciais do plano.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        statement (str): O comando SQL, como enviado ao driver.
+        parameters: Os parâmetros do comando.
+
+    Returns:
+        list[tuple[str, str]]: A tabela e a linha do plano de cada leitura.
+
+    Raises:
+        ValueError: Se o banco não for PostgreSQL nem SQLite.
+    """
+    conn = db.connection()
+    dialeto = conn.dialect.name
+    if dialeto == 'postgresql':
+        plano = conn.exec_driver_sql(
+            f'EXPLAIN (FORMAT JSON) {statement}', parameters
+        ).scalar()
+        return [
+            (no['Relation Name'], f"Seq Scan on {no['Relation Name']}")
+            for no in _nos(plano[0]['Plan'])
+            if no['Node Type'] == 'Seq Scan'
+        ]
+    if dialeto == 'sqlite':
+        linhas = conn.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {statement}', parameters
+        )
+        return [
+            (scan.group(1), detalhe)
+            for *_, detalhe in linhas
+            if (scan := SCAN_SQLITE.match(detalhe)) and 'USING' not in detalhe
+        ]
+    raise ValueError(f'Banco {dialeto} não suportado pelo consultor')
+
+
+def tamanho_das_tabelas(db: Session) -> dict[str, int]:
+    """
+    Obtém a quantidade de linhas de cada tabela.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+
+    Returns:
+        dict[str, int]: O número de linhas (estimado no PostgreSQL) por tabela.
+    """
+    if db.get_bind().dialect.name == 'postgresql':
+        return dict(
+            db.execute(
+                text(
+                    'SELECT relname, reltuples::bigint FROM pg_class '
+                    "WHERE relkind = 'r'"
+                )
+            ).all()
+        )
+    return {
+        tabela.name: db.scalar(select(func.count()).select_from(tabela))
+        for tabela in Base.metadata.sorted_tables
+    }
+
+
+def analisar(
+    db: Session,
+    min_linhas: int = MIN_LINHAS_PADRAO,
+    consultas: list[tuple[str, Callable[[Session], object]]] = CONSULTAS_CRUD,
+) -> list[Achado]:
+    """
+    Executa as consultas e aponta as leituras sequenciais em tabelas com
+    pelo menos `min_linhas` linhas.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        min_linhas (int): Tamanho mínimo da tabela para apontar a leitura.
+        consultas (list): Pares (nome, função que recebe a sessão).
+
+    Returns:
+        list[Achado]: As leituras encontradas, sem repetição, na ordem das consultas.
+    """
+    tamanhos = tamanho_das_tabelas(db)
+    achados = {}
+    for nome, consulta in consultas:
+        with capturar_consultas(db) as capturadas:
+            try:
+                resultado = consulta(db)
+                if isinstance(resultado, Iterator):
+                    for _ in resultado:
+                        pass
+            except (ObjectNotFoundException, UserNotFoundException):
+                pass
+        for statement, parameters in capturadas:
+            for tabela, plano in leituras_sequenciais(
+                db, statement, parameters
+            ):
+                linhas = tamanhos.get(tabela, 0)
+                if (
+                    linhas >= min_linhas
+                    and (nome, tabela) not in LEITURAS_ESPERADAS
+                ):
+                    achado = Achado(nome, tabela, linhas, plano)
+                    achados[achado] = None
+        db.rollback()
+    return list(achados)
+
+
+def _nos(plano: dict) -> Iterator[dict]:
+    yield plano
+    for filho in plano.get('Plans', ()):
+        yield from _nos(filho)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Aponta leituras sequenciais nas consultas dos CRUDs.'
+    )
+    parser.add_argument(
+        '--min-linhas',
+        type=int,
+        default=MIN_LINHAS_PADRAO,
+        help='tamanho mínimo da tabela para apontar a leitura',
+    )
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        achados = analisar(db, args.min_linhas)
+    for achado in achados:
+        print(
+            f'{achado.consulta}: {achado.plano} '
+            f'({achado.tabela}, {achado.linhas} linhas)'
+        )
+    if not achados:
+        print(
+            'Nenhuma leitura sequencial em tabelas com '
+            f'{args.min_linhas} linhas ou mais.'
+        )
+    return 1 if achados else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.config.config import Settings, get_settings
+
+# Limites (em milissegundos) dos buckets do histograma de espera por conexão
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class WaitHistogram:
+    """
+    Histograma acumulado do tempo gasto esperando uma conexão do pool.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS_MS):
+        self._lock = Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.soma_ms = 0.0
+        self.max_ms = 0.0
+
+    def registrar(self, espera_ms: float):
+        """
+        Contabiliza uma espera no bucket correspondente.
+        """
+        with self._lock:
+            self.counts[bisect_left(self.buckets, espera_ms)] += 1
+            self.total += 1
+            self.soma_ms += espera_ms
+            self.max_ms = max(self.max_ms, espera_ms)
+
+    def snapshot(self) -> dict:
+        """
+        Retorna uma cópia dos contadores, com os buckets rotulados como
+        `le_<limite>` (menor ou igual ao limite) e `inf`.
+        """
+        with self._lock:
+            rotulos = [f'le_{limite}' for limite in self.buckets] + ['inf']
+            return {
+                'buckets': dict(zip(rotulos, self.counts)),
+                'count': self.total,
+                'sum_ms': round(self.soma_ms, 3),
+                'max_ms': round(self.max_ms, 3),
+            }
+
+
+class WaitInstrumentedPoolMixin:
+    """
+    Mede quanto tempo cada checkout passa dentro de `_do_get`, isto é,
+    esperando uma conexão livre (ou abrindo uma nova, dentro do overflow).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = WaitHistogram()
+
+    def _do_get(self):
+        inicio = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.registrar((perf_counter() - inicio) * 1000)
+
+
+class InstrumentedQueuePool(WaitInstrumentedPoolMixin, QueuePool):
+    pass
+
+
+def get_engine_options(
+    database_url: str, settings: Settings | None = None
+) -> dict:
+    """
+    Monta os argumentos de `create_engine` a partir das configurações de
+    pool.
+
+    O SQLite mantém os pools padrão do SQLAlchemy (as opções de tamanho não se
+    aplicam a ele). Para o PostgreSQL, o `statement_timeout` é enviado na
+    conexão, via `options` do psycopg2.
+
+    Args:
+        database_url (str): A URL do banco, já com o driver que será usado.
+        settings (Settings, optional): As configurações; por padrão `get_settings()`.
+
+    Returns:
+        dict: Os argumentos nomeados para a criação do engine.
+    """
+    settings = settings or get_settings()
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite':
+        return {}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout and url.get_backend_name() == 'postgresql':
+        options['connect_args'] = {
+            'options': f'-c statement_timeout={timeout}'
+        }
+    return options
+
+
+def get_pool_stats(engine: Engine) -> dict:
+    """
+    Coleta as estatísticas atuais do pool de um engine.
+
+    Args:
+        engine (Engine): O engine.
+
+    Returns:
+        dict: Classe do pool, contadores de conexões e o histograma de espera,
+        quando o pool é instrumentado.
+    """
+    pool: Pool = engine.pool
+    stats = {'pool_class': type(pool).__name__, 'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    histogram = getattr(pool, 'wait_histogram', None)
+    if histogram is not None:
+        stats['wait_ms'] = histogram.snapshot()
+    return stats
@@ -0,0 +1,150 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Listas de parâmetros, como as de um IN expandido: (?, ?, ?), ($1, $2) ou
+# (%(id_1_1)s, %(id_1_2)s)
+PARAMETROS = re.compile(
+    r'\(\s*(?:\?|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))*\s*\)'
+)
+ESPACOS = re.compile(r'\s+')
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normaliza um comando SQL para agrupar execuções repetidas.
+
+    Os valores já chegam como parâmetros; aqui só os espaços e as listas de
+    parâmetros (que mudam de tamanho com o IN) são normalizados.
+    """
+    return PARAMETROS.sub('(...)', ESPACOS.sub(' ', statement).strip())
+
+
+class RequestQueryStats:
+    """
+    Comandos SQL executados durante uma requisição: quantidade, tempo total
+    e quantas vezes cada comando (pelo fingerprint) se repetiu.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.tempo_ms = 0.0
+        self.comandos: Counter[str] = Counter()
+
+    def registrar(self, statement: str, tempo_ms: float):
+        self.total += 1
+        self.tempo_ms += tempo_ms
+        self.comandos[fingerprint(statement)] += 1
+
+    def repetidos(self, minimo: int) -> list[tuple[str, int]]:
+        """
+        Lista os comandos executados pelo menos `minimo` vezes.
+        """
+        return [
+            (comando, vezes)
+            for comando, vezes in self.comandos.most_common()
+            if vezes >= minimo
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.tempo_ms:.3f};desc="{self.total} consultas"'
+
+
+_estatisticas: ContextVar[RequestQueryStats | None] = ContextVar(
+    'query_stats', default=None
+)
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if _estatisticas.get() is not None:
+        context._query_stats_inicio = perf_counter()
+
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    estatisticas = _estatisticas.get()
+    inicio = getattr(context, '_query_stats_inicio', None)
+    if estatisticas is not None and inicio is not None:
+        estatisticas.registrar(statement, (perf_counter() - inicio) * 1000)
+
+
+def instrument_engines():
+    """
+    Registra os eventos que medem os comandos de todos os engines. Pode ser
+    chamada mais de uma vez.
+    """
+    if not event.contains(Engine, 'before_cursor_execute', _antes):
+        event.listen(Engine, 'before_cursor_execute', _antes)
+        event.listen(Engine, 'after_cursor_execute', _depois)
+
+
+class QueryStatsMiddleware:
+    """
+    Conta os comandos SQL de cada requisição e o tempo gasto neles.
+
+    O resultado vai no header `Server-Timing` (métrica `db`) e, quando a
+    requisição passa de `QUERY_BUDGET` comandos ou repete o mesmo comando
+    `QUERY_REPETICOES_ALERTA` vezes (sinal de N+1), num aviso no log. Os
+    comandos feitos depois do início da resposta (como numa exportação em
+    streaming) entram só no log.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        instrument_engines()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or not get_settings().QUERY_STATS:
+            await self.app(scope, receive, send)
+            return
+
+        estatisticas = RequestQueryStats()
+
+        async def send_com_timing(message: Message):
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append(
+                    'Server-Timing', estatisticas.server_timing()
+                )
+            await send(message)
+
+        token = _estatisticas.set(estatisticas)
+        try:
+            await self.app(scope, receive, send_com_timing)
+        finally:
+            _estatisticas.reset(token)
+            _avisar(scope, estatisticas)
+
+
+def _avisar(scope: Scope, estatisticas: RequestQueryStats):
+    settings = get_settings()
+    # O path da rota (com os parâmetros sem valor) agrupa melhor no log
+    route = scope.get('route')
+    endpoint = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+    if estatisticas.total > settings.QUERY_BUDGET:
+        logger.warning(
+            '%s executou %d comandos SQL em %.1f ms (orçamento: %d)',
+            endpoint,
+            estatisticas.total,
+            estatisticas.tempo_ms,
+            settings.QUERY_BUDGET,
+        )
+    if settings.QUERY_REPETICOES_ALERTA:
+        for comando, vezes in estatisticas.repetidos(
+            settings.QUERY_REPETICOES_ALERTA
+        ):
+            logger.warning(
+                '%s repetiu %d vezes o mesmo comando (possível N+1): %.300s',
+                endpoint,
+                vezes,
+                comando,
+            )
@@ -0,0 +1,150 @@
+from collections.abc import Callable
+from typing import Annotated, Any
+
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import Update, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database.get_db import get_db
+
+# Chave em `Session.info` com as funções a executar depois do commit da
+# unidade de trabalho; só existe enquanto a requisição está em andamento.
+UOW = 'unit_of_work'
+
+
+def get_uow(request: Request, db: Annotated[Session, Depends(get_db)]):
+    """
+    Entrega a sessão da requisição como unidade de trabalho.
+
+    As escritas feitas com `commit_or_defer` só enviam as alterações (flush);
+    a `UnitOfWorkRoute` faz um único commit depois que o endpoint termina, ou
+    desfaz tudo se ele levantar uma exceção.
+
+    Args:
+        request (Request): A requisição.
+        db (Session): A sessão obtida via Depends(get_db).
+
+    Returns:
+        Session: A mesma sessão.
+    """
+    db.info[UOW] = []
+    request.state.uow = db
+    return db
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Rota que confirma a unidade de trabalho da requisição.
+
+    O commit acontece aqui, e não na saída da dependência, porque no FastAPI
+    o código depois do `yield` de uma dependência só roda depois que a
+    resposta já foi enviada.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def uow_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except Exception:
+                db = getattr(request.state, 'uow', None)
+                if db is not None and db.info.pop(UOW, None) is not None:
+                    await run_in_threadpool(db.rollback)
+                raise
+            db = getattr(request.state, 'uow', None)
+            if db is not None:
+                await run_in_threadpool(_commit_uow, db)
+            return response
+
+        return uow_handler
+
+
+def _commit_uow(db: Session):
+    after_commit = db.info.pop(UOW, None)
+    if after_commit is None:
+        return
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    for callback in after_commit:
+        callback()
+
+
+def commit_or_defer(db: Session, *after_commit: Callable[[], Any]):
+    """
+    Confirma a transação, ou só envia as alterações (flush) quando a sessão
+    é a unidade de trabalho de uma requisição, que confirma uma vez no fim.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        *after_commit (Callable): Funções a executar depois do commit (por
+            exemplo, invalidar caches em memória).
+    """
+    pendentes = db.info.get(UOW)
+    if pendentes is None:
+        db.commit()
+        for callback in after_commit:
+            callback()
+    else:
+        db.flush()
+        pendentes.extend(after_commit)
+
+
+def update_returning_stmt(model, obj_id: int, valores: dict) -> Update:
+    """
+    Monta um `UPDATE ... RETURNING` que atualiza uma linha pelo ID e devolve
+    a instância já com os dados novos, sem SELECT antes nem depois.
+
+    Args:
+        model: O modelo mapeado (com coluna `id`).
+        obj_id (int): O ID da linha.
+        valores (dict): As colunas a atualizar.
+
+    Returns:
+        Update: O comando, para `Session.scalar`.
+    """
+    return (
+        update(model)
+        .where(model.id == obj_id)
+        .values(**valores)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+
+
+def supports_update_returning(db) -> bool:
+    """
+    Indica se o banco aceita `UPDATE ... RETURNING` (PostgreSQL e SQLite a
+    partir do 3.35).
+    """
+    return db.get_bind().dialect.update_returning
+
+
+def update_by_id(db: Session, model, obj_id: int, valores: dict):
+    """
+    Atualiza uma linha pelo ID com um único `UPDATE ... RETURNING`.
+
+    Em bancos sem RETURNING, carrega a instância e altera os atributos.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        model: O modelo mapeado (com coluna `id`).
+        obj_id (int): O ID da linha.
+        valores (dict): As colunas a atualizar.
+
+    Returns:
+        A instância atualizada, ou None se o ID não existir.
+    """
+    if supports_update_returning(db):
+        return db.scalar(update_returning_stmt(model, obj_id, valores))
+    instancia = db.get(model, obj_id)
+    if instancia is not None:
+        for coluna, valor in valores.items():
+            setattr(instancia, coluna, valor)
+        db.flush()
+    return instancia
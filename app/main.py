@@ -1,11 +1,26 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+# administração
+from app.api.admin.admin_router import router_admin as admin_control
+
 # areas
+from app.api.area.area_catalog import area_catalog
 from app.api.area.area_router import router_area as area_control
 
 # autenticação
 from app.api.auth.auth_router import router_auth as auth_token
+from app.api.auth.identity_cache import identity_cache
+
+# preços
+from app.api.preco.preco_router import router_preco as preco_control
+from app.api.preco.pricing_cache import pricing_cache
+
+# recorrências
+from app.api.recorrencia.occurrence_cache import occurrence_cache
+from app.api.recorrencia.recorrencia_router import (
+    router_recorrencia as recorrencia_control,
+)
 
 # reservas
 from app.api.reserva.reserva_router import router_reserva as reserva_control
@@ -17,14 +32,21 @@ from app.api.tipo_usuario.tipo_usuario_router import (
 
 # usuario
 from app.api.usuario.usuario_router import router_usuario as user_control
+from app.cache.backend import close_cache_backends, get_cache_backend
+from app.database.get_db import engine
+from app.database.query_stats import QueryStatsMiddleware
+from app.utils.responses import ORJSONResponse
 
 # uvicorn app.main:app --reload  <-- inicia o servidor
+# python -m app.server  <-- produção, com vários workers (app/server.py)
 
 app = FastAPI(
     title='Reservations - API',
     description='Aplicação backend de uma API para gerenciamento de reservas de áreas.',
     summary='Aplicação desenvolvida para estudos de backend com FastAPI.',
     version='0.0.0',
+    # orjson gera o JSON das respostas bem mais rápido que o json da stdlib
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -37,6 +59,30 @@ app.add_middleware(
     allow_methods=['*'],
     allow_headers=['*'],
 )
+app.add_middleware(QueryStatsMiddleware)
+
+
+@app.on_event('startup')
+def conectar_caches():
+    backend = get_cache_backend()
+    identity_cache.conectar(backend)
+    area_catalog.conectar(backend)
+    occurrence_cache.conectar(backend)
+    pricing_cache.conectar(backend)
+
+
+@app.on_event('shutdown')
+def dispose_engine():
+    engine.dispose()
+
+
+@app.on_event('shutdown')
+def desconectar_caches():
+    identity_cache.conectar(None)
+    area_catalog.conectar(None)
+    occurrence_cache.conectar(None)
+    pricing_cache.conectar(None)
+    close_cache_backends()
 
 
 @app.get('/', tags=['Hello World'])
@@ -53,3 +99,9 @@ app.include_router(auth_token, tags=['Autenticação'])
 app.include_router(area_control, tags=['Areas'])
 
 app.include_router(reserva_control, tags=['Reservas'])
+
+app.include_router(preco_control, tags=['Preços'])
+
+app.include_router(recorrencia_control, tags=['Recorrências'])
+
+app.include_router(admin_control, tags=['Administração'])
@@ -0,0 +1,300 @@
+"""
+Servidor de produção: um processo mestre abre o socket e mantém N workers
+uvicorn, no modelo pre-fork do gunicorn com `UvicornWorker`.
+
+Uso: python -m app.server [--workers N] [--host H] [--port P] [...]
+
+- Com `SERVER_PRELOAD`, a aplicação é importada no mestre antes do fork e
+  os workers compartilham (copy-on-write) os módulos já carregados.
+- Cada worker é reciclado depois de `SERVER_MAX_REQUESTS` requisições
+  (mais um acréscimo aleatório de até `SERVER_MAX_REQUESTS_JITTER`, para
+  que não reiniciem todos juntos); o mestre sobe outro no lugar.
+- SIGTERM/SIGINT encerram com calma: os workers param de aceitar conexões,
+  terminam as requisições em andamento (até `SERVER_GRACEFUL_TIMEOUT`) e
+  fecham os pools do banco no shutdown da aplicação.
+- SIGHUP recicla os workers um a um, sem deixar de atender.
+"""
+import argparse
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass
+
+import uvicorn
+from sqlalchemy.engine import make_url
+from uvicorn.importer import import_from_string
+
+from app.config.config import get_settings
+
+APP = 'app.main:app'
+# Intervalo com que o mestre confere os workers e os sinais recebidos
+INTERVALO = 0.2
+
+
+def default_workers() -> int:
+    """
+    Um worker por CPU disponível para o processo (respeitando o affinity,
+    que é como os containers limitam as CPUs).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS
+        return os.cpu_count() or 1
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """
+    Configuração do servidor, vinda das variáveis `SERVER_*` e da linha de
+    comando.
+    """
+
+    host: str
+    port: int
+    workers: int
+    preload: bool
+    max_requests: int
+    max_requests_jitter: int
+    keep_alive: int
+    backlog: int
+    graceful_timeout: float
+
+    @classmethod
+    def from_settings(cls, **overrides) -> 'ServerConfig':
+        settings = get_settings()
+        valores = {
+            'host': settings.SERVER_HOST,
+            'port': settings.SERVER_PORT,
+            'workers': settings.SERVER_WORKERS or default_workers(),
+            'preload': settings.SERVER_PRELOAD,
+            'max_requests': settings.SERVER_MAX_REQUESTS,
+            'max_requests_jitter': settings.SERVER_MAX_REQUESTS_JITTER,
+            'keep_alive': settings.SERVER_KEEP_ALIVE,
+            'backlog': settings.SERVER_BACKLOG,
+            'graceful_timeout': settings.SERVER_GRACEFUL_TIMEOUT,
+        }
+        valores.update(
+            (chave, valor)
+            for chave, valor in overrides.items()
+            if valor is not None
+        )
+        return cls(**valores)
+
+
+def criar_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Abre o socket de escuta compartilhado pelos workers.
+    """
+    familia = socket.AF_INET6 if ':' in host else socket.AF_INET
+    # O protocolo explícito importa: o asyncio só liga TCP_NODELAY nas
+    # conexões aceitas de sockets com proto IPPROTO_TCP; sem ele, cada
+    # resposta keep-alive espera ~40 ms pelo ACK atrasado do cliente.
+    sock = socket.socket(familia, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def verificar_workers(workers: int):
+    """
+    Recusa vários workers quando a configuração só é coerente com um.
+
+    Com SQLite a trava de área (checagem de conflito e gravação das
+    reservas) vale só dentro de cada processo. O índice de intervalos e o
+    mapa de ocupação usados na checagem de conflito não recebem as
+    gravações dos outros workers e dispensariam a checagem com dados
+    defasados.
+
+    Raises:
+        SystemExit: Se a configuração exigir um único worker.
+    """
+    if workers <= 1:
+        return
+    settings = get_settings()
+    if make_url(settings.DATABASE_URL).get_backend_name() == 'sqlite':
+        raise SystemExit(
+            f'SQLite não serializa as reservas entre processos: use '
+            f'SERVER_WORKERS=1 ou PostgreSQL (pedidos: {workers} workers).'
+        )
+    for opcao in ('RESERVA_INTERVAL_INDEX', 'RESERVA_OCUPACAO_BITMAP'):
+        if getattr(settings, opcao):
+            raise SystemExit(
+                f'{opcao} só é coerente com um único worker: desative-o ou '
+                f'use SERVER_WORKERS=1 (pedidos: {workers} workers).'
+            )
+
+
+def avisar_cache_local(workers: int):
+    """
+    Avisa quando há vários workers com `CACHE_BACKEND='local'`: as
+    invalidações dos caches (usuários, áreas, recorrências, preços) não
+    chegam aos outros workers, que servem dados antigos até o TTL de cada
+    cache.
+    """
+    if workers > 1 and get_settings().CACHE_BACKEND == 'local':
+        print(
+            f'[{os.getpid()}] AVISO: {workers} workers com '
+            "CACHE_BACKEND='local'; as invalidações dos caches não chegam "
+            "aos outros workers. Use CACHE_BACKEND='mmap' ou 'redis'.",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def descartar_conexoes_herdadas():
+    """
+    Descarta, no worker recém-criado, as conexões que o pool do banco tenha
+    herdado do mestre: elas não podem ser usadas por dois processos.
+    """
+    from app.database.get_db import engine
+
+    engine.dispose(close=False)
+
+
+class Master:
+    """
+    Processo mestre: abre o socket, cria e vigia os workers e repassa a eles
+    os sinais de encerramento e recarga.
+    """
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.workers: dict[int, float] = {}
+        self._parar = False
+        self._recarregar = False
+
+    def run(self) -> int:
+        verificar_workers(self.config.workers)
+        app = import_from_string(APP) if self.config.preload else APP
+        self.sock = criar_socket(
+            self.config.host, self.config.port, self.config.backlog
+        )
+        signal.signal(signal.SIGTERM, self._sinal_parar)
+        signal.signal(signal.SIGINT, self._sinal_parar)
+        signal.signal(signal.SIGHUP, self._sinal_recarregar)
+        print(
+            f'[{os.getpid()}] Escutando em '
+            f'{self.config.host}:{self.config.port} com '
+            f'{self.config.workers} workers',
+            flush=True,
+        )
+        avisar_cache_local(self.config.workers)
+        try:
+            for _ in range(self.config.workers):
+                self._criar_worker(app)
+            while not self._parar:
+                self._recolher(app)
+                if self._recarregar:
+                    self._recarregar = False
+                    self._reciclar_todos(app)
+                time.sleep(INTERVALO)
+        finally:
+            self._encerrar()
+            self.sock.close()
+        return 0
+
+    def _sinal_parar(self, signum, frame):
+        self._parar = True
+
+    def _sinal_recarregar(self, signum, frame):
+        self._recarregar = True
+
+    def _criar_worker(self, app) -> int:
+        max_requests = self.config.max_requests
+        if max_requests:
+            max_requests += random.randint(0, self.config.max_requests_jitter)
+        pid = os.fork()
+        if pid == 0:
+            codigo = 0
+            try:
+                self._executar_worker(app, max_requests or None)
+            except BaseException:
+                codigo = 1
+                raise
+            finally:
+                os._exit(codigo)
+        self.workers[pid] = time.monotonic()
+        return pid
+
+    def _executar_worker(self, app, max_requests: int | None):
+        for sinal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sinal, signal.SIG_DFL)
+        random.seed()
+        if self.config.preload:
+            descartar_conexoes_herdadas()
+        config = uvicorn.Config(
+            app,
+            timeout_keep_alive=self.config.keep_alive,
+            backlog=self.config.backlog,
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=self.config.graceful_timeout,
+            proxy_headers=True,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def _recolher(self, app):
+        # Sobe um worker novo para cada um que saiu (reciclagem ou erro)
+        while self.workers:
+            pid, _status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            if self.workers.pop(pid, None) is not None and not self._parar:
+                self._criar_worker(app)
+
+    def _reciclar_todos(self, app):
+        for pid in list(self.workers):
+            novo = self._criar_worker(app)
+            self._terminar([pid])
+            if novo not in self.workers:
+                return
+
+    def _terminar(self, pids: list[int]):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        limite = time.monotonic() + self.config.graceful_timeout + 5
+        pendentes = set(pids)
+        while pendentes and time.monotonic() < limite:
+            for pid in list(pendentes):
+                terminado, _status = os.waitpid(pid, os.WNOHANG)
+                if terminado:
+                    pendentes.discard(pid)
+                    self.workers.pop(pid, None)
+            time.sleep(INTERVALO / 4)
+        for pid in pendentes:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.workers.pop(pid, None)
+
+    def _encerrar(self):
+        self._terminar(list(self.workers))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Servidor de produção com vários workers uvicorn.'
+    )
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument(
+        '--preload', action=argparse.BooleanOptionalAction, default=None
+    )
+    parser.add_argument('--max-requests', type=int)
+    parser.add_argument('--max-requests-jitter', type=int)
+    parser.add_argument('--keep-alive', type=int)
+    parser.add_argument('--backlog', type=int)
+    parser.add_argument('--graceful-timeout', type=float)
+    args = parser.parse_args(argv)
+    return Master(ServerConfig.from_settings(**vars(args))).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
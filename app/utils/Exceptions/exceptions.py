@@ -101,6 +101,31 @@ class Incorrect_username_or_password(HTTPException):
         )
 
 
+class HashQueueFullException(HTTPException):
+    """
+    Representa um erro quando a fila de hashing de senhas está cheia.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Servidor ocupado, tente novamente em instantes',
+            headers={'Retry-After': '1'},
+        )
+
+
+class InvalidCursorException(HTTPException):
+    """
+    Representa um erro quando o cursor de paginação informado é inválido.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Cursor de paginação inválido',
+        )
+
+
 class ObjectAlreadyExistException(Exception):
     """
     Representa um erro quando se tentar cadastrar um usuário com o mesmo username.
@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from fastapi import Request, Response
+
+
+def make_etag(*partes) -> str:
+    """
+    Monta um ETag fraco a partir do que identifica a versão da resposta
+    (versão do catálogo, ID e `updated_at` da linha ou o próprio conteúdo).
+
+    Args:
+        *partes: Os valores que mudam quando a resposta muda.
+
+    Returns:
+        str: O ETag, como `W/"<hash>"`.
+    """
+    digest = blake2b(repr(partes).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def validators(etag: str, last_modified: datetime | None = None) -> dict:
+    """
+    Monta os headers `ETag` e, se informado, `Last-Modified` (com o horário
+    em UTC, como gravado no banco).
+    """
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_conditional(request: Request) -> bool:
+    """
+    Indica se a requisição traz `If-None-Match` ou `If-Modified-Since`.
+    """
+    headers = request.headers
+    return 'if-none-match' in headers or 'if-modified-since' in headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Avalia os headers condicionais de uma leitura (GET/HEAD).
+
+    O `If-None-Match` tem precedência e é comparado de forma fraca (ignora
+    o prefixo `W/`); sem ele, o `If-Modified-Since` é comparado com
+    `last_modified` na precisão de segundos do header.
+
+    Args:
+        request (Request): A requisição.
+        etag (str): O ETag atual da resposta.
+        last_modified (datetime, optional): A última alteração, em UTC.
+
+    Returns:
+        bool: True se o cliente já tem a versão atual (resposta 304).
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        recebidos = {
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+        }
+        return etag.removeprefix('W/') in recebidos
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified is not None:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        alterado = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return alterado <= desde
+    return False
+
+
+def not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> Response | None:
+    """
+    Retorna a resposta 304 (só com os validadores) quando o cliente já tem
+    a versão atual, antes de carregar ou serializar o conteúdo.
+
+    Args:
+        request (Request): A requisição.
+        etag (str): O ETag atual da resposta.
+        last_modified (datetime, optional): A última alteração, em UTC.
+
+    Returns:
+        Response | None: A resposta 304, ou None se o conteúdo deve ser enviado.
+    """
+    if is_not_modified(request, etag, last_modified):
+        return Response(
+            status_code=304, headers=validators(etag, last_modified)
+        )
+    return None
@@ -0,0 +1,91 @@
+import base64
+import binascii
+import json
+
+from fastapi import Query, Response
+
+from app.utils.Exceptions.exceptions import InvalidCursorException
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Gera o cursor opaco que aponta para depois do registro `last_id`.
+    """
+    raw = json.dumps({'id': last_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Lê o ID contido em um cursor gerado por `encode_cursor`.
+
+    Raises:
+        InvalidCursorException: Se o cursor estiver malformado.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        last_id = json.loads(raw)['id']
+    except (
+        binascii.Error,
+        UnicodeDecodeError,
+        ValueError,
+        KeyError,
+        TypeError,
+    ) as ex:
+        raise InvalidCursorException() from ex
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorException()
+    return last_id
+
+
+class Pagination:
+    """
+    Parâmetros de paginação das rotas de listagem (usar com `Depends()`).
+
+    Com `cursor`, a página é buscada por keyset (`id > último id`), com custo
+    constante independente da profundidade. Sem ele, vale o modo antigo
+    `skip/limit`, mantido por compatibilidade.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1),
+        cursor: str | None = None,
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.after = decode_cursor(cursor) if cursor else None
+
+
+def paginate(query, id_column, skip=0, limit=100, after=None):
+    """
+    Aplica ordenação pelo ID e a paginação em uma consulta.
+
+    Args:
+        query: Um `Query` do ORM ou um `select()`.
+        id_column: A coluna de ID usada como chave de ordenação.
+        skip (int): Registros a ignorar (apenas sem cursor).
+        limit (int): Quantidade máxima de registros.
+        after (int, optional): O último ID já entregue (vindo do cursor).
+
+    Returns:
+        A consulta paginada.
+    """
+    query = query.order_by(id_column)
+    if after is not None:
+        query = query.where(id_column > after)
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def set_next_cursor(response: Response, rows: list, limit: int):
+    """
+    Publica no header `X-Next-Cursor` o cursor da próxima página, quando a
+    página atual veio cheia (pode haver mais registros).
+    """
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
@@ -0,0 +1,28 @@
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+__all__ = ['ORJSONResponse', 'PydanticResponse']
+
+
+class PydanticResponse(Response):
+    """
+    Resposta JSON de um modelo Pydantic já validado, serializado direto pelo
+    pydantic-core.
+
+    O FastAPI, ao receber o retorno de uma rota com `response_model`, valida
+    o conteúdo de novo, converte o modelo em dicts e listas e só então gera
+    o JSON. Retornando esta resposta, a rota pula essas etapas: o modelo vira
+    bytes numa única passada. O `response_model` da rota continua valendo
+    para a documentação (OpenAPI), mas não é aplicado à resposta, então o
+    modelo passado precisa ser o mesmo.
+
+    Args:
+        content (BaseModel): O modelo a ser enviado.
+    """
+
+    media_type = 'application/json'
+
+    def render(self, content: BaseModel) -> bytes:
+        # Equivale a `model_dump_json().encode()`, sem a cópia em str
+        return content.__pydantic_serializer__.to_json(content)
@@ -1,6 +1,41 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
 
-from pydantic import BaseModel
+from fastapi import Query
+from pydantic import AfterValidator, BaseModel
+
+from app.config.config import get_settings
+
+
+def _naive_utc(valor: datetime) -> datetime:
+    if valor.tzinfo is None:
+        return valor
+    return valor.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# Horário recebido pela API: valores com fuso (ex.: '2023-10-23T14:00:00Z')
+# são convertidos para UTC sem fuso, o formato gravado no banco e usado no
+# cálculo de preços e na checagem de conflitos.
+DataHora = Annotated[datetime, AfterValidator(_naive_utc)]
+# O mesmo para parâmetros de query: sem o `Query()` explícito, o FastAPI
+# descarta os validadores do Annotated
+DataHoraQuery = Annotated[DataHora, Query()]
+
+
+def valida_horario(inicio: datetime, fim: datetime):
+    """
+    Confere que o horário tem duração positiva e de no máximo
+    `HORARIO_MAX_DIAS`: o preço é calculado dia a dia, então a duração
+    limita o trabalho de cada horário recebido.
+
+    Raises:
+        ValueError: Se o horário não for válido.
+    """
+    if fim <= inicio:
+        raise ValueError('hora_fim deve ser posterior a hora_inicio')
+    maximo = get_settings().HORARIO_MAX_DIAS
+    if fim - inicio > timedelta(days=maximo):
+        raise ValueError(f'o horário não pode passar de {maximo} dias')
 
 
 class SimpleMessageSchema(BaseModel):
@@ -0,0 +1,8 @@
+from datetime import timedelta
+
+# Os dias são divididos em slots de 15 minutos, usados pelo mapa de
+# ocupação das áreas e pelas tabelas de preço compiladas.
+SLOT_MINUTOS = 15
+SLOTS_POR_DIA = 24 * 60 // SLOT_MINUTOS
+SLOT = timedelta(minutes=SLOT_MINUTOS)
+DIA = timedelta(days=1)
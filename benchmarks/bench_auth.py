@@ -0,0 +1,104 @@
+"""
+Micro-benchmark do custo de autenticação por requisição (decodificação do JWT).
+
+Compara:
+- o caminho antigo: python-jose verificando a assinatura a cada requisição e
+  chamando get_settings() duas vezes;
+- o decode_jwt atual com o cache de tokens verificados (acerto);
+- os backends jose e PyJWT sem cache (uma verificação por chamada).
+
+Uso: python benchmarks/bench_auth.py [repetições]
+"""
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+
+from jose import jwt  # noqa: E402
+
+from app.api.auth.crud_auth import decode_jwt  # noqa: E402
+from app.config.auth import (  # noqa: E402
+    build_token_claims,
+    create_access_token,
+)
+from app.config.config import get_settings  # noqa: E402
+from app.config.token_codec import (  # noqa: E402
+    JoseBackend,
+    PyJWTBackend,
+    pyjwt,
+    token_cache,
+)
+
+
+class _Usuario:
+    id = 1
+    email = 'bench@example.com'
+    token_version = 0
+
+
+def decode_jwt_antigo(token: str) -> dict:
+    # Equivalente ao decode_jwt antes do cache
+    return jwt.decode(
+        token,
+        get_settings().SECRET_KEY,
+        algorithms=get_settings().ALGORITHM,
+    )
+
+
+def medir(nome: str, fn, numero: int):
+    melhor = min(repeat(fn, number=numero, repeat=5)) / numero
+    print(f'{nome:<40} {melhor * 1e6:>10.2f} µs/req')
+    return melhor
+
+
+def main():
+    numero = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    settings = get_settings()
+    token = create_access_token(
+        data=build_token_claims(_Usuario(), [settings.ADMINISTRADOR])
+    )
+    key, algorithm = settings.SECRET_KEY, settings.ALGORITHM
+
+    print(f'{numero} decodificações por rodada, melhor de 5 rodadas\n')
+    antes = medir(
+        'antes: jose + get_settings() x2',
+        lambda: decode_jwt_antigo(token),
+        numero,
+    )
+
+    jose_backend = JoseBackend()
+    medir(
+        'jose, sem cache',
+        lambda: jose_backend.decode(token, key, algorithm),
+        numero,
+    )
+    if pyjwt is not None:
+        pyjwt_backend = PyJWTBackend()
+        medir(
+            'pyjwt, sem cache',
+            lambda: pyjwt_backend.decode(token, key, algorithm),
+            numero,
+        )
+    else:
+        print(
+            'pyjwt, sem cache: PyJWT não instalado (poetry install -E pyjwt)'
+        )
+
+    token_cache.clear()
+    decode_jwt(token)
+    depois = medir(
+        'depois: decode_jwt com cache (acerto)',
+        lambda: decode_jwt(token),
+        numero,
+    )
+
+    print(f'\nGanho do cache: {antes / depois:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Benchmark da cotação em lote (POST /reservas/cotacao).
+
+Compara, para lotes de horários candidatos:
+- o caminho antigo: um laço Python chamando define_preco_por_hora (que só
+  conhecia o preço fixo de 10 por hora);
+- um laço Python chamando TabelaPreco.calcular por horário;
+- calcular_lote, vetorizado com NumPy;
+- o endpoint inteiro (validação do corpo, consulta das áreas e serialização),
+  com o TestClient e um banco SQLite em memória.
+
+Uso: python benchmarks/bench_cotacao.py [tamanho do lote]
+"""
+import os
+import sys
+from datetime import datetime, time, timedelta
+from random import Random
+from timeit import repeat
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.api.area.area_model import Area  # noqa: E402
+from app.api.auth.principal import (  # noqa: E402
+    Principal,
+    get_current_principal,
+)
+from app.api.preco.preco_model import AreaTarifa, TarifaFaixa  # noqa: E402
+from app.api.preco.pricing import TabelaPreco  # noqa: E402
+from app.api.preco.pricing_batch import calcular_lote  # noqa: E402
+from app.config.config import get_settings  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.database.get_db import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+AREAS = 20
+
+
+def define_preco_por_hora_antigo(reservation) -> int:
+    # Equivalente ao define_preco_por_hora removido de crud_reserva
+    horas = (
+        reservation.hora_fim - reservation.hora_inicio
+    ).total_seconds() / 3600
+    if horas <= 0:
+        return 10
+    return int(horas) * 10
+
+
+def gerar_lote(tamanho: int) -> list[SimpleNamespace]:
+    rng = Random(0)
+    base = datetime(2024, 1, 1)
+    itens = []
+    for _ in range(tamanho):
+        inicio = base + timedelta(minutes=15 * rng.randrange(4 * 24 * 30))
+        itens.append(
+            SimpleNamespace(
+                area_id=rng.randrange(1, AREAS + 1),
+                hora_inicio=inicio,
+                hora_fim=inicio + timedelta(minutes=30 * rng.randrange(1, 9)),
+            )
+        )
+    return itens
+
+
+def tabela_da_area(area_id: int) -> TabelaPreco:
+    pico = SimpleNamespace(
+        dia_semana=None,
+        hora_inicio=time(18),
+        hora_fim=time(22),
+        valor_hora=10 + area_id * 3,
+    )
+    return TabelaPreco.compilar(
+        10 + area_id, [pico], fim_de_semana_percentual=120
+    )
+
+
+def preparar_endpoint() -> TestClient:
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        for area_id in range(1, AREAS + 1):
+            session.add(
+                Area(
+                    id=area_id,
+                    nome=f'Quadra {area_id}',
+                    descricao='Quadra',
+                    iluminacao='LED',
+                    tipo_piso='Sintético',
+                    covered='Sim',
+                    foto_url='',
+                )
+            )
+            session.add(
+                AreaTarifa(
+                    area_id=area_id,
+                    valor_hora=10 + area_id,
+                    valor_minimo=0,
+                    fim_de_semana_percentual=120,
+                    faixas=[
+                        TarifaFaixa(
+                            hora_inicio=time(18),
+                            hora_fim=time(22),
+                            valor_hora=10 + area_id * 3,
+                        )
+                    ],
+                )
+            )
+        session.commit()
+
+    def get_db_benchmark():
+        with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_db_benchmark
+    app.dependency_overrides[get_current_principal] = lambda: Principal(
+        id=1, email='bench@example.com', permissions=(), token_version=0
+    )
+    return TestClient(app)
+
+
+def medir(nome: str, fn, tamanho: int, numero: int = 1):
+    melhor = min(repeat(fn, number=numero, repeat=5)) / numero
+    print(
+        f'{nome:<38} {melhor * 1e3:>9.2f} ms/lote'
+        f' {tamanho / melhor:>14,.0f} horários/s'
+    )
+    return melhor
+
+
+def main():
+    tamanho = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    itens = gerar_lote(tamanho)
+    tabelas = [tabela_da_area(area_id) for area_id in range(1, AREAS + 1)]
+    idx = [item.area_id - 1 for item in itens]
+    inicios = [item.hora_inicio for item in itens]
+    fins = [item.hora_fim for item in itens]
+
+    esperado = [
+        tabelas[i].calcular(inicio, fim)
+        for i, inicio, fim in zip(idx, inicios, fins)
+    ]
+    assert calcular_lote(tabelas, idx, inicios, fins).tolist() == esperado
+
+    print(f'Lotes de {tamanho} horários em {AREAS} áreas, melhor de 5\n')
+    antes = medir(
+        'antes: laço com define_preco_por_hora',
+        lambda: [define_preco_por_hora_antigo(item) for item in itens],
+        tamanho,
+    )
+    laco = medir(
+        'laço com TabelaPreco.calcular',
+        lambda: [
+            tabelas[i].calcular(inicio, fim)
+            for i, inicio, fim in zip(idx, inicios, fins)
+        ],
+        tamanho,
+    )
+    lote = medir(
+        'calcular_lote (NumPy)',
+        lambda: calcular_lote(tabelas, idx, inicios, fins),
+        tamanho,
+    )
+
+    # O endpoint recusa lotes maiores que COTACAO_LIMITE
+    limite = min(tamanho, get_settings().COTACAO_LIMITE)
+    client = preparar_endpoint()
+    corpo = [
+        {
+            'area_id': item.area_id,
+            'hora_inicio': item.hora_inicio.isoformat(),
+            'hora_fim': item.hora_fim.isoformat(),
+        }
+        for item in itens[:limite]
+    ]
+    assert client.post('/reservas/cotacao', json=corpo).json() == {
+        'valores': esperado[:limite]
+    }
+    medir(
+        f'POST /reservas/cotacao ({limite} horários)',
+        lambda: client.post('/reservas/cotacao', json=corpo),
+        limite,
+    )
+
+    print(
+        f'\nNumPy x laço com tabelas: {laco / lote:.1f}x;'
+        f' NumPy x preço fixo antigo: {antes / lote:.1f}x'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark da serialização das respostas JSON em GET /reservas.
+
+Compara, para uma página de reservas lidas do banco:
+- o caminho antigo: `response_model` do FastAPI (valida de novo, converte o
+  modelo em dicts) e JSONResponse (json da stdlib);
+- o mesmo caminho com ORJSONResponse, a resposta padrão da aplicação;
+- PydanticResponse: validação única e JSON gerado pelo pydantic-core;
+- o endpoint inteiro (consulta, validação e serialização), com o
+  TestClient e um banco SQLite em memória.
+
+Uso: python benchmarks/bench_respostas.py [quantidade de reservas]
+"""
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+os.environ.setdefault('QUERY_STATS', 'false')
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.api.reserva.crud_reserva as crud_reserva  # noqa: E402
+from app.api.area.area_model import Area  # noqa: E402
+from app.api.reserva.reserva_model import Reservation  # noqa: E402
+from app.api.reserva.reserva_schema import ReservationList  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.database.get_db import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.responses import ORJSONResponse, PydanticResponse  # noqa: E402
+
+
+def preparar_banco(quantidade: int) -> sessionmaker:
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    base = datetime(2024, 1, 1, 8)
+    with Session() as session:
+        session.add(
+            Area(
+                id=1,
+                nome='Quadra 1',
+                descricao='Quadra',
+                iluminacao='LED',
+                tipo_piso='Sintético',
+                covered='Sim',
+                foto_url='',
+            )
+        )
+        session.add_all(
+            Reservation(
+                valor=20,
+                reserva_data=base + timedelta(hours=numero),
+                hora_inicio=base + timedelta(hours=numero),
+                hora_fim=base + timedelta(hours=numero + 1),
+                justificacao='Treino da equipe',
+                reserva_tipo='Treino',
+                status='Confirmada',
+                area_id=1,
+                usuario_id=1,
+            )
+            for numero in range(quantidade)
+        )
+        session.commit()
+    return Session
+
+
+LOOP = asyncio.new_event_loop()
+
+
+def resposta_antiga(campo, reservas, response_class):
+    # O que o FastAPI faz com o retorno de uma rota com response_model
+    conteudo = LOOP.run_until_complete(
+        serialize_response(
+            field=campo, response_content={'Reservation': reservas}
+        )
+    )
+    return response_class(conteudo).body
+
+
+def resposta_pydantic(reservas):
+    return PydanticResponse(
+        ReservationList.model_validate(
+            {'Reservation': reservas}, from_attributes=True
+        )
+    ).body
+
+
+def medir(nome: str, fn, quantidade: int, numero: int = 5):
+    melhor = min(repeat(fn, number=numero, repeat=5)) / numero
+    print(
+        f'{nome:<40} {melhor * 1e3:>9.2f} ms'
+        f' {quantidade / melhor:>14,.0f} reservas/s'
+    )
+    return melhor
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    Session = preparar_banco(quantidade)
+    with Session() as session:
+        reservas = crud_reserva.get_reservas(session, limit=quantidade)
+    campo = create_response_field('Response_read_reservas', ReservationList)
+
+    esperado = json.loads(resposta_antiga(campo, reservas, JSONResponse))
+    assert json.loads(resposta_antiga(campo, reservas, ORJSONResponse)) == (
+        esperado
+    )
+    assert json.loads(resposta_pydantic(reservas)) == esperado
+
+    print(f'Página com {quantidade} reservas, melhor de 5\n')
+    antes = medir(
+        'antes: response_model + JSONResponse',
+        lambda: resposta_antiga(campo, reservas, JSONResponse),
+        quantidade,
+    )
+    medir(
+        'response_model + ORJSONResponse',
+        lambda: resposta_antiga(campo, reservas, ORJSONResponse),
+        quantidade,
+    )
+    depois = medir(
+        'PydanticResponse (model_validate + JSON)',
+        lambda: resposta_pydantic(reservas),
+        quantidade,
+    )
+
+    def get_db_benchmark():
+        with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_db_benchmark
+    client = TestClient(app)
+    assert client.get('/reservas', params={'limit': quantidade}).json() == (
+        esperado
+    )
+    medir(
+        'GET /reservas (TestClient)',
+        lambda: client.get('/reservas', params={'limit': quantidade}),
+        quantidade,
+    )
+
+    print(f'\nPydanticResponse x caminho antigo: {antes / depois:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
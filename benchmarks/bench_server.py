@@ -0,0 +1,202 @@
+"""
+Teste de carga do servidor de produção (python -m app.server).
+
+Sobe o servidor com 1, 2, ... workers (até a quantidade de CPUs, ou a lista
+passada) num banco SQLite em arquivo e dispara requisições GET /areas/{id}
+de vários processos clientes, com conexões keep-alive. Mostra requisições
+por segundo e a eficiência em relação ao ideal (vazão por worker da
+primeira medição vezes a quantidade de workers).
+
+Os clientes disputam as CPUs com os workers: para medir o escalonamento
+de verdade, rode os clientes em outra máquina ou limite os workers a parte
+das CPUs (taskset).
+
+Uso: python benchmarks/bench_server.py [workers ...] [--duracao S]
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from app.server import default_workers  # noqa: E402
+
+CLIENTES_POR_WORKER = 4
+AREAS = 20
+
+
+def porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def preparar_banco(path: str) -> tuple[dict, str]:
+    """
+    Cria o banco com as áreas e um administrador e retorna o ambiente do
+    servidor e um token de acesso.
+    """
+    env = {
+        'DATABASE_URL': f'sqlite:///{path}',
+        'ALGORITHM': 'HS256',
+        'ACCESS_TOKEN_EXPIRE_MINUTES': '30',
+        'SECRET_KEY': 'benchmark-secret',
+        'QUERY_STATS': 'false',
+        'AREA_CATALOGO_VERSAO_TTL': '1',
+    }
+    os.environ.update(env)
+
+    import app.main  # noqa: F401 - registra todos os modelos
+    from app.api.area.area_model import Area
+    from app.api.tipo_usuario.tipo_usuario_model import TipoUser
+    from app.api.usuario.usuario_model import Usuario
+    from app.config.auth import build_token_claims, create_access_token
+    from app.database.base import Base
+    from app.database.get_db import SessionLocal, engine
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add(TipoUser(id=1, tipo='administrador'))
+        usuario = Usuario(
+            nome='bench', tipo_id=1, email='bench@example.com', senha='x'
+        )
+        db.add(usuario)
+        db.add_all(
+            Area(
+                nome=f'Area {numero}',
+                descricao='Benchmark',
+                iluminacao='LED',
+                tipo_piso='Cimento',
+                covered='Sim',
+                foto_url='http://example.com/area.png',
+            )
+            for numero in range(AREAS)
+        )
+        db.commit()
+        token = create_access_token(
+            data=build_token_claims(usuario, ['administrador']),
+            expires_delta=timedelta(hours=1),
+        )
+    engine.dispose()
+    return {**os.environ, **env}, token
+
+
+def aguardar(porta: int, limite: float = 30):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            with socket.create_connection(('127.0.0.1', porta), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('O servidor não subiu')
+
+
+def cliente(porta: int, token: str, inicio: float, fim: float, fila):
+    headers = {'Authorization': f'Bearer {token}'}
+    conexao = http.client.HTTPConnection('127.0.0.1', porta)
+    feitas = erros = 0
+    while time.time() < inicio:
+        time.sleep(0.001)
+    while time.time() < fim:
+        try:
+            conexao.request(
+                'GET', f'/areas/{feitas % AREAS + 1}', headers=headers
+            )
+            resposta = conexao.getresponse()
+            resposta.read()
+            if resposta.status == 200:
+                feitas += 1
+            else:
+                erros += 1
+        except (OSError, http.client.HTTPException):
+            erros += 1
+            conexao.close()
+            conexao = http.client.HTTPConnection('127.0.0.1', porta)
+    conexao.close()
+    fila.put((feitas, erros))
+
+
+def medir(
+    env: dict, token: str, workers: int, duracao: float
+) -> tuple[float, int]:
+    porta = porta_livre()
+    servidor = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'app.server',
+            '--host',
+            '127.0.0.1',
+            '--port',
+            str(porta),
+            '--workers',
+            str(workers),
+        ],
+        env=env,
+        cwd=RAIZ,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        aguardar(porta)
+        # Aquece os workers (import tardio, catálogo de áreas em cache)
+        fila = multiprocessing.Queue()
+        cliente(porta, token, 0, time.time() + 1, fila)
+        fila.get()
+
+        inicio = time.time() + 0.5
+        clientes = [
+            multiprocessing.Process(
+                target=cliente,
+                args=(porta, token, inicio, inicio + duracao, fila),
+            )
+            for _ in range(workers * CLIENTES_POR_WORKER)
+        ]
+        for processo in clientes:
+            processo.start()
+        resultados = [fila.get() for _ in clientes]
+        for processo in clientes:
+            processo.join()
+    finally:
+        servidor.send_signal(signal.SIGTERM)
+        servidor.wait(timeout=60)
+    feitas = sum(r[0] for r in resultados)
+    erros = sum(r[1] for r in resultados)
+    return feitas / duracao, erros
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('workers', type=int, nargs='*')
+    parser.add_argument('--duracao', type=float, default=5)
+    args = parser.parse_args()
+    cpus = default_workers()
+    lista = args.workers or sorted({1, *range(2, cpus + 1, 2), cpus})
+
+    print(f'CPUs disponíveis: {cpus}')
+    print(f'{"workers":>8} {"req/s":>10} {"eficiência":>11} {"erros":>6}')
+    with tempfile.TemporaryDirectory() as pasta:
+        env, token = preparar_banco(os.path.join(pasta, 'bench.db'))
+        base = None
+        for workers in lista:
+            vazao, erros = medir(env, token, workers, args.duracao)
+            # Vazão por worker da primeira medição, referência do ideal
+            base = base or vazao / workers
+            eficiencia = vazao / (base * workers)
+            print(
+                f'{workers:>8} {vazao:>10.0f} {eficiencia:>10.0%} {erros:>6}'
+            )
+
+
+if __name__ == '__main__':
+    main()
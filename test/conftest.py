@@ -9,16 +9,39 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 import app.config.auth as auth
+from app.api.area.area_catalog import area_catalog
 from app.api.area.area_model import Area
+from app.api.auth.identity_cache import identity_cache
+from app.api.preco.pricing_cache import pricing_cache
+from app.api.recorrencia.occurrence_cache import occurrence_cache
+from app.api.reserva.interval_index import reservation_index
+from app.api.reserva.occupancy import occupancy_bitmap
 from app.api.reserva.reserva_model import Reservation
 from app.api.tipo_usuario.tipo_usuario_model import TipoUser as tipo
 from app.api.usuario.usuario_model import Usuario as User
 from app.config.config import get_settings
+from app.config.token_codec import token_cache
 from app.database.base import Base
 from app.database.get_db import get_db as get_session
 from app.main import app
 
 
+@pytest.fixture(autouse=True)
+def limpa_caches():
+    """
+    Esvazia os caches em memória do processo ao fim de cada teste, já que
+    cada teste usa um banco de dados novo.
+    """
+    yield
+    reservation_index.limpar()
+    occurrence_cache.limpar()
+    occupancy_bitmap.limpar()
+    pricing_cache.limpar()
+    area_catalog.limpar()
+    identity_cache.clear()
+    token_cache.clear()
+
+
 @pytest.fixture
 def client(session):
     """
@@ -55,12 +78,20 @@ def session():
         # echo=True,
     )
 
-    Session = sessionmaker(bind=engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
     Base.metadata.create_all(engine)
     yield Session()
     Base.metadata.drop_all(engine)
 
 
+@pytest.fixture
+def anyio_backend():
+    """
+    Executa os testes assíncronos (marcados com pytest.mark.anyio) no asyncio.
+    """
+    return 'asyncio'
+
+
 @event.listens_for(Engine, 'connect')
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """
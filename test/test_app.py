@@ -1,5 +1,19 @@
+import logging
+import re
+from functools import partial
+from typing import Annotated
+from unittest.mock import patch
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
 
+from app.api.area.area_model import Area
+from app.config.config import get_settings
+from app.database.get_db import get_db
+from app.database.query_stats import RequestQueryStats
+from app.database.unit_of_work import UnitOfWorkRoute, commit_or_defer, get_uow
 from app.main import app
 
 # executa os teste: pytest test/test_app.py
@@ -10,3 +24,91 @@ def test_root_deve_retornar_200_e_hello_world():
     response = client.get('/')
     assert response.status_code == 200
     assert response.json() == {'Hello': 'World'}
+
+
+def test_unit_of_work_commit_unico_e_rollback(session):
+    """
+    Testa que a unidade de trabalho faz um único commit no fim da requisição
+    (com as funções pós-commit em seguida) e desfaz as escritas quando o
+    endpoint falha.
+    """
+    app_uow = FastAPI()
+    router = APIRouter(route_class=UnitOfWorkRoute)
+    pos_commit = []
+
+    @router.post('/areas/{nome}')
+    def cria_areas(
+        nome: str, falha: bool, db: Annotated[Session, Depends(get_uow)]
+    ):
+        for quadra in ('A', 'B'):
+            db.add(
+                Area(
+                    nome=f'{nome} {quadra}',
+                    descricao='Quadra',
+                    iluminacao='LED',
+                    tipo_piso='Sintético',
+                    covered='Sim',
+                    foto_url='',
+                )
+            )
+            commit_or_defer(db, partial(pos_commit.append, quadra))
+        if falha:
+            raise HTTPException(status_code=400)
+        return {}
+
+    app_uow.include_router(router)
+    app_uow.dependency_overrides[get_db] = lambda: session
+    commits = []
+    event.listen(session, 'after_commit', lambda _: commits.append(1))
+    client = TestClient(app_uow)
+
+    assert client.post('/areas/Quadra?falha=true').status_code == 400
+    assert commits == []
+    assert pos_commit == []
+    assert session.scalars(select(Area)).all() == []
+
+    assert client.post('/areas/Quadra?falha=false').status_code == 200
+    assert commits == [1]
+    assert pos_commit == ['A', 'B']
+    assert len(session.scalars(select(Area)).all()) == 2
+
+
+def test_query_stats_server_timing_e_orcamento(
+    client, userTipoAdmin, AreaUserAdmin, caplog
+):
+    """
+    Testa o header Server-Timing com os comandos SQL da requisição e o aviso
+    no log quando o orçamento de comandos é ultrapassado.
+    """
+    with patch.object(get_settings(), 'QUERY_BUDGET', 0), caplog.at_level(
+        logging.WARNING, logger='app.database.query_stats'
+    ):
+        response = client.get('/areas')
+    assert response.status_code == 200
+    assert re.fullmatch(
+        r'db;dur=[\d.]+;desc="[1-9]\d* consultas"',
+        response.headers['Server-Timing'],
+    )
+    assert 'GET /areas executou' in caplog.text
+
+
+def test_query_stats_repeticoes():
+    """
+    Testa o agrupamento de comandos repetidos pelo fingerprint, com listas
+    de parâmetros de tamanhos diferentes.
+    """
+    estatisticas = RequestQueryStats()
+    for quantidade in (1, 2, 3):
+        parametros = ', '.join(['?'] * quantidade)
+        estatisticas.registrar(
+            f'SELECT usuario.id\nFROM usuario WHERE usuario.id IN ({parametros})',
+            1.5,
+        )
+    estatisticas.registrar('SELECT areas.id FROM areas', 0.5)
+
+    assert estatisticas.total == 4
+    assert estatisticas.tempo_ms == 5.0
+    assert estatisticas.repetidos(3) == [
+        ('SELECT usuario.id FROM usuario WHERE usuario.id IN (...)', 3)
+    ]
+    assert estatisticas.repetidos(4) == []
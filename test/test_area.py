@@ -1,7 +1,13 @@
 # executa os teste: pytest test/test_area.py
+from datetime import datetime
 
+from sqlalchemy import event, update
 
+from app.api.area.area_catalog import AREAS
 from app.api.area.area_model import Area
+from app.api.area.area_schema import AreaPublic
+from app.api.recorrencia.recorrencia_model import RecurrenceRule
+from app.database.catalog_version import bump_catalog_version
 
 
 def test_estrutura_do_banco_creat_area(session, userTipoAdmin, userAdmin):
@@ -350,6 +356,148 @@ def test_update_area(client, userTipoAdmin, AreaUserAdmin, tokenadmin):
     )
 
 
+def test_update_area_uma_consulta(
+    client, session, userTipoAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que a atualização da área é feita com um único UPDATE ... RETURNING,
+    sem SELECT antes nem depois.
+    """
+    comandos = []
+
+    def registra(conn, cursor, statement, parameters, context, executemany):
+        if 'areas' in statement:
+            comandos.append(statement.split()[0])
+
+    event.listen(session.get_bind(), 'before_cursor_execute', registra)
+    try:
+        response = client.put(
+            f'/areas/{AreaUserAdmin.id}',
+            json={
+                'nome': 'Quadra de tenis',
+                'descricao': 'Quadra',
+                'iluminacao': 'LED',
+                'tipo_piso': 'Liso',
+                'covered': 'Sim',
+                'foto_url': '',
+            },
+            headers={'Authorization': f'Bearer {tokenadmin}'},
+        )
+    finally:
+        event.remove(session.get_bind(), 'before_cursor_execute', registra)
+    assert response.status_code == 200
+    assert response.json()['nome'] == 'Quadra de tenis'
+    assert comandos == ['UPDATE']
+    assert session.get(Area, AreaUserAdmin.id).nome == 'Quadra de tenis'
+
+
+def test_read_areas_catalogo_em_cache(
+    client, session, userTipoAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que a listagem de áreas é servida do catálogo em cache (só a versão
+    é conferida no banco) e que uma escrita pela API o invalida.
+    """
+    comandos = []
+
+    def registra(conn, cursor, statement, parameters, context, executemany):
+        comandos.append(' '.join(statement.split()[:4]))
+
+    event.listen(session.get_bind(), 'before_cursor_execute', registra)
+    try:
+        primeira = client.get('/areas')
+        consultas_primeira = len(comandos)
+        comandos.clear()
+        segunda = client.get('/areas?limit=1')
+    finally:
+        event.remove(session.get_bind(), 'before_cursor_execute', registra)
+    assert primeira.json() == {
+        'areas': [
+            {
+                **AreaPublic.model_validate(AreaUserAdmin).model_dump(),
+                'id': AreaUserAdmin.id,
+            }
+        ]
+    }
+    assert consultas_primeira == 2
+    assert comandos == ['SELECT catalog_versions.versao FROM catalog_versions']
+    assert segunda.json() == primeira.json()
+    assert segunda.headers['x-next-cursor']
+    assert client.get(
+        '/areas', params={'cursor': segunda.headers['x-next-cursor']}
+    ).json() == {'areas': []}
+
+    client.put(
+        f'/areas/{AreaUserAdmin.id}',
+        json={**primeira.json()['areas'][0], 'nome': 'Quadra nova'},
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    )
+    assert client.get('/areas').json()['areas'][0]['nome'] == 'Quadra nova'
+
+
+def test_read_areas_condicional(
+    client, userTipoAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa o ETag da listagem e da leitura de uma área: 304 enquanto o
+    catálogo não muda, 200 com um ETag novo depois de uma atualização.
+    """
+    auth = {'Authorization': f'Bearer {tokenadmin}'}
+    url = f'/areas/{AreaUserAdmin.id}'
+    lista = client.get('/areas')
+    area = client.get(url, headers=auth)
+    assert area.json() == lista.json()['areas'][0]
+
+    assert (
+        client.get(
+            '/areas', headers={'If-None-Match': lista.headers['etag']}
+        ).status_code
+        == 304
+    )
+    nao_modificada = client.get(
+        url, headers={**auth, 'If-None-Match': area.headers['etag']}
+    )
+    assert nao_modificada.status_code == 304
+    assert nao_modificada.content == b''
+
+    client.put(url, json={**area.json(), 'nome': 'Quadra nova'}, headers=auth)
+    response = client.get(
+        url, headers={**auth, 'If-None-Match': area.headers['etag']}
+    )
+    assert response.status_code == 200
+    assert response.json()['nome'] == 'Quadra nova'
+    assert (
+        client.get(
+            '/areas', headers={'If-None-Match': lista.headers['etag']}
+        ).status_code
+        == 200
+    )
+
+
+def test_catalogo_de_areas_detecta_escrita_de_outro_processo(
+    client, session, userTipoAdmin, AreaUserAdmin
+):
+    """
+    Testa que uma escrita feita por outro processo (que só incrementa a
+    versão no banco, sem limpar o cache deste) é percebida na leitura.
+    """
+    assert client.get('/areas').json()['areas'][0]['nome'] == (
+        AreaUserAdmin.nome
+    )
+
+    session.execute(
+        update(Area)
+        .where(Area.id == AreaUserAdmin.id)
+        .values(nome='Quadra renomeada')
+    )
+    bump_catalog_version(session, AREAS)
+    session.commit()
+
+    assert client.get('/areas').json()['areas'][0]['nome'] == (
+        'Quadra renomeada'
+    )
+
+
 def test_update_area_not_admin(
     client, userTipoClient, AreaUserAdmin, tokencliente
 ):
@@ -470,3 +618,120 @@ def test_delete_area_fail(client, userTipoAdmin, AreaUserAdmin, tokenadmin):
     )
     assert response.status_code == 404
     assert 'not found' in response.json()['detail'].lower()
+
+
+def test_area_disponibilidade(
+    client, session, userTipoAdmin, userAdmin, AreaUserAdmin, ReservaUserAdmin
+):
+    """
+    Testa o cálculo dos horários livres de uma área, descontando a reserva
+    (14h às 16h) e a ocorrência de uma regra semanal (19h às 21h).
+    """
+    session.add(
+        RecurrenceRule(
+            area_id=AreaUserAdmin.id,
+            usuario_id=userAdmin.id,
+            frequencia='WEEKLY',
+            intervalo=1,
+            inicio=datetime(2023, 10, 16, 19),
+            duracao_minutos=120,
+            excecoes=[],
+            justificacao='Treino semanal',
+            reserva_tipo='Treino',
+        )
+    )
+    session.commit()
+    params = {'inicio': '2023-10-23T12:00:00', 'fim': '2023-10-23T22:00:00'}
+
+    response = client.get(
+        f'/areas/{AreaUserAdmin.id}/disponibilidade', params=params
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        'area_id': AreaUserAdmin.id,
+        'livres': [
+            {'inicio': '2023-10-23T12:00:00', 'fim': '2023-10-23T14:00:00'},
+            {'inicio': '2023-10-23T16:00:00', 'fim': '2023-10-23T19:00:00'},
+            {'inicio': '2023-10-23T21:00:00', 'fim': '2023-10-23T22:00:00'},
+        ],
+    }
+
+    response = client.get(
+        f'/areas/{AreaUserAdmin.id}/disponibilidade',
+        params={**params, 'duracao': 90},
+    )
+    assert [livre['inicio'] for livre in response.json()['livres']] == [
+        '2023-10-23T12:00:00',
+        '2023-10-23T16:00:00',
+    ]
+
+    # Janela com fuso: convertida para UTC sem fuso
+    response = client.get(
+        f'/areas/{AreaUserAdmin.id}/disponibilidade',
+        params={'inicio': '2023-10-23T09:00:00-03:00', 'fim': params['fim']},
+    )
+    assert response.status_code == 200
+    assert response.json()['livres'][0] == {
+        'inicio': '2023-10-23T12:00:00',
+        'fim': '2023-10-23T14:00:00',
+    }
+
+
+def test_area_disponibilidade_fail(client, userTipoAdmin, AreaUserAdmin):
+    """
+    Testa a disponibilidade de uma área inexistente e de uma janela inválida.
+    """
+    params = {'inicio': '2023-10-23T12:00:00', 'fim': '2023-10-23T22:00:00'}
+    response = client.get('/areas/999/disponibilidade', params=params)
+    assert response.status_code == 404
+
+    response = client.get(
+        f'/areas/{AreaUserAdmin.id}/disponibilidade',
+        params={'inicio': params['fim'], 'fim': params['inicio']},
+    )
+    assert response.status_code == 400
+
+
+def test_read_areas_disponiveis(
+    client, session, userTipoAdmin, userAdmin, AreaUserAdmin, ReservaUserAdmin
+):
+    """
+    Testa a listagem das áreas livres em uma janela: a área com reserva
+    só aparece quando a janela não cruza a reserva.
+    """
+    quadra = Area(
+        nome='Quadra de tenis',
+        descricao='Uma quadra de tenis',
+        iluminacao='LED',
+        tipo_piso='Saibro',
+        covered='Sim',
+        foto_url='https://example.com/tenis.jpg',
+    )
+    session.add(quadra)
+    session.commit()
+
+    response = client.get(
+        '/areas/disponiveis',
+        params={'inicio': '2023-10-23T15:00:00', 'fim': '2023-10-23T17:00:00'},
+    )
+    assert response.status_code == 200
+    assert [area['id'] for area in response.json()['areas']] == [quadra.id]
+
+    response = client.get(
+        '/areas/disponiveis',
+        params={'inicio': '2023-10-23T16:00:00', 'fim': '2023-10-23T17:00:00'},
+    )
+    assert [area['id'] for area in response.json()['areas']] == [
+        AreaUserAdmin.id,
+        quadra.id,
+    ]
+
+    response = client.get(
+        '/areas/disponiveis',
+        params={
+            'inicio': '2023-10-23T15:00:00Z',
+            'fim': '2023-10-23T17:00:00Z',
+        },
+    )
+    assert response.status_code == 200
+    assert [area['id'] for area in response.json()['areas']] == [quadra.id]
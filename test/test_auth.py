@@ -1,13 +1,25 @@
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import bcrypt
 import pytest
+from dados_teste import DadosTeste_area
 from fastapi import HTTPException
 from freezegun import freeze_time
 from jose import jwt
 
 import app.config.auth as auth
-from app.api.auth.crud_auth import get_user_permissions
+from app.api.auth.crud_auth import (
+    decode_jwt,
+    get_user_and_permissions,
+    get_user_permissions,
+)
+from app.api.auth.identity_cache import UserSnapshot, identity_cache
+from app.api.auth.principal import Principal, get_current_principal
+from app.api.tipo_usuario.crud_tipo_usuario import update_tipo_usuario
+from app.api.tipo_usuario.tipo_usuario_schemas import TipoUserCreate
+from app.config.config import get_settings
+from app.config.token_codec import token_cache
 
 # executa os teste: pytest test/test_auth.py
 
@@ -284,3 +296,229 @@ def test_jwt():
 
     assert decoded['test'] == data['test']
     assert decoded['exp']
+
+
+def test_identity_cache_evita_consulta_ao_banco(
+    client, userTipoAdmin, userAdmin, tokenadmin
+):
+    """
+    Testa se, com o usuário em cache, a autenticação não consulta o banco.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.get('/admin/identity_cache', headers=headers)
+    assert response.status_code == 200
+    assert response.json()['misses'] == 1
+
+    with patch('app.api.auth.crud_auth.get_user_by_email') as mock_get:
+        response = client.get('/admin/identity_cache', headers=headers)
+    mock_get.assert_not_called()
+    assert response.json()['hits'] == 1
+    assert response.json()['size'] == 1
+
+
+def test_identity_cache_invalida_ao_trocar_tipo(
+    session, userTipoAdmin, userAdmin
+):
+    """
+    Testa se alterar o tipo do usuário remove a entrada do cache.
+    """
+    identity = identity_cache.put(userAdmin, ['administrador'])
+    assert isinstance(identity.user, UserSnapshot)
+    assert identity_cache.get(userAdmin.email) is identity
+
+    update_tipo_usuario(session, 1, TipoUserCreate(id=1, tipo='gerente'))
+    assert identity_cache.get(userAdmin.email) is None
+
+    user, permissions = get_user_and_permissions(userAdmin.email, {}, session)
+    assert user.id == userAdmin.id
+    assert permissions == ['gerente']
+
+
+def test_identity_cache_invalida_ao_atualizar_senha(
+    client, session, userTipoAdmin, userAdmin, tokenadmin
+):
+    """
+    Testa se a troca de senha invalida o cache e continua funcionando com o
+    snapshot (que não carrega o hash da senha).
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    client.get('/admin/identity_cache', headers=headers)
+    assert identity_cache.get(userAdmin.email) is not None
+
+    response = client.put(
+        '/usuario/update_senha?new_password=novasenha'
+        f'&old_password={userAdmin.clear_password}',
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert identity_cache.get(userAdmin.email) is None
+
+
+def test_identity_cache_descarta_put_apos_invalidacao(
+    session, userTipoAdmin, userAdmin
+):
+    """
+    Testa se uma entrada lida antes de uma invalidação não volta ao cache.
+    """
+    geracao = identity_cache.geracao
+    identity_cache.invalidate_user(userAdmin.id)
+    identity_cache.put(userAdmin, ['administrador'], geracao)
+    assert identity_cache.get(userAdmin.email) is None
+
+
+def test_get_user_permissions_sem_lru_cache():
+    assert not hasattr(get_user_permissions, 'cache_info')
+
+
+def test_token_carrega_claims_do_principal(client, userTipoAdmin, userAdmin):
+    """
+    Testa se o token gerado no login carrega id, permissões e versão.
+    """
+    response = client.post(
+        '/token',
+        data={
+            'username': userAdmin.email,
+            'password': userAdmin.clear_password,
+        },
+    )
+    payload = decode_jwt(response.json()['access_token'])
+    assert payload['sub'] == userAdmin.email
+    assert payload['uid'] == userAdmin.id
+    assert payload['permissions'] == ['administrador']
+    assert payload['ver'] == 0
+
+
+@pytest.mark.anyio
+async def test_get_current_principal(anyio_backend):
+    token = auth.create_access_token(
+        data={
+            'sub': 'principal@example.com',
+            'uid': 42,
+            'permissions': ['cliente'],
+            'ver': 3,
+        }
+    )
+    principal = await get_current_principal(token)
+    assert principal == Principal(
+        id=42,
+        email='principal@example.com',
+        permissions=('cliente',),
+        token_version=3,
+    )
+
+
+@pytest.mark.anyio
+async def test_get_current_principal_sem_uid(anyio_backend):
+    token = auth.create_access_token(
+        data={'sub': 'principal@example.com', 'permissions': ['cliente']}
+    )
+    with pytest.raises(HTTPException) as exc:
+        await get_current_principal(token)
+    assert exc.value.status_code == 401
+
+
+def test_principal_nao_consulta_o_banco(client):
+    """
+    Testa se uma rota que usa o principal autoriza apenas com as claims do
+    token, sem carregar o usuário (que nem existe neste banco).
+    """
+    token = auth.create_access_token(
+        data={
+            'sub': 'adm.claims@example.com',
+            'uid': 99,
+            'permissions': ['administrador'],
+            'ver': 0,
+        }
+    )
+    with patch('app.api.auth.crud_auth.get_user_by_email') as mock_get:
+        response = client.post(
+            '/areas',
+            json=DadosTeste_area.area_id_adm(),
+            headers={'Authorization': f'Bearer {token}'},
+        )
+    mock_get.assert_not_called()
+    assert response.status_code == 200
+
+
+def test_token_version_invalida_tokens_apos_troca_de_senha(
+    client, userTipoAdmin, userAdmin, tokenadmin
+):
+    """
+    Testa se, após a troca de senha, o token antigo é recusado pelas rotas que
+    usam o usuário completo.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.put(
+        '/usuario/update_senha?new_password=novasenha'
+        f'&old_password={userAdmin.clear_password}',
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    response = client.post('/refresh_token', headers=headers)
+    assert response.status_code == 401
+
+
+def test_token_version_invalida_tokens_apos_atualizar_usuario(
+    client, userTipoAdmin, userAdmin, tokenadmin
+):
+    """
+    Testa se a atualização do usuário, que troca a senha, também recusa os
+    tokens emitidos antes dela.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.put(
+        f'/usuarios/{userAdmin.id}',
+        json={
+            'nome': userAdmin.nome,
+            'tipo_id': userAdmin.tipo_id,
+            'email': userAdmin.email,
+            'senha': 'novasenha',
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    response = client.post('/refresh_token', headers=headers)
+    assert response.status_code == 401
+
+
+def test_decode_jwt_usa_cache_de_tokens_verificados():
+    token = auth.create_access_token(data={'sub': 'cache@example.com'})
+    assert decode_jwt(token)['sub'] == 'cache@example.com'
+
+    with patch('app.config.token_codec.JoseBackend.decode') as mock_decode:
+        payload = decode_jwt(token)
+    mock_decode.assert_not_called()
+    assert payload['sub'] == 'cache@example.com'
+    assert token_cache.hits == 1
+
+
+def test_decode_jwt_cache_respeita_exp():
+    with freeze_time('2023-07-14 12:00:00'):
+        token = auth.create_access_token(
+            data={'sub': 'cache@example.com'}, expires_delta=timedelta(1)
+        )
+        decode_jwt(token)
+
+    with freeze_time('2023-07-15 12:00:01'):
+        with pytest.raises(HTTPException) as exc:
+            decode_jwt(token)
+    assert exc.value.status_code == 401
+
+
+def test_decode_jwt_nao_guarda_token_invalido():
+    with pytest.raises(HTTPException):
+        decode_jwt('invalid_token')
+    assert token_cache.get('invalid_token') is None
+
+
+def test_pyjwt_backend():
+    pytest.importorskip('jwt')
+    with patch.object(get_settings(), 'JWT_BACKEND', 'pyjwt'):
+        token = auth.create_access_token(data={'sub': 'pyjwt@example.com'})
+        token_cache.clear()
+        assert decode_jwt(token)['sub'] == 'pyjwt@example.com'
+    # Os tokens são compatíveis entre os backends
+    token_cache.clear()
+    assert decode_jwt(token)['sub'] == 'pyjwt@example.com'
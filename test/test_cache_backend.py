@@ -0,0 +1,413 @@
+# executa os teste: pytest test/test_cache_backend.py
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from fnmatch import fnmatch
+
+import pytest
+from sqlalchemy import event
+
+from app.api.area.area_catalog import AreaCatalogCache
+from app.api.auth.identity_cache import IdentityCache
+from app.api.preco.preco_model import AreaTarifa
+from app.api.preco.pricing_cache import PricingCache
+from app.api.recorrencia.occurrence_cache import OccurrenceCache
+from app.api.recorrencia.recorrencia_model import RecurrenceRule
+from app.cache.backend import LocalBackend
+from app.cache.redis_backend import RedisBackend, RedisError
+from app.cache.shared_memory import SharedMemoryBackend
+
+
+class FakeRedisServidor:
+    """
+    Servidor Redis em memória, compartilhado pelos clientes falsos que
+    representam cada worker.
+    """
+
+    def __init__(self):
+        self.dados = {}
+        self.assinaturas = defaultdict(list)
+
+
+class FakePubSub:
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.fila = deque()
+
+    def subscribe(self, *canais):
+        for canal in canais:
+            self.servidor.assinaturas[canal].append(self.fila)
+
+    def get_message(self, timeout=0):
+        return self.fila.popleft() if self.fila else None
+
+    def close(self):
+        for filas in self.servidor.assinaturas.values():
+            if self.fila in filas:
+                filas.remove(self.fila)
+
+
+class FakeRedis:
+    """
+    Cliente com o subconjunto da interface do redis-py usado pelo backend.
+    """
+
+    def __init__(self, servidor):
+        self.servidor = servidor
+
+    def get(self, chave):
+        valor, expira = self.servidor.dados.get(chave, (None, None))
+        if expira is not None and expira <= time.monotonic():
+            return None
+        return valor
+
+    def set(self, chave, valor, px=None):
+        expira = None if px is None else time.monotonic() + px / 1000
+        self.servidor.dados[chave] = (valor, expira)
+
+    def delete(self, *chaves):
+        for chave in chaves:
+            self.servidor.dados.pop(chave, None)
+
+    def publish(self, canal, mensagem):
+        filas = self.servidor.assinaturas[canal]
+        for fila in filas:
+            fila.append(
+                {
+                    'type': 'message',
+                    'channel': canal.encode(),
+                    'data': mensagem,
+                }
+            )
+        return len(filas)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self.servidor)
+
+    def scan_iter(self, match):
+        return [c for c in self.servidor.dados if fnmatch(c, match)]
+
+    def close(self):
+        pass
+
+
+class FakeRedisFora(FakeRedis):
+    """
+    Cliente cujo servidor caiu depois da assinatura dos canais.
+    """
+
+    def falha(self, *args, **kwargs):
+        raise RedisError('Connection refused')
+
+    get = set = delete = publish = scan_iter = falha
+
+
+class FakeRedisSubindo(FakeRedis):
+    """
+    Cliente de um servidor que recusa as assinaturas até estar `no_ar`.
+    """
+
+    def __init__(self, servidor):
+        super().__init__(servidor)
+        self.no_ar = False
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        pubsub = super().pubsub(ignore_subscribe_messages)
+        assinar = pubsub.subscribe
+
+        def subscribe(*canais):
+            if not self.no_ar:
+                raise RedisError('Connection refused')
+            assinar(*canais)
+
+        pubsub.subscribe = subscribe
+        return pubsub
+
+
+@pytest.fixture(params=['mmap', 'redis'])
+def dois_workers(request, tmp_path):
+    """
+    Dois backends apontando para o mesmo armazenamento, como dois workers.
+    """
+    if request.param == 'mmap':
+        path = str(tmp_path / 'cache')
+        backends = [
+            SharedMemoryBackend(path, slots=64, slot_bytes=4096, fila=4)
+            for _ in range(2)
+        ]
+    else:
+        servidor = FakeRedisServidor()
+        backends = [
+            RedisBackend(prefixo='teste:', client=FakeRedis(servidor))
+            for _ in range(2)
+        ]
+    yield backends
+    for backend in backends:
+        backend.close()
+
+
+def test_backend_compartilha_valores(dois_workers):
+    """
+    Testa que um valor gravado por um worker é lido pelo outro, até ser
+    removido ou expirar.
+    """
+    a, b = dois_workers
+    a.set('chave', b'valor')
+    a.set('expira', b'x', ttl=0.01)
+    assert b.get('chave') == b'valor'
+    assert b.get('nao_existe') is None
+
+    b.delete('chave')
+    time.sleep(0.02)
+    assert a.get('chave') is None
+    assert a.get('expira') is None
+
+
+def test_backend_entrega_invalidacoes_aos_outros_workers(dois_workers):
+    """
+    Testa que as mensagens chegam aos assinantes do outro worker no `poll`,
+    e não ao próprio publicador.
+    """
+    a, b = dois_workers
+    recebidas_a, recebidas_b = [], []
+    a.subscribe('areas', recebidas_a.append)
+    b.subscribe('areas', recebidas_b.append)
+    b.subscribe('identity', lambda _m: pytest.fail('canal errado'))
+
+    a.publish('areas', b'1')
+    a.publish('areas', b'2')
+    a.poll()
+    b.poll()
+    b.poll()
+
+    assert recebidas_a == []
+    assert recebidas_b == [b'1', b'2']
+
+
+def test_redis_indisponivel_nao_derruba_o_cache(caplog):
+    """
+    Testa que, com o Redis fora do ar, o backend não repassa os erros: as
+    leituras não encontram o valor, gravações e mensagens são descartadas e
+    os assinantes recebem None para descartar o que guardaram.
+    """
+    cliente = FakeRedisFora(FakeRedisServidor())
+    backend = RedisBackend(prefixo='teste:', client=cliente)
+    recebidas = []
+    backend.subscribe('areas', recebidas.append)
+    backend._pubsub.get_message = cliente.falha
+
+    backend.set('chave', b'valor')
+    assert backend.get('chave') is None
+    backend.delete('chave')
+    backend.publish('areas', b'1')
+    backend.poll()
+    backend.clear()
+
+    assert recebidas == [None]
+    assert caplog.text.count('Redis indisponível') == 6
+    backend.close()
+
+
+def test_redis_refaz_assinatura_no_poll(caplog):
+    """
+    Testa que, com o Redis recusando a assinatura na subida do worker, os
+    caches se conectam mesmo assim e a assinatura é refeita no `poll`; os
+    assinantes recebem None, pois as mensagens até ali se perderam.
+    """
+    servidor = FakeRedisServidor()
+    cliente = FakeRedisSubindo(servidor)
+    backend = RedisBackend(prefixo='teste:', client=cliente)
+    IdentityCache(maxsize=8, ttl=60).conectar(backend)
+    AreaCatalogCache(versao_ttl=60).conectar(backend)
+    recebidas = []
+    backend.subscribe('areas', recebidas.append)
+    backend.poll()
+
+    assert recebidas == []
+    assert caplog.text.count('Redis indisponível (subscribe)') == 3
+
+    cliente.no_ar = True
+    backend.poll()
+    assert recebidas == [None]
+
+    outro = RedisBackend(prefixo='teste:', client=FakeRedis(servidor))
+    outro.publish('areas', b'1')
+    backend.poll()
+    assert recebidas == [None, b'1']
+    backend.close()
+    outro.close()
+
+
+def test_shared_memory_avisa_mensagens_perdidas(tmp_path):
+    """
+    Testa que um worker que ficou para trás mais que o tamanho da fila
+    recebe None (descartar tudo), além das mensagens que ainda estão nela.
+    """
+    path = str(tmp_path / 'cache')
+    a = SharedMemoryBackend(path, slots=8, slot_bytes=64, fila=2)
+    b = SharedMemoryBackend(path, slots=8, slot_bytes=64, fila=2)
+    recebidas = []
+    b.subscribe('areas', recebidas.append)
+    for numero in range(3):
+        a.publish('areas', str(numero).encode())
+    b.poll()
+    assert recebidas == [None, b'1', b'2']
+
+    a.set('grande', bytes(65))
+    assert a.get('grande') is None
+    a.close()
+    b.close()
+
+
+def test_local_backend():
+    """
+    Testa o backend do próprio processo: LRU com TTL por item e sem
+    entrega de mensagens.
+    """
+    backend = LocalBackend(maxsize=2)
+    backend.set('a', b'1')
+    backend.set('b', b'2', ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get('a') == b'1'
+    assert backend.get('b') is None
+    backend.subscribe('areas', lambda _m: pytest.fail('sem outros workers'))
+    backend.publish('areas', b'')
+    backend.poll()
+
+
+def test_identity_cache_invalida_nos_outros_workers(
+    dois_workers, session, userTipoAdmin, userAdmin
+):
+    """
+    Testa que alterar um usuário (ou o tipo dele) num worker remove a
+    identidade em cache no outro.
+    """
+    caches = [IdentityCache(maxsize=8, ttl=60) for _ in dois_workers]
+    for cache, backend in zip(caches, dois_workers):
+        cache.conectar(backend)
+        cache.put(userAdmin, ['administrador'])
+
+    caches[0].invalidate_user(userAdmin.id)
+    assert caches[1].get(userAdmin.email) is None
+
+    caches[1].put(userAdmin, ['administrador'])
+    caches[0].invalidate_tipo(userAdmin.tipo_id)
+    assert caches[1].get(userAdmin.email) is None
+
+
+def test_catalogo_de_areas_compartilhado(dois_workers, session, AreaUserAdmin):
+    """
+    Testa que a versão do catálogo carregada por um worker é reaproveitada
+    pelo outro sem consultar as áreas, e que `invalidar` descarta a cópia
+    do outro worker.
+    """
+    caches = [AreaCatalogCache(versao_ttl=60) for _ in dois_workers]
+    for cache, backend in zip(caches, dois_workers):
+        cache.conectar(backend)
+    assert caches[0].catalogo(session).ids == (AreaUserAdmin.id,)
+
+    consultas = []
+
+    def registra(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(session.get_bind(), 'before_cursor_execute', registra)
+    try:
+        catalogo = caches[1].catalogo(session)
+    finally:
+        event.remove(session.get_bind(), 'before_cursor_execute', registra)
+    assert catalogo.area(AreaUserAdmin.id).nome == AreaUserAdmin.nome
+    assert not any('FROM areas' in consulta for consulta in consultas)
+
+    geracao = caches[1].geracao
+    caches[0].invalidar()
+    caches[1].catalogo(session)
+    assert caches[1].geracao == geracao + 1
+
+
+def test_recorrencias_invalidam_nos_outros_workers(
+    dois_workers, session, userTipoAdmin, userAdmin, AreaUserAdmin
+):
+    """
+    Testa que uma regra criada num worker passa a conflitar com as reservas
+    checadas no outro, que já tinha as regras da área em cache.
+    """
+    caches = [OccurrenceCache(maxsize=8, ttl=60) for _ in dois_workers]
+    for cache, backend in zip(caches, dois_workers):
+        cache.conectar(backend)
+    area_id = AreaUserAdmin.id
+    inicio, fim = datetime(2023, 10, 24, 19), datetime(2023, 10, 24, 20)
+    assert caches[1].buscar_conflito(session, area_id, inicio, fim) is None
+
+    rule = RecurrenceRule(
+        area_id=area_id,
+        usuario_id=userAdmin.id,
+        frequencia='WEEKLY',
+        intervalo=1,
+        inicio=datetime(2023, 10, 17, 19),
+        duracao_minutos=120,
+        excecoes=[],
+        justificacao='Treino semanal',
+        reserva_tipo='Treino',
+    )
+    session.add(rule)
+    session.commit()
+    caches[0].invalidar_area(area_id)
+
+    assert caches[1].buscar_conflito(session, area_id, inicio, fim) == rule.id
+
+
+def test_recarregar_area_le_regras_sem_invalidacao(
+    session, userTipoAdmin, userAdmin, AreaUserAdmin
+):
+    """
+    Testa que, com a área travada no banco, `recarregar_area` faz a checagem
+    ver uma regra gravada por outro worker antes de a invalidação chegar.
+    """
+    cache = OccurrenceCache(maxsize=8, ttl=60)
+    area_id = AreaUserAdmin.id
+    inicio, fim = datetime(2023, 10, 24, 19), datetime(2023, 10, 24, 20)
+    assert cache.buscar_conflito(session, area_id, inicio, fim) is None
+    geracao = cache.geracao
+
+    cache.recarregar_area(session, area_id)
+    assert cache.geracao == geracao
+
+    rule = RecurrenceRule(
+        area_id=area_id,
+        usuario_id=userAdmin.id,
+        frequencia='DAILY',
+        intervalo=1,
+        inicio=datetime(2023, 10, 1, 19),
+        duracao_minutos=60,
+        excecoes=[],
+        justificacao='Treino diário',
+        reserva_tipo='Treino',
+    )
+    session.add(rule)
+    session.commit()
+    assert cache.buscar_conflito(session, area_id, inicio, fim) is None
+
+    cache.recarregar_area(session, area_id)
+    assert cache.buscar_conflito(session, area_id, inicio, fim) == rule.id
+
+
+def test_precos_invalidam_nos_outros_workers(
+    dois_workers, session, AreaUserAdmin
+):
+    """
+    Testa que uma tarifa cadastrada num worker é usada pelo outro, que já
+    tinha a tabela padrão da área em cache.
+    """
+    caches = [PricingCache(maxsize=8, ttl=60) for _ in dois_workers]
+    for cache, backend in zip(caches, dois_workers):
+        cache.conectar(backend)
+    area_id = AreaUserAdmin.id
+    inicio, fim = datetime(2023, 10, 23, 14), datetime(2023, 10, 23, 16)
+    assert caches[1].tabela(session, area_id).calcular(inicio, fim) == 20
+
+    session.add(AreaTarifa(area_id=area_id, valor_hora=50))
+    session.commit()
+    caches[0].invalidar_area(area_id)
+
+    assert caches[1].tabela(session, area_id).calcular(inicio, fim) == 100
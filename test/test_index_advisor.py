@@ -0,0 +1,48 @@
+# executa os teste: pytest test/test_index_advisor.py
+from sqlalchemy import select
+
+from app.api.area.area_model import Area
+from app.database.index_advisor import Achado, analisar
+
+
+def test_index_advisor_consultas_crud_usam_indices(
+    session, userTipoClient, userCliente
+):
+    """
+    Testa que nenhuma consulta dos CRUDs lê uma tabela inteira (fora as
+    listagens paginadas) com os índices declarados nos modelos.
+    """
+    assert analisar(session, min_linhas=0) == []
+
+
+def test_index_advisor_aponta_leitura_sequencial(session):
+    """
+    Testa que uma consulta por coluna sem índice é apontada quando a tabela
+    tem o tamanho mínimo informado.
+    """
+    for numero in range(3):
+        session.add(
+            Area(
+                nome=f'Quadra {numero}',
+                descricao='Quadra',
+                iluminacao='LED',
+                tipo_piso='Sintético',
+                covered='Sim',
+                foto_url='',
+            )
+        )
+    session.commit()
+    consultas = [
+        (
+            'por_descricao',
+            lambda db: db.scalars(
+                select(Area).where(Area.descricao == 'Quadra')
+            ).all(),
+        ),
+        ('por_id', lambda db: db.get(Area, 1)),
+    ]
+
+    assert analisar(session, min_linhas=3, consultas=consultas) == [
+        Achado('por_descricao', 'areas', 3, 'SCAN areas')
+    ]
+    assert analisar(session, min_linhas=4, consultas=consultas) == []
@@ -1,4 +1,18 @@
-from app.config.auth import get_password_hash, verify_password
+from unittest.mock import patch
+
+import pytest
+
+from app.config.auth import (
+    get_password_hash,
+    get_password_hash_async,
+    get_password_hash_pooled,
+    verify_password,
+    verify_password_async,
+    verify_password_pooled,
+)
+from app.config.config import get_settings
+from app.config.hashing import hash_executor, hash_password, needs_rehash
+from app.utils.Exceptions.exceptions import HashQueueFullException
 
 # executa os teste: pytest test/test_passcrypt.py
 
@@ -8,3 +22,117 @@ def test_passcrypt():
     hashed_password = get_password_hash(clr_password)
     pass_test = verify_password(clr_password, hashed_password)
     assert pass_test
+
+
+def test_passcrypt_usa_bcrypt_rounds():
+    with patch.object(get_settings(), 'BCRYPT_ROUNDS', 4):
+        hashed_password = get_password_hash('senhaadm')
+    assert hashed_password.startswith('$2b$04$')
+
+
+def test_passcrypt_pooled():
+    hashed_password = get_password_hash_pooled('senhaadm')
+    assert verify_password_pooled('senhaadm', hashed_password)
+    assert not verify_password_pooled('outrasenha', hashed_password)
+    assert hash_executor.pendentes == 0
+
+
+@pytest.mark.anyio
+async def test_passcrypt_async():
+    hashed_password = await get_password_hash_async('senhaadm')
+    assert await verify_password_async('senhaadm', hashed_password)
+
+
+def test_hash_executor_fila_cheia():
+    with patch.object(get_settings(), 'HASH_QUEUE_LIMIT', 0):
+        with pytest.raises(HashQueueFullException):
+            get_password_hash_pooled('senhaadm')
+    assert hash_executor.pendentes == 0
+
+
+def test_token_fila_de_hash_cheia(client, userTipoAdmin, userAdmin):
+    with patch.object(get_settings(), 'HASH_QUEUE_LIMIT', 0):
+        response = client.post(
+            '/token',
+            data={
+                'username': userAdmin.email,
+                'password': userAdmin.clear_password,
+            },
+        )
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_needs_rehash_bcrypt():
+    hashed_password = hash_password('senhaadm', 4)
+    with patch.object(get_settings(), 'BCRYPT_ROUNDS', 4):
+        assert not needs_rehash(hashed_password)
+    with patch.object(get_settings(), 'BCRYPT_ROUNDS', 5):
+        assert needs_rehash(hashed_password)
+    assert needs_rehash('hash-invalido')
+
+
+def test_needs_rehash_hash_malformado():
+    assert not needs_rehash('$2b$xx$' + 'a' * 53)
+    assert not needs_rehash('$2b$$' + 'a' * 53)
+
+
+def test_needs_rehash_argon2_malformado():
+    pytest.importorskip('argon2')
+    with patch.object(get_settings(), 'PASSWORD_SCHEME', 'argon2id'):
+        assert not needs_rehash('$argon2id$v=19$m=x,t=y,p=z$abc')
+
+
+def test_token_rehash_custo_diferente(
+    client, session, userTipoAdmin, userAdmin
+):
+    assert userAdmin.senha.startswith('$2b$12$')
+    with patch.object(get_settings(), 'BCRYPT_ROUNDS', 4):
+        response = client.post(
+            '/token',
+            data={
+                'username': userAdmin.email,
+                'password': userAdmin.clear_password,
+            },
+        )
+    assert response.status_code == 200
+    session.refresh(userAdmin)
+    assert userAdmin.senha.startswith('$2b$04$')
+    assert verify_password(userAdmin.clear_password, userAdmin.senha)
+
+
+def test_token_sem_rehash_mesmo_custo(
+    client, session, userTipoAdmin, userAdmin
+):
+    senha_antiga = userAdmin.senha
+    response = client.post(
+        '/token',
+        data={
+            'username': userAdmin.email,
+            'password': userAdmin.clear_password,
+        },
+    )
+    assert response.status_code == 200
+    session.refresh(userAdmin)
+    assert userAdmin.senha == senha_antiga
+
+
+def test_token_migra_para_argon2id(client, session, userTipoAdmin, userAdmin):
+    pytest.importorskip('argon2')
+    settings = get_settings()
+    with patch.object(settings, 'PASSWORD_SCHEME', 'argon2id'), patch.object(
+        settings, 'ARGON2_MEMORY_COST', 1024
+    ):
+        for _ in range(2):
+            response = client.post(
+                '/token',
+                data={
+                    'username': userAdmin.email,
+                    'password': userAdmin.clear_password,
+                },
+            )
+            assert response.status_code == 200
+            session.refresh(userAdmin)
+            assert userAdmin.senha.startswith('$argon2id$')
+            assert 'm=1024' in userAdmin.senha
+        assert not needs_rehash(userAdmin.senha)
@@ -0,0 +1,238 @@
+# executa os teste: pytest test/test_preco.py
+from datetime import datetime, time, timedelta
+from random import Random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.api.preco.pricing import TabelaPreco
+from app.api.preco.pricing_batch import calcular_lote
+from app.config.config import get_settings
+
+
+def _faixa(inicio, fim, valor_hora, dia_semana=None):
+    return SimpleNamespace(
+        dia_semana=dia_semana,
+        hora_inicio=inicio,
+        hora_fim=fim,
+        valor_hora=valor_hora,
+    )
+
+
+def test_tabela_preco_faixas_e_fim_de_semana():
+    """
+    Testa o cálculo com faixa de pico, percentual de fim de semana, cobrança
+    por minuto e limite diário.
+    """
+    tabela = TabelaPreco.compilar(
+        10,
+        [_faixa(time(18), time(22), 30), _faixa(time(21), time(0), 20, 0)],
+        fim_de_semana_percentual=150,
+        valor_diaria=100,
+    )
+    # segunda-feira: 17h às 18h no valor padrão e 18h às 19h no pico
+    assert (
+        tabela.calcular(datetime(2023, 10, 23, 17), datetime(2023, 10, 23, 19))
+        == 40
+    )
+    # a faixa de segunda a partir das 21h foi cadastrada depois e prevalece
+    assert (
+        tabela.calcular(
+            datetime(2023, 10, 23, 20, 30), datetime(2023, 10, 23, 21, 30)
+        )
+        == 25
+    )
+    # sábado: 50% a mais
+    assert (
+        tabela.calcular(datetime(2023, 10, 28, 17), datetime(2023, 10, 28, 19))
+        == 60
+    )
+    # de segunda a quarta: cada dia é limitado pela diária
+    assert (
+        tabela.calcular(datetime(2023, 10, 23), datetime(2023, 10, 25)) == 200
+    )
+
+
+def test_tabela_preco_padrao_cobra_por_minuto():
+    """
+    Testa a tabela padrão: 10 por hora, cobrada por minuto, com mínimo de 10.
+    """
+    tabela = TabelaPreco.compilar(10, valor_minimo=10)
+    assert (
+        tabela.calcular(
+            datetime(2023, 10, 23, 14), datetime(2023, 10, 23, 15, 30)
+        )
+        == 15
+    )
+    assert (
+        tabela.calcular(
+            datetime(2023, 10, 23, 14), datetime(2023, 10, 23, 14, 30)
+        )
+        == 10
+    )
+    assert (
+        tabela.calcular(datetime(2023, 10, 23, 14), datetime(2023, 10, 23, 14))
+        == 10
+    )
+
+
+def test_tarifa_area_aplicada_na_reserva(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa o cadastro da tarifa de uma área e o seu uso no valor da reserva,
+    e a volta ao preço padrão depois que a tarifa é removida.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    reserva = {
+        'reserva_data': '2023-10-23T00:00:00',
+        'hora_inicio': '2023-10-23T17:00:00',
+        'hora_fim': '2023-10-23T19:00:00',
+        'justificacao': 'Jogo',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    # a tabela padrão fica em cache antes do cadastro da tarifa
+    response = client.post('/reservas', json=reserva, headers=headers)
+    assert response.json()['valor'] == 20
+    reserva_id = response.json()['id']
+
+    response = client.put(
+        f'/areas/{AreaUserAdmin.id}/tarifa',
+        json={
+            'valor_hora': 12,
+            'faixas': [
+                {'hora_inicio': '18:00', 'hora_fim': '22:00', 'valor_hora': 30}
+            ],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()['faixas'][0]['hora_inicio'] == '18:00:00'
+    assert client.get(f'/areas/{AreaUserAdmin.id}/tarifa').json() == (
+        response.json()
+    )
+
+    response = client.put(
+        f'/reservas/{reserva_id}', json=reserva, headers=headers
+    )
+    # 17h às 18h a 12 e 18h às 19h a 30
+    assert response.json()['valor'] == 42
+
+    response = client.delete(
+        f'/areas/{AreaUserAdmin.id}/tarifa', headers=headers
+    )
+    assert response.status_code == 200
+    response = client.put(
+        f'/reservas/{reserva_id}', json=reserva, headers=headers
+    )
+    assert response.json()['valor'] == 20
+    response = client.get(f'/areas/{AreaUserAdmin.id}/tarifa')
+    assert response.status_code == 404
+
+
+def test_calcular_lote_igual_ao_calculo_individual():
+    """
+    Testa que o cálculo vetorizado dá o mesmo valor que o cálculo por
+    horário, inclusive para horários que cruzam dias, fins de semana, o
+    limite diário e horários vazios.
+    """
+    rng = Random(42)
+    tabelas = [
+        TabelaPreco.compilar(10, valor_minimo=10),
+        TabelaPreco.compilar(
+            12,
+            [_faixa(time(18), time(22), 30), _faixa(time(6), time(8), 5, 6)],
+            fim_de_semana_percentual=135,
+            valor_diaria=150,
+        ),
+    ]
+    base = datetime(2023, 10, 20)
+    idx, inicios, fins = [], [], []
+    for _ in range(500):
+        inicio = base + timedelta(seconds=rng.randrange(14 * 24 * 3600))
+        idx.append(rng.randrange(len(tabelas)))
+        inicios.append(inicio)
+        fins.append(inicio + timedelta(seconds=rng.randrange(3 * 24 * 3600)))
+    fins[0] = inicios[0]
+
+    assert calcular_lote(tabelas, idx, inicios, fins).tolist() == [
+        tabelas[i].calcular(inicio, fim)
+        for i, inicio, fim in zip(idx, inicios, fins)
+    ]
+
+
+def test_cotacao_reservas(client, userTipoAdmin, AreaUserAdmin, tokenadmin):
+    """
+    Testa a cotação em lote: exige autenticação, os valores voltam na ordem
+    enviada, horários com fuso são cotados em UTC, e uma área inexistente ou
+    um horário sem duração recusam a cotação.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    itens = [
+        {
+            'area_id': AreaUserAdmin.id,
+            'hora_inicio': '2023-10-23T14:00:00',
+            'hora_fim': f'2023-10-23T{hora}:00:00',
+        }
+        for hora in (16, 15, 18)
+    ]
+    response = client.post('/reservas/cotacao', json=itens)
+    assert response.status_code == 401
+
+    response = client.post('/reservas/cotacao', json=itens, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {'valores': [20, 10, 40]}
+
+    com_fuso = [
+        {
+            **item,
+            'hora_inicio': '2023-10-23T11:00:00-03:00',
+            'hora_fim': item['hora_fim'] + 'Z',
+        }
+        for item in itens
+    ]
+    response = client.post('/reservas/cotacao', json=com_fuso, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {'valores': [20, 10, 40]}
+
+    response = client.post(
+        '/reservas/cotacao',
+        json=[*itens, {**itens[0], 'area_id': 999}],
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+    invertido = {**itens[0], 'hora_fim': itens[0]['hora_inicio']}
+    response = client.post(
+        '/reservas/cotacao', json=[*itens, invertido], headers=headers
+    )
+    assert response.status_code == 422
+
+    with patch.object(get_settings(), 'COTACAO_LIMITE', 2):
+        response = client.post(
+            '/reservas/cotacao', json=itens, headers=headers
+        )
+    assert response.status_code == 413
+
+
+def test_cotacao_recusa_horario_longo(
+    client, userTipoAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que a cotação recusa um horário mais longo que
+    `HORARIO_MAX_DIAS`, já que cada dia do horário é calculado.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    item = {
+        'area_id': AreaUserAdmin.id,
+        'hora_inicio': '2000-01-01T00:00:00',
+        'hora_fim': '2100-01-01T00:00:00',
+    }
+    response = client.post('/reservas/cotacao', json=[item], headers=headers)
+    assert response.status_code == 422
+
+    item['hora_fim'] = '2000-02-01T00:00:00'
+    response = client.post('/reservas/cotacao', json=[item], headers=headers)
+    assert response.status_code == 200
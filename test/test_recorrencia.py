@@ -0,0 +1,345 @@
+# executa os teste: pytest test/test_recorrencia.py
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.api.recorrencia.recurrence import Regra, fim_da_serie, ocorrencias
+
+
+def _regra(**dados):
+    padrao = {
+        'id': 1,
+        'area_id': 1,
+        'frequencia': 'WEEKLY',
+        'intervalo': 1,
+        'dias_semana': (),
+        'inicio': datetime(2023, 10, 24, 19),
+        'duracao': timedelta(hours=2),
+    }
+    return Regra(**{**padrao, **dados})
+
+
+def _dados_regra(usuario_id=1, **dados):
+    return {
+        'area_id': 1,
+        'usuario_id': usuario_id,
+        'frequencia': 'WEEKLY',
+        'inicio': '2023-10-24T19:00:00',
+        'duracao_minutos': 120,
+        'justificacao': 'Treino semanal',
+        'reserva_tipo': 'Treino',
+        **dados,
+    }
+
+
+def test_ocorrencias_semanais_com_contagem_e_excecao():
+    """
+    Testa a expansão semanal em dois dias da semana, com COUNT e EXDATE
+    (a exceção conta para o COUNT, como na RFC 5545).
+    """
+    regra = _regra(
+        dias_semana=(1, 3),
+        contagem=4,
+        excecoes=frozenset({date(2023, 10, 26)}),
+    )
+    inicios = [
+        inicio
+        for inicio, _ in ocorrencias(
+            regra, datetime(2023, 10, 1), datetime(2024, 1, 1)
+        )
+    ]
+    assert inicios == [
+        datetime(2023, 10, 24, 19),
+        datetime(2023, 10, 31, 19),
+        datetime(2023, 11, 2, 19),
+    ]
+    assert fim_da_serie(regra) == datetime(2023, 11, 2, 21)
+
+
+def test_ocorrencias_janela_distante_sem_fim():
+    """
+    Testa que uma série sem fim é expandida só na janela consultada,
+    incluindo a ocorrência que começou antes da janela e termina dentro dela.
+    """
+    regra = _regra(frequencia='DAILY', intervalo=3)
+    resultado = list(
+        ocorrencias(regra, datetime(2033, 10, 25, 20), datetime(2033, 10, 31))
+    )
+    assert fim_da_serie(regra) is None
+    assert resultado == [
+        (datetime(2033, 10, 25, 19), datetime(2033, 10, 25, 21)),
+        (datetime(2033, 10, 28, 19), datetime(2033, 10, 28, 21)),
+    ]
+
+
+def test_ocorrencias_mensais_pulam_meses_sem_o_dia():
+    """
+    Testa que a regra mensal no dia 31 pula os meses mais curtos e respeita
+    o UNTIL.
+    """
+    regra = _regra(
+        frequencia='MONTHLY',
+        inicio=datetime(2024, 1, 31, 8),
+        ate=datetime(2024, 5, 31, 8),
+    )
+    inicios = [
+        inicio
+        for inicio, _ in ocorrencias(
+            regra, datetime(2024, 1, 1), datetime(2025, 1, 1)
+        )
+    ]
+    assert inicios == [
+        datetime(2024, 1, 31, 8),
+        datetime(2024, 3, 31, 8),
+        datetime(2024, 5, 31, 8),
+    ]
+
+
+def test_fim_da_serie_com_contagem_sem_percorrer_a_serie():
+    """
+    Testa o fim de séries com COUNT calculado direto pelo período da última
+    ocorrência, limitado pelo UNTIL, e o erro quando ela passa do maior
+    horário representável.
+    """
+    semanal = _regra(dias_semana=(0, 3), contagem=5)
+    assert fim_da_serie(semanal) == datetime(2023, 11, 9, 21)
+
+    diaria = _regra(
+        frequencia='DAILY', contagem=10**9, ate=datetime(2023, 10, 25, 19)
+    )
+    assert fim_da_serie(diaria) == datetime(2023, 10, 25, 21)
+
+    mensal = _regra(
+        frequencia='MONTHLY', inicio=datetime(2024, 1, 31, 8), contagem=3
+    )
+    assert fim_da_serie(mensal) == datetime(2024, 5, 31, 10)
+
+    longa = _regra(frequencia='MONTHLY', intervalo=10**6, contagem=2)
+    with pytest.raises(OverflowError):
+        fim_da_serie(longa)
+
+
+def test_create_recorrencia_e_listar_ocorrencias(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa a criação de uma regra e a listagem das ocorrências da área.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(dias_semana=[1], ate='2023-11-30T23:59:00'),
+        headers=headers,
+    )
+    assert response.status_code == 200
+    regra = response.json()
+    assert regra['dias_semana'] == [1]
+
+    response = client.get(
+        f'/areas/{AreaUserAdmin.id}/ocorrencias',
+        params={'inicio': '2023-11-01T00:00:00', 'fim': '2023-11-15T00:00:00'},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        'ocorrencias': [
+            {
+                'regra_id': regra['id'],
+                'inicio': '2023-11-07T19:00:00',
+                'fim': '2023-11-07T21:00:00',
+            },
+            {
+                'regra_id': regra['id'],
+                'inicio': '2023-11-14T19:00:00',
+                'fim': '2023-11-14T21:00:00',
+            },
+        ]
+    }
+
+
+def test_reserva_conflita_com_ocorrencia(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que uma reserva no horário de uma ocorrência é recusada e que,
+    depois de cancelar a ocorrência do dia, a reserva é aceita.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    regra = client.post(
+        '/recorrencias', json=_dados_regra(), headers=headers
+    ).json()
+    reserva = {
+        'reserva_data': '2023-11-07T00:00:00',
+        'hora_inicio': '2023-11-07T20:00:00',
+        'hora_fim': '2023-11-07T22:00:00',
+        'justificacao': 'Jogo',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    response = client.post('/reservas', json=reserva, headers=headers)
+    assert response.status_code == 400
+    assert response.json()['detail'] == (
+        f"Regra de recorrência with ID [{regra['id']}] conflict availability"
+    )
+
+    response = client.post(
+        f"/recorrencias/{regra['id']}/excecoes",
+        params={'data': '2023-11-07'},
+        headers=headers,
+    )
+    assert response.json()['excecoes'] == ['2023-11-07']
+    response = client.post('/reservas', json=reserva, headers=headers)
+    assert response.status_code == 200
+
+
+def test_create_recorrencia_conflitos(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa que a regra é recusada se cruzar uma reserva existente ou outra
+    regra da área, mesmo que as duas séries não tenham fim.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(inicio='2023-10-16T15:00:00'),
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()['detail'] == (
+        f'Reserva with ID [{ReservaUserAdmin.id}] conflict availability'
+    )
+
+    quinzenal = client.post(
+        '/recorrencias', json=_dados_regra(intervalo=2), headers=headers
+    ).json()
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(inicio='2023-10-31T18:00:00', intervalo=2),
+        headers=headers,
+    )
+    assert response.status_code == 200
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(inicio='2024-03-12T20:00:00', intervalo=4),
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert str(quinzenal['id']) in response.json()['detail']
+
+
+def test_create_recorrencia_fail_serie_longa(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que uma contagem acima de `RECORRENCIA_HORIZONTE_DIAS`, ou uma
+    série que passa do maior horário representável, é recusada com 422.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(
+            frequencia='DAILY', ate='2023-10-25T19:00:00', contagem=10**9
+        ),
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(frequencia='DAILY', intervalo=10**7, contagem=2),
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+
+def test_create_recorrencia_horarios_com_fuso(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa que `inicio` e `ate` com fuso são convertidos para UTC sem fuso e
+    checados contra as reservas gravadas como os horários sem fuso, assim
+    como a janela da listagem de ocorrências.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(inicio='2023-10-16T15:00:00Z'),
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()['detail'] == (
+        f'Reserva with ID [{ReservaUserAdmin.id}] conflict availability'
+    )
+
+    response = client.post(
+        '/recorrencias',
+        json=_dados_regra(
+            inicio='2023-10-24T16:00:00-03:00',
+            ate='2023-11-07T16:00:00-03:00',
+        ),
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()['inicio'] == '2023-10-24T19:00:00'
+    assert response.json()['ate'] == '2023-11-07T19:00:00'
+
+    response = client.get(
+        f'/areas/{AreaUserAdmin.id}/ocorrencias',
+        params={
+            'inicio': '2023-10-24T00:00:00Z',
+            'fim': '2023-11-01T00:00:00+00:00',
+        },
+    )
+    assert response.status_code == 200
+    assert [o['inicio'] for o in response.json()['ocorrencias']] == [
+        '2023-10-24T19:00:00',
+        '2023-10-31T19:00:00',
+    ]
+
+
+def test_delete_recorrencia_sem_permissao(
+    client,
+    userTipoAdmin,
+    userTipoClient,
+    userAdmin,
+    userCliente,
+    AreaUserAdmin,
+    tokenadmin,
+    tokencliente,
+):
+    """
+    Testa que apenas o dono da regra (ou um administrador) pode removê-la.
+    """
+    regra = client.post(
+        '/recorrencias',
+        json=_dados_regra(),
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    ).json()
+    response = client.delete(
+        f"/recorrencias/{regra['id']}",
+        headers={'Authorization': f'Bearer {tokencliente}'},
+    )
+    assert response.status_code == 403
+
+    response = client.delete(
+        f"/recorrencias/{regra['id']}",
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    )
+    assert response.status_code == 200
+    response = client.get(
+        f"/recorrencias/{regra['id']}",
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    )
+    assert response.status_code == 404
@@ -1,8 +1,24 @@
 # executa os teste: pytest test/test_reserva.py
-from datetime import datetime
-from unittest.mock import patch
-
+import csv
+import io
+import json
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+import app.api.reserva.crud_reserva as crud_reserva
+from app.api.area.area_model import Area
+from app.api.reserva.interval_index import (
+    IntervalosArea,
+    ReservationIntervalIndex,
+)
+from app.api.reserva.occupancy import slots
 from app.api.reserva.reserva_model import Reservation
+from app.api.reserva.reserva_schema import ReservationCreate
+from app.config.config import get_settings
 from app.utils.Exceptions.exceptions import ObjectNotFoundException
 
 
@@ -171,6 +187,65 @@ def test_create_reserva_adm(
     assert response.json()['usuario_id'] == userAdmin.id
 
 
+def test_create_reserva_horarios_com_fuso(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que horários com fuso são aceitos e gravados em UTC sem fuso, com
+    o mesmo valor e a mesma checagem de conflito de horários sem fuso.
+    """
+    reserva_data = {
+        'reserva_data': '2023-10-23T12:00:00Z',
+        'hora_inicio': '2023-10-23T14:00:00Z',
+        'hora_fim': '2023-10-23T16:00:00Z',
+        'justificacao': 'Jogo de Equipe',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post('/reservas', json=reserva_data, headers=headers)
+    assert response.status_code == 200
+    assert response.json()['valor'] == 20
+    assert response.json()['hora_inicio'] == '2023-10-23T14:00:00'
+    assert response.json()['hora_fim'] == '2023-10-23T16:00:00'
+
+    conflito = {
+        **reserva_data,
+        'hora_inicio': '2023-10-23T12:30:00-02:00',
+        'hora_fim': '2023-10-23T13:00:00-02:00',
+    }
+    response = client.post('/reservas', json=conflito, headers=headers)
+    assert response.status_code == 400
+
+
+def test_create_reserva_fail_horario_invalido(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que uma reserva sem duração, ou mais longa que
+    `HORARIO_MAX_DIAS`, é recusada antes do cálculo do preço.
+    """
+    reserva_data = {
+        'reserva_data': '2000-01-01T00:00:00',
+        'hora_inicio': '2000-01-01T00:00:00',
+        'hora_fim': '2100-01-01T00:00:00',
+        'justificacao': 'Jogo de Equipe',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post('/reservas', json=reserva_data, headers=headers)
+    assert response.status_code == 422
+
+    reserva_data['hora_fim'] = reserva_data['hora_inicio']
+    response = client.post('/reservas', json=reserva_data, headers=headers)
+    assert response.status_code == 422
+
+
 # FIXME: Parou de funcionar por causa das mudanças no get_user_by_id para retornar um exception diretamente
 def test_create_reserva_adm_fail_usuario_nao_existe(
     client, userTipoAdmin, AreaUserAdmin, tokenadmin
@@ -465,6 +540,38 @@ def test_read_reservas(
     assert len(response.json()['Reservation']) > 0
 
 
+def test_read_reservas_serializa_com_o_schema(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+):
+    """
+    Testa que a lista de reservas, serializada direto pelo pydantic, traz
+    exatamente os campos de ReservationBase, com as datas em ISO 8601.
+    """
+    response = client.get('/reservas')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json() == {
+        'Reservation': [
+            {
+                'id': ReservaUserAdmin.id,
+                'valor': 10,
+                'reserva_data': '2023-10-23T12:00:00',
+                'hora_inicio': '2023-10-23T14:00:00',
+                'hora_fim': '2023-10-23T16:00:00',
+                'justificacao': 'Jogo de Equipe',
+                'reserva_tipo': 'Jogo',
+                'status': 'Em análise',
+                'area_id': 1,
+                'usuario_id': 1,
+            }
+        ]
+    }
+
+
 def test_read_reservas_not_found(
     client,
     userTipoAdmin,
@@ -534,6 +641,90 @@ def test_get_reserva_adm_by_id_fail_not_found(
     assert 'not found' in response.json()['detail'].lower()
 
 
+def test_get_reserva_condicional(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa que a leitura de uma reserva traz ETag e Last-Modified, responde
+    304 enquanto eles forem atuais e volta a responder 200 depois de uma
+    alteração.
+    """
+    auth = {'Authorization': f'Bearer {tokenadmin}'}
+    url = f'/reservas/{ReservaUserAdmin.id}'
+    response = client.get(url, headers=auth)
+    etag = response.headers['etag']
+    last_modified = response.headers['last-modified']
+    assert response.status_code == 200
+
+    for condicao in (
+        {'If-None-Match': etag},
+        {'If-None-Match': f'"outro", {etag}'},
+        {'If-Modified-Since': last_modified},
+    ):
+        nao_modificada = client.get(url, headers={**auth, **condicao})
+        assert nao_modificada.status_code == 304
+        assert nao_modificada.content == b''
+        assert nao_modificada.headers['etag'] == etag
+    assert (
+        client.get(
+            f'/usuario/reservas/{ReservaUserAdmin.id}',
+            headers={**auth, 'If-None-Match': etag},
+        ).status_code
+        == 304
+    )
+
+    client.put(
+        url,
+        json={
+            **{
+                k: v
+                for k, v in response.json().items()
+                if k not in ('id', 'updated_at')
+            },
+            'justificacao': 'Outra',
+        },
+        headers=auth,
+    )
+    alterada = client.get(url, headers={**auth, 'If-None-Match': etag})
+    assert alterada.status_code == 200
+    assert alterada.json()['justificacao'] == 'Outra'
+    assert alterada.headers['etag'] != etag
+
+
+def test_get_reserva_usuario_condicional_de_outro_usuario(
+    client,
+    userTipoAdmin,
+    userTipoClient,
+    userAdmin,
+    userCliente,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+    tokencliente,
+):
+    """
+    Testa que a leitura condicional da reserva de outro usuário é recusada
+    antes de responder 304.
+    """
+    etag = client.get(
+        f'/reservas/{ReservaUserAdmin.id}',
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    ).headers['etag']
+    response = client.get(
+        f'/usuario/reservas/{ReservaUserAdmin.id}',
+        headers={
+            'Authorization': f'Bearer {tokencliente}',
+            'If-None-Match': etag,
+        },
+    )
+    assert response.status_code == 403
+
+
 def test_update_reserva_adm(
     client,
     userTipoAdmin,
@@ -1086,3 +1277,627 @@ def test_get_reserva_usuario_fail_not_owner(
     )
     assert response.status_code == 403
     assert 'conflict permission' in response.json()['detail'].lower()
+
+
+def test_create_reserva_conflito_informa_id_da_reserva(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa se a mensagem de conflito traz o ID da reserva que ocupa o horário.
+    """
+    reserva_data = {
+        'reserva_data': '2023-10-23T12:00:00',
+        'hora_inicio': '2023-10-23T15:00:00',
+        'hora_fim': '2023-10-23T17:00:00',
+        'justificacao': 'Jogo de Equipe',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    response = client.post(
+        '/reservas',
+        json=reserva_data,
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    )
+    assert response.status_code == 400
+    assert f'[{ReservaUserAdmin.id}]' in response.json()['detail']
+
+
+def test_intervalos_area_busca_conflito():
+    """
+    Testa a busca de conflitos no índice de intervalos, inclusive com
+    intervalos sobrepostos e após remoções.
+    """
+    intervalos = IntervalosArea()
+    intervalos.adicionar(
+        datetime(2023, 10, 23, 8), datetime(2023, 10, 23, 18), 1
+    )
+    intervalos.adicionar(
+        datetime(2023, 10, 23, 9), datetime(2023, 10, 23, 10), 2
+    )
+    intervalos.adicionar(
+        datetime(2023, 10, 23, 20), datetime(2023, 10, 23, 21), 3
+    )
+
+    assert (
+        intervalos.buscar_conflito(
+            datetime(2023, 10, 23, 17), datetime(2023, 10, 23, 19)
+        )
+        == 1
+    )
+    assert (
+        intervalos.buscar_conflito(
+            datetime(2023, 10, 23, 18), datetime(2023, 10, 23, 20)
+        )
+        is None
+    )
+
+    assert intervalos.remover(datetime(2023, 10, 23, 8), 1)
+    assert (
+        intervalos.buscar_conflito(
+            datetime(2023, 10, 23, 17), datetime(2023, 10, 23, 19)
+        )
+        is None
+    )
+    assert (
+        intervalos.buscar_conflito(
+            datetime(2023, 10, 23, 9, 30), datetime(2023, 10, 23, 11)
+        )
+        == 2
+    )
+    assert not intervalos.remover(datetime(2023, 10, 23, 8), 1)
+
+
+def test_create_reserva_com_interval_index(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa a checagem de conflitos usando o índice de intervalos em memória,
+    aquecido a partir do banco e mantido na criação e remoção de reservas.
+    """
+    reserva_data = {
+        'reserva_data': '2023-10-23T12:00:00',
+        'hora_inicio': '2023-10-23T16:00:00',
+        'hora_fim': '2023-10-23T18:00:00',
+        'justificacao': 'Jogo de Equipe',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    with patch.object(get_settings(), 'RESERVA_INTERVAL_INDEX', True):
+        response = client.post('/reservas', json=reserva_data, headers=headers)
+        assert response.status_code == 200
+        nova_reserva_id = response.json()['id']
+
+        conflito = {
+            **reserva_data,
+            'hora_inicio': '2023-10-23T15:00:00',
+            'hora_fim': '2023-10-23T15:30:00',
+        }
+        response = client.post('/reservas', json=conflito, headers=headers)
+        assert response.status_code == 400
+        assert f'[{ReservaUserAdmin.id}]' in response.json()['detail']
+
+        conflito = {**reserva_data, 'hora_inicio': '2023-10-23T17:00:00'}
+        response = client.post('/reservas', json=conflito, headers=headers)
+        assert response.status_code == 400
+        assert f'[{nova_reserva_id}]' in response.json()['detail']
+
+        client.delete(f'/reservas/{nova_reserva_id}', headers=headers)
+        response = client.post('/reservas', json=conflito, headers=headers)
+        assert response.status_code == 200
+
+
+def test_interval_index_nao_duplica_reserva_registrada_antes_do_aquecimento(
+    session, userTipoAdmin, userAdmin, AreaUserAdmin, ReservaUserAdmin
+):
+    """
+    Testa que uma reserva registrada antes do aquecimento não fica duplicada
+    no índice: depois de removida, não sobra intervalo gerando conflito.
+    """
+    indice = ReservationIntervalIndex()
+    indice.adicionar(ReservaUserAdmin)
+    indice.aquecer(session)
+    indice.remover(ReservaUserAdmin.id)
+    assert (
+        indice.buscar_conflito(
+            ReservaUserAdmin.area_id,
+            ReservaUserAdmin.reserva_data,
+            ReservaUserAdmin.hora_inicio,
+            ReservaUserAdmin.hora_fim,
+        )
+        is None
+    )
+
+
+def test_update_reserva_fail_hora_indisponivel(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa se a atualização de uma reserva para um horário ocupado por outra
+    reserva é rejeitada, enquanto manter o próprio horário é permitido.
+    """
+    reserva_data = {
+        'reserva_data': '2023-10-23T12:00:00',
+        'hora_inicio': '2023-10-23T17:00:00',
+        'hora_fim': '2023-10-23T18:00:00',
+        'justificacao': 'Jogo de Equipe',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.post('/reservas', json=reserva_data, headers=headers)
+    assert response.status_code == 200
+    nova_reserva_id = response.json()['id']
+
+    conflito = {**reserva_data, 'hora_inicio': '2023-10-23T15:00:00'}
+    response = client.put(
+        f'/reservas/{nova_reserva_id}', json=conflito, headers=headers
+    )
+    assert response.status_code == 400
+    assert f'[{ReservaUserAdmin.id}]' in response.json()['detail']
+
+    mesmo_horario = {**reserva_data, 'justificacao': 'Treino'}
+    response = client.put(
+        f'/reservas/{nova_reserva_id}', json=mesmo_horario, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()['justificacao'] == 'Treino'
+
+
+def test_create_reserva_violacao_exclusion_constraint(
+    session, userTipoAdmin, userAdmin, AreaUserAdmin, ReservaUserAdmin
+):
+    """
+    Testa se a violação da exclusion constraint do PostgreSQL no INSERT vira
+    um conflito de reserva, sem a consulta prévia de conflito.
+    """
+    reserva = ReservationCreate(
+        reserva_data=datetime(2023, 10, 23, 12),
+        hora_inicio=datetime(2023, 10, 23, 15),
+        hora_fim=datetime(2023, 10, 23, 17),
+        justificacao='Jogo de Equipe',
+        reserva_tipo='Jogo',
+        status='Em análise',
+        area_id=AreaUserAdmin.id,
+        usuario_id=userAdmin.id,
+    )
+    violacao = IntegrityError(
+        'INSERT INTO reservations', {}, MagicMock(pgcode='23P01')
+    )
+    with patch(
+        'app.api.reserva.crud_reserva.uses_exclusion_constraint',
+        return_value=True,
+    ), patch(
+        'app.api.reserva.crud_reserva.check_reservation_conflict'
+    ) as mock_check, patch.object(
+        session, 'commit', side_effect=violacao
+    ):
+        with pytest.raises(HTTPException) as ex:
+            crud_reserva.create_reservation(session, reserva)
+
+    mock_check.assert_not_called()
+    assert ex.value.status_code == 400
+    assert f'[{ReservaUserAdmin.id}]' in ex.value.detail
+
+
+def test_read_reservas_paginacao_por_cursor(
+    client,
+    userTipoAdmin,
+    userTipoClient,
+    userAdmin,
+    userCliente,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    ReservaUserCliente,
+):
+    """
+    Testa a paginação por cursor de '/reservas'.
+    """
+    response = client.get('/reservas', params={'limit': 1})
+    assert response.status_code == 200
+    assert [r['id'] for r in response.json()['Reservation']] == [
+        ReservaUserAdmin.id
+    ]
+
+    response = client.get(
+        '/reservas',
+        params={'limit': 1, 'cursor': response.headers['X-Next-Cursor']},
+    )
+    assert [r['id'] for r in response.json()['Reservation']] == [
+        ReservaUserCliente.id
+    ]
+
+
+def test_export_reservas_ndjson(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    ReservaUserCliente,
+    tokenadmin,
+):
+    """
+    Testa a exportação em NDJSON, lida em lotes menores que o total.
+    """
+    with patch.object(get_settings(), 'EXPORT_BATCH_SIZE', 1):
+        response = client.get(
+            '/reservas/export',
+            headers={'Authorization': f'Bearer {tokenadmin}'},
+        )
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert [linha['id'] for linha in linhas] == [
+        ReservaUserAdmin.id,
+        ReservaUserCliente.id,
+    ]
+    assert linhas[0]['hora_inicio'] == '2023-10-23T14:00:00'
+    assert linhas[0]['justificacao'] == ReservaUserAdmin.justificacao
+
+
+def test_export_reservas_csv_por_periodo(
+    client,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa a exportação em CSV filtrando o período por `reserva_data`.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    response = client.get(
+        '/reservas/export',
+        params={
+            'formato': 'csv',
+            'data_inicio': '2023-10-23',
+            'data_fim': '2023-10-23',
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+    linhas = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(linhas) == 1
+    assert linhas[0]['id'] == str(ReservaUserAdmin.id)
+    assert linhas[0]['status'] == 'Em análise'
+
+    response = client.get(
+        '/reservas/export',
+        params={'formato': 'csv', 'data_inicio': '2023-10-24'},
+        headers=headers,
+    )
+    assert response.text.splitlines() == [
+        'id,valor,reserva_data,hora_inicio,hora_fim,justificacao,'
+        'reserva_tipo,status,area_id,usuario_id'
+    ]
+
+
+def test_export_reservas_sem_permissao(
+    client, userTipoClient, userCliente, tokencliente
+):
+    """
+    Testa que apenas administradores podem exportar as reservas.
+    """
+    response = client.get(
+        '/reservas/export',
+        headers={'Authorization': f'Bearer {tokencliente}'},
+    )
+    assert response.status_code == 403
+
+
+def _reserva_bulk(hora_inicio, hora_fim, area_id=1, usuario_id=1):
+    return {
+        'reserva_data': '2023-10-23T12:00:00',
+        'hora_inicio': f'2023-10-23T{hora_inicio}:00',
+        'hora_fim': f'2023-10-23T{hora_fim}:00',
+        'justificacao': 'Treino semanal',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': area_id,
+        'usuario_id': usuario_id,
+    }
+
+
+def test_create_reservas_bulk(
+    client,
+    session,
+    userTipoAdmin,
+    userAdmin,
+    AreaUserAdmin,
+    ReservaUserAdmin,
+    tokenadmin,
+):
+    """
+    Testa a criação em lote: reservas válidas são gravadas e as demais são
+    informadas com o motivo (área inexistente, conflito com o banco e
+    conflito com outra reserva do próprio lote).
+    """
+    lote = [
+        _reserva_bulk('08:00', '10:00'),
+        _reserva_bulk('09:00', '11:00'),
+        _reserva_bulk('15:00', '17:00'),
+        _reserva_bulk('08:00', '10:00', area_id=999),
+        _reserva_bulk('10:00', '12:00'),
+    ]
+    response = client.post(
+        '/reservas/bulk',
+        json=lote,
+        headers={'Authorization': f'Bearer {tokenadmin}'},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data['criadas'] == 2
+    resultados = data['resultados']
+    assert [r['status'] for r in resultados] == [
+        'criada',
+        'conflito',
+        'conflito',
+        'nao_encontrado',
+        'criada',
+    ]
+    assert resultados[1]['conflito_indice'] == 0
+    assert resultados[2]['conflito_id'] == ReservaUserAdmin.id
+    assert resultados[3]['detail'] == 'Area with ID [999] not found'
+
+    criadas = session.get(Reservation, resultados[4]['id'])
+    assert criadas.valor == 20
+    assert criadas.status == 'Em análise'
+    assert session.query(Reservation).count() == 3
+
+
+def test_create_reservas_bulk_sem_permissao(
+    client,
+    userTipoAdmin,
+    userTipoClient,
+    userAdmin,
+    userCliente,
+    AreaUserAdmin,
+    tokencliente,
+):
+    """
+    Testa que um cliente só cria, no lote, as reservas em seu próprio nome,
+    e que os índices informados são os do lote enviado.
+    """
+    response = client.post(
+        '/reservas/bulk',
+        json=[
+            _reserva_bulk('10:00', '11:00', usuario_id=userAdmin.id),
+            _reserva_bulk('08:00', '09:00', usuario_id=userCliente.id),
+            _reserva_bulk('08:30', '09:30', usuario_id=userCliente.id),
+        ],
+        headers={'Authorization': f'Bearer {tokencliente}'},
+    )
+    assert response.status_code == 200
+    resultados = response.json()['resultados']
+    assert [r['status'] for r in resultados] == [
+        'sem_permissao',
+        'criada',
+        'conflito',
+    ]
+    assert [r['indice'] for r in resultados] == [0, 1, 2]
+    assert resultados[2]['conflito_indice'] == 1
+    assert '#1' in resultados[2]['detail']
+
+
+def test_create_reservas_bulk_limite(client, userTipoAdmin, tokenadmin):
+    """
+    Testa que lotes acima de `RESERVA_BULK_LIMIT` são recusados.
+    """
+    with patch.object(get_settings(), 'RESERVA_BULK_LIMIT', 1):
+        response = client.post(
+            '/reservas/bulk',
+            json=[_reserva_bulk('08:00', '09:00')] * 2,
+            headers={'Authorization': f'Bearer {tokenadmin}'},
+        )
+    assert response.status_code == 413
+
+
+def test_occupancy_slots():
+    """
+    Testa a divisão de um horário em slots de 15 minutos: slots parciais
+    contam como ocupados e o horário que passa da meia-noite é dividido.
+    """
+    assert list(
+        slots(datetime(2023, 10, 23, 14, 10), datetime(2023, 10, 23, 15))
+    ) == [(date(2023, 10, 23), 56, 60)]
+    assert list(
+        slots(datetime(2023, 10, 23, 23, 30), datetime(2023, 10, 24, 0, 20))
+    ) == [(date(2023, 10, 23), 94, 96), (date(2023, 10, 24), 0, 2)]
+
+
+def test_reserva_ocupacao_bitmap(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que o mapa de ocupação acompanha criação, atualização e remoção de
+    reservas, e que ele dispensa a consulta de conflito quando os slots
+    estão livres.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    reserva = {
+        'reserva_data': '2023-10-23T00:00:00',
+        'hora_inicio': '2023-10-23T14:00:00',
+        'hora_fim': '2023-10-23T15:00:00',
+        'justificacao': 'Jogo',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+
+    def ocupacao():
+        response = client.get('/areas/ocupacao', params={'dia': '2023-10-23'})
+        assert response.status_code == 200
+        (area,) = response.json()['areas']
+        return area['ocupacao']
+
+    with patch.object(get_settings(), 'RESERVA_OCUPACAO_BITMAP', True):
+        assert ocupacao() == '0' * 96
+        reserva_id = client.post(
+            '/reservas', json=reserva, headers=headers
+        ).json()['id']
+        assert ocupacao() == '0' * 56 + '1' * 4 + '0' * 36
+
+        response = client.post('/reservas', json=reserva, headers=headers)
+        assert response.status_code == 400
+
+        client.put(
+            f'/reservas/{reserva_id}',
+            json={
+                **reserva,
+                'hora_inicio': '2023-10-23T08:00:00',
+                'hora_fim': '2023-10-23T08:30:00',
+            },
+            headers=headers,
+        )
+        assert ocupacao() == '0' * 32 + '11' + '0' * 62
+
+        with patch.object(
+            crud_reserva, 'get_conflicting_reservation_id'
+        ) as consulta:
+            response = client.post('/reservas', json=reserva, headers=headers)
+        assert response.status_code == 200
+        consulta.assert_not_called()
+
+        client.delete(f'/reservas/{reserva_id}', headers=headers)
+        assert ocupacao() == '0' * 56 + '1' * 4 + '0' * 36
+
+
+def test_reserva_ocupacao_bitmap_atualizado_sob_o_lock_da_area(
+    client, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que o mapa de ocupação recebe a nova reserva antes de o lock da
+    área ser liberado, para que outra requisição do mesmo horário não passe
+    pela checagem nesse intervalo.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    reserva = {
+        'reserva_data': '2023-10-23T00:00:00',
+        'hora_inicio': '2023-10-23T14:00:00',
+        'hora_fim': '2023-10-23T15:00:00',
+        'justificacao': 'Jogo',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': AreaUserAdmin.id,
+        'usuario_id': userAdmin.id,
+    }
+    lock = crud_reserva.get_area_lock(AreaUserAdmin.id)
+    travado = []
+    with patch.object(
+        crud_reserva.occupancy_bitmap,
+        'adicionar',
+        side_effect=lambda *args: travado.append(lock.locked()),
+    ):
+        reserva_id = client.post(
+            '/reservas', json=reserva, headers=headers
+        ).json()['id']
+        client.put(
+            f'/reservas/{reserva_id}',
+            json={**reserva, 'hora_fim': '2023-10-23T16:00:00'},
+            headers=headers,
+        )
+    assert travado == [True, True]
+
+
+def test_update_reserva_trava_as_duas_areas(
+    client, session, userTipoAdmin, userAdmin, AreaUserAdmin, tokenadmin
+):
+    """
+    Testa que mudar a reserva de área trava a área antiga e a nova, sempre
+    na ordem dos IDs, e relê a reserva já com as duas travas.
+    """
+    headers = {'Authorization': f'Bearer {tokenadmin}'}
+    outra_area = Area(
+        nome='Quadra de tenis',
+        descricao='Uma quadra de saibro',
+        iluminacao='LED',
+        tipo_piso='Saibro',
+        covered='Não',
+        foto_url='https://example.com/quadra_tenis.jpg',
+    )
+    session.add(outra_area)
+    session.commit()
+    reserva = {
+        'reserva_data': '2023-10-23T00:00:00',
+        'hora_inicio': '2023-10-23T14:00:00',
+        'hora_fim': '2023-10-23T15:00:00',
+        'justificacao': 'Jogo',
+        'reserva_tipo': 'Jogo',
+        'status': 'Em análise',
+        'area_id': outra_area.id,
+        'usuario_id': userAdmin.id,
+    }
+    reserva_id = client.post(
+        '/reservas', json=reserva, headers=headers
+    ).json()['id']
+
+    travas, lidas = [], []
+    get_area_lock = crud_reserva.get_area_lock
+    ler = crud_reserva.get_reservation_by_id
+
+    def trava(area_id):
+        travas.append(area_id)
+        return get_area_lock(area_id)
+
+    def lida(reservation_id, db):
+        lidas.append([a for a in travas if get_area_lock(a).locked()])
+        return ler(reservation_id, db)
+
+    with patch.object(crud_reserva, 'get_area_lock', trava), patch.object(
+        crud_reserva, 'get_reservation_by_id', lida
+    ):
+        response = client.put(
+            f'/reservas/{reserva_id}',
+            json={**reserva, 'area_id': AreaUserAdmin.id},
+            headers=headers,
+        )
+    assert response.status_code == 200
+    assert response.json()['area_id'] == AreaUserAdmin.id
+    assert travas == sorted([AreaUserAdmin.id, outra_area.id])
+    assert lidas[-1] == travas
+
+
+def test_area_lock_trava_a_area_no_postgresql(session, AreaUserAdmin):
+    """
+    Testa que, no PostgreSQL, a trava da área também toma o advisory lock
+    na transação (vale entre workers) e relê as regras recorrentes da área.
+    """
+    executados = []
+    with patch.object(
+        crud_reserva, 'uses_advisory_lock', return_value=True
+    ), patch.object(
+        session, 'execute', side_effect=executados.append
+    ), patch.object(
+        crud_reserva.occurrence_cache, 'recarregar_area'
+    ) as recarregar:
+        with crud_reserva.area_lock(session, AreaUserAdmin.id):
+            assert crud_reserva.get_area_lock(AreaUserAdmin.id).locked()
+
+    assert len(executados) == 1
+    assert 'pg_advisory_xact_lock' in str(executados[0])
+    recarregar.assert_called_once_with(session, AreaUserAdmin.id)
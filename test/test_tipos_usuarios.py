@@ -366,3 +366,20 @@ def test_delete_tipo_usuario_not_found(client):
 
     assert response.status_code == 404
     assert 'detail' in response.json()
+
+
+def test_read_tipos_usuario_condicional(client, userTipoAdmin):
+    """
+    Testa que a listagem de tipos responde 304 com o ETag atual e que uma
+    escrita pela API muda o ETag.
+    """
+    etag = client.get('/tipos_usuario').headers['etag']
+    response = client.get('/tipos_usuario', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+
+    client.post('/tipos_usuario', json={'id': 2, 'tipo': 'cliente'})
+    response = client.get('/tipos_usuario', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.json()['tipos']) == 2
+    assert response.headers['etag'] != etag
@@ -656,9 +656,17 @@ def test_update_user_cliente(
     assert response_update_user.status_code == 200
     assert response_update_user.json()['nome'] == usuario_data_update['nome']
     assert response_update_user.json()['email'] == usuario_data_update['email']
+    # A atualização troca a senha e invalida o token anterior
+    token = client.post(
+        '/token',
+        data={
+            'username': usuario_data_update['email'],
+            'password': usuario_data_update['senha'],
+        },
+    ).json()['access_token']
     response = client.get(
         '/usuarios/10',
-        headers={'Authorization': f'Bearer {tokencliente}'},
+        headers={'Authorization': f'Bearer {token}'},
     )
     assert response.status_code == 404
     assert 'detail' in response.json()
@@ -1073,3 +1081,47 @@ def test_update_senha_success(
 
 
 # os testes sempre apagam tudo que criam então por exemplo se na hora que eu criar uma reserva com o usuario de cliente usando os dados do fixture o usuario_id sempre vai ser 1
+
+
+def test_read_users_paginacao_por_cursor(
+    client, userTipoAdmin, userTipoClient, userAdmin, userCliente, userCliente2
+):
+    """
+    Testa a paginação por cursor de '/usuarios': a primeira página traz o
+    cursor no header 'X-Next-Cursor' e a seguinte continua a partir dele.
+    """
+    response = client.get('/usuarios', params={'limit': 2})
+    assert response.status_code == 200
+    primeira = [user['id'] for user in response.json()['users']]
+    assert primeira == [userAdmin.id, userCliente.id]
+    cursor = response.headers['X-Next-Cursor']
+
+    response = client.get('/usuarios', params={'limit': 2, 'cursor': cursor})
+    assert response.status_code == 200
+    assert [user['id'] for user in response.json()['users']] == [
+        userCliente2.id
+    ]
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_read_users_paginacao_skip_limit_compativel(
+    client, userTipoAdmin, userTipoClient, userAdmin, userCliente, userCliente2
+):
+    """
+    Testa que o modo 'skip/limit' continua funcionando junto com o cursor.
+    """
+    response = client.get('/usuarios', params={'skip': 1, 'limit': 1})
+    assert response.status_code == 200
+    assert [user['id'] for user in response.json()['users']] == [
+        userCliente.id
+    ]
+    assert 'X-Next-Cursor' in response.headers
+
+
+def test_read_users_cursor_invalido(client):
+    """
+    Testa se um cursor malformado é rejeitado com status 400.
+    """
+    response = client.get('/usuarios', params={'cursor': 'nao-e-um-cursor'})
+    assert response.status_code == 400
+    assert response.json() == {'detail': 'Cursor de paginação inválido'}